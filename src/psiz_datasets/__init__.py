@@ -13,9 +13,62 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ============================================================================
-"""Top-level import."""
+"""Top-level import.
 
-import psiz_datasets.birds16_rank2019
-import psiz_datasets.ilsvrc2012_val_hsj
-import psiz_datasets.skin_lesions2018_rank2018
-import psiz_datasets.utils
+Submodules are imported lazily, so that lightweight modules (e.g.,
+`psiz_datasets.utils`) can be used without the startup cost of
+TensorFlow. Dataset builders are registered with TFDS when their module
+is first imported (e.g., `psiz_datasets.birds16_rank2019`), when
+`register_builders` is called, or on import of `psiz_datasets` if TFDS
+has already been imported. If TFDS is imported after `psiz_datasets`,
+call `register_builders` (or import the builder modules) before looking
+up the datasets:
+
+    import psiz_datasets
+    import tensorflow_datasets as tfds
+
+    psiz_datasets.register_builders()
+    ds = tfds.load("birds16_rank2019")
+
+"""
+
+import importlib
+import sys
+
+_BUILDER_MODULES = (
+    "birds16_rank2019",
+    "ilsvrc2012_val_hsj",
+    "skin_lesions2018_rank2018",
+)
+_SUBMODULES = _BUILDER_MODULES + (
+    "benchmarks",
+    "core",
+    "export",
+    "loaders",
+    "synthetic",
+    "transforms",
+    "utils",
+)
+
+
+def register_builders():
+    """Register all dataset builders with TFDS."""
+    for name in _BUILDER_MODULES:
+        importlib.import_module("psiz_datasets." + name)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module("psiz_datasets." + name)
+    raise AttributeError("module 'psiz_datasets' has no attribute '{0}'".format(name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
+
+
+# Paying for the builder imports is cheap once TFDS is loaded, and keeps
+# `import tensorflow_datasets; import psiz_datasets; tfds.load(...)`
+# working.
+if "tensorflow_datasets" in sys.modules:
+    register_builders()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmarks initialization file.
+
+Benchmarks can be run from the command line, e.g.:
+
+    python -m psiz_datasets.benchmarks.build_benchmark --n-sequence 1000 \
+        --work-dir /tmp/psiz_benchmarks
+    python -m psiz_datasets.benchmarks.read_benchmark \
+        --data-dir ~/tensorflow_datasets --batch-sizes 32 256 \
+        --output read_report.json
+
+"""
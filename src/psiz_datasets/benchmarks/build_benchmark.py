@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of benchmark functions.
+
+Functions:
+    benchmark_build: Prepare one builder config and measure it.
+    run_build_benchmarks: Benchmark builds of synthetic datasets.
+    main: Command line entry point.
+
+"""
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from etils import epath
+import tensorflow_datasets as tfds
+
+from psiz_datasets.benchmarks.common import DATASETS
+from psiz_datasets.benchmarks.common import builder_class
+from psiz_datasets.benchmarks.common import format_table
+from psiz_datasets.benchmarks.common import write_report
+from psiz_datasets.core.build_stats import peak_rss_mb
+from psiz_datasets.synthetic import write_synthetic_dataset
+
+# Domain and subdomain of the asset IDs of each dataset.
+_ASSET_PREFIXES = {
+    "birds16_rank2019": "PZ001",
+    "ilsvrc2012_val_hsj": "PZ004",
+    "skin_lesions2018_rank2018": "PZ002",
+}
+
+
+def _directory_bytes(path):
+    """Return the total size of the files in a directory."""
+    total = 0
+    for root, _, filenames in os.walk(os.fspath(path)):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(root, filename))
+    return total
+
+
+def benchmark_build(
+    dataset, config, extracted_path, data_dir, num_workers=None, **builder_kwargs
+):
+    """Prepare one builder config and measure it.
+
+    The download is bypassed, i.e., `extracted_path` is used as the
+    extracted raw data archive. When streaming the archive (i.e.,
+    `stream_archive=True`), `extracted_path` is used as the downloaded
+    archive instead.
+
+    Args:
+        dataset: String indicating the dataset name.
+        config: String indicating the builder config name.
+        extracted_path: Path of the raw data, e.g., written by
+            `write_synthetic_dataset`, or of a zip archive of the raw
+            data when streaming.
+        data_dir: Path of the TFDS data directory to prepare into.
+        num_workers (optional): See `RankSequenceBuilder`.
+        **builder_kwargs: Additional keyword arguments forwarded to the
+            builder.
+
+    Returns:
+        A dictionary of measurements:
+            `seconds`: Wall-clock time of `download_and_prepare`.
+            `output_bytes`: Total size of the prepared dataset.
+            `peak_rss_mb`: Peak resident set size of this process, or
+                `None` if not available on this platform.
+            `peak_worker_rss_mb`: Peak resident set size of the largest
+                worker process, or `None` if files are processed
+                serially or not available on this platform.
+
+    Raises:
+        ValueError: If the config has already been prepared in
+            `data_dir`, since the build would be skipped.
+
+    """
+    builder = builder_class(dataset)(
+        config=config, data_dir=data_dir, num_workers=num_workers, **builder_kwargs
+    )
+    if builder.is_prepared():
+        raise ValueError(
+            "Dataset '{0}' is already prepared in '{1}'.".format(
+                builder.info.full_name, data_dir
+            )
+        )
+    with mock.patch.object(
+        tfds.download.DownloadManager,
+        "download_and_extract",
+        return_value=epath.Path(extracted_path),
+    ), mock.patch.object(
+        tfds.download.DownloadManager,
+        "download",
+        return_value=epath.Path(extracted_path),
+    ):
+        time_start = time.perf_counter()
+        builder.download_and_prepare()
+        seconds = time.perf_counter() - time_start
+    peak_worker_rss_mb = None
+    if num_workers is not None and num_workers > 1:
+        peak_worker_rss_mb = peak_rss_mb(children=True)
+    return {
+        "seconds": seconds,
+        "output_bytes": _directory_bytes(builder.data_dir),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_worker_rss_mb": peak_worker_rss_mb,
+    }
+
+
+def run_build_benchmarks(
+    n_sequence,
+    work_dir,
+    datasets=None,
+    configs=None,
+    num_workers=None,
+    seed=0,
+):
+    """Benchmark builds of synthetic datasets.
+
+    A synthetic dataset is written once per dataset and prepared with
+    every requested builder config. Each build runs in a fresh process,
+    so that peak memory usage is measured per build, and prepares into a
+    fresh data directory, which is removed after the build is measured.
+
+    Args:
+        n_sequence: Integer indicating the number of synthetic
+            sequences of each split.
+        work_dir: Path of a directory for the synthetic data and the
+            (temporary) prepared datasets.
+        datasets (optional): A list of dataset names. By default, all
+            datasets.
+        configs (optional): A list of builder config names. By default,
+            all configs.
+        num_workers (optional): Integer indicating the number of worker
+            processes used to generate and prepare data.
+        seed (optional): Integer seed of the synthetic data.
+
+    Returns:
+        A list of result dictionaries, one per dataset and config,
+        with the measurements of `benchmark_build` and the derived
+        throughput (`sequences_per_second` and `trials_per_second`).
+
+    """
+    work_dir = epath.Path(work_dir)
+    mp_context = multiprocessing.get_context("spawn")
+    results = []
+    for dataset in datasets or DATASETS:
+        dataset_class = builder_class(dataset)
+        spec = dataset_class.SPEC
+        extracted_path = work_dir / "raw" / "{0}_{1}".format(dataset, n_sequence)
+        counts = write_synthetic_dataset(
+            spec,
+            extracted_path,
+            n_sequence,
+            asset_prefix=_ASSET_PREFIXES[dataset],
+            seed=seed,
+            num_workers=num_workers,
+        )
+        n_sequence_total = sum(count["n_sequence"] for count in counts.values())
+        n_trial_total = sum(count["n_trial"] for count in counts.values())
+        if configs is None:
+            config_names = [config.name for config in dataset_class.BUILDER_CONFIGS]
+        else:
+            config_names = list(configs)
+        for config in config_names:
+            (work_dir / "data").mkdir(parents=True, exist_ok=True)
+            data_dir = tempfile.mkdtemp(
+                prefix="{0}_{1}_".format(dataset, config),
+                dir=os.fspath(work_dir / "data"),
+            )
+            try:
+                with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=mp_context
+                ) as executor:
+                    measurements = executor.submit(
+                        benchmark_build,
+                        dataset,
+                        config,
+                        os.fspath(extracted_path),
+                        data_dir,
+                        num_workers=num_workers,
+                    ).result()
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+            result = {
+                "dataset": dataset,
+                "config": config,
+                "n_sequence": n_sequence_total,
+                "n_trial": n_trial_total,
+                "num_workers": num_workers,
+            }
+            result.update(measurements)
+            result["sequences_per_second"] = n_sequence_total / result["seconds"]
+            result["trials_per_second"] = n_trial_total / result["seconds"]
+            results.append(result)
+    return results
+
+
+_COLUMNS = (
+    ("dataset", "{0}"),
+    ("config", "{0}"),
+    ("seconds", "{0:.2f}"),
+    ("sequences_per_second", "{0:.1f}"),
+    ("trials_per_second", "{0:.0f}"),
+    ("peak_rss_mb", "{0:.0f}"),
+    ("peak_worker_rss_mb", "{0:.0f}"),
+    ("output_bytes", "{0}"),
+)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark dataset builds using synthetic sequences."
+    )
+    parser.add_argument(
+        "--n-sequence",
+        type=int,
+        default=1000,
+        help="Number of synthetic sequences of each split.",
+    )
+    parser.add_argument(
+        "--work-dir",
+        required=True,
+        help="Directory for the synthetic data and temporary prepared datasets.",
+    )
+    parser.add_argument("--datasets", nargs="+", choices=DATASETS)
+    parser.add_argument("--configs", nargs="+")
+    parser.add_argument("--num-workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Path of a JSON file for the results.")
+    args = parser.parse_args(argv)
+
+    results = run_build_benchmarks(
+        args.n_sequence,
+        args.work_dir,
+        datasets=args.datasets,
+        configs=args.configs,
+        num_workers=args.num_workers,
+        seed=args.seed,
+    )
+    print(format_table(results, _COLUMNS))
+    if args.output is not None:
+        write_report(args.output, "build", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test build_benchmark."""
+
+import pytest
+
+from psiz_datasets.benchmarks.build_benchmark import _COLUMNS
+from psiz_datasets.benchmarks.build_benchmark import benchmark_build
+from psiz_datasets.benchmarks.build_benchmark import run_build_benchmarks
+from psiz_datasets.benchmarks.common import builder_class
+from psiz_datasets.benchmarks.common import format_table
+from psiz_datasets.synthetic import write_synthetic_dataset
+
+
+def test_benchmark_build(tmp_path):
+    """Test preparing a synthetic dataset."""
+    spec = builder_class("skin_lesions2018_rank2018").SPEC
+    extracted_path = tmp_path / "raw"
+    write_synthetic_dataset(spec, extracted_path, 3, n_stimuli=20)
+
+    result = benchmark_build(
+        "skin_lesions2018_rank2018",
+        "with_timestep_sparse",
+        extracted_path,
+        tmp_path / "data",
+    )
+
+    assert result["seconds"] > 0
+    assert result["output_bytes"] > 0
+    assert result["peak_rss_mb"] > 0
+    assert result["peak_worker_rss_mb"] is None
+    with pytest.raises(ValueError):
+        benchmark_build(
+            "skin_lesions2018_rank2018",
+            "with_timestep_sparse",
+            extracted_path,
+            tmp_path / "data",
+        )
+
+    result.update(
+        {"dataset": "skin_lesions2018_rank2018", "config": "with_timestep_sparse"}
+    )
+    result.update({"sequences_per_second": 1.0, "trials_per_second": 2.0})
+    lines = format_table([result], _COLUMNS).splitlines()
+    assert lines[0].split()[0:2] == ["dataset", "config"]
+    assert lines[1].split()[-2] == "-"
+
+
+def test_run_build_benchmarks(tmp_path):
+    """Test that every run prepares into a fresh data directory."""
+    for _ in range(2):
+        (result,) = run_build_benchmarks(
+            2,
+            tmp_path,
+            datasets=["skin_lesions2018_rank2018"],
+            configs=["with_timestep_sparse"],
+        )
+        assert result["output_bytes"] > 0
+
+    assert list((tmp_path / "data").iterdir()) == []
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of benchmark utility functions.
+
+Functions:
+    builder_class: Return the builder class of a dataset.
+    format_table: Return benchmark results as a plain-text table.
+    write_report: Write benchmark results as a JSON report.
+
+"""
+
+import datetime
+import importlib
+import json
+import platform
+
+from etils import epath
+import tensorflow_datasets as tfds
+
+DATASETS = (
+    "birds16_rank2019",
+    "ilsvrc2012_val_hsj",
+    "skin_lesions2018_rank2018",
+)
+
+
+def builder_class(dataset):
+    """Return the builder class of a dataset."""
+    module = importlib.import_module("psiz_datasets.{0}".format(dataset))
+    return getattr(module, tfds.core.naming.snake_to_camelcase(dataset))
+
+
+def format_table(results, columns):
+    """Return benchmark results as a plain-text table.
+
+    Args:
+        results: A list of result dictionaries.
+        columns: A list of `(key, format_string)` tuples. Missing
+            (`None`) values are shown as "-".
+
+    Returns:
+        A string.
+
+    """
+    rows = [[name for name, _ in columns]]
+    for result in results:
+        rows.append(
+            [
+                "-" if result.get(name) is None else fmt.format(result[name])
+                for name, fmt in columns
+            ]
+        )
+    widths = [max(len(row[idx]) for row in rows) for idx in range(len(columns))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+def write_report(path, benchmark, settings, results):
+    """Write benchmark results as a JSON report.
+
+    Args:
+        path: Path of the JSON file.
+        benchmark: String indicating the benchmark, e.g., "build".
+        settings: A JSON-serializable dictionary of benchmark settings.
+        results: A list of JSON-serializable result dictionaries.
+
+    """
+    report = {
+        "benchmark": benchmark,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "host": {
+            "machine": platform.machine(),
+            "node": platform.node(),
+            "python": platform.python_version(),
+        },
+        "settings": settings,
+        "results": results,
+    }
+    epath.Path(path).write_text(json.dumps(report, indent=2))
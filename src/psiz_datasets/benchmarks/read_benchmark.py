@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of benchmark functions.
+
+Functions:
+    benchmark_read: Measure the input throughput of a prepared config.
+    run_read_benchmarks: Benchmark reading prepared datasets.
+    main: Command line entry point.
+
+"""
+
+import argparse
+import itertools
+import time
+
+import tensorflow as tf
+import tensorflow_datasets as tfds
+
+from psiz_datasets.benchmarks.common import DATASETS
+from psiz_datasets.benchmarks.common import builder_class
+from psiz_datasets.benchmarks.common import format_table
+from psiz_datasets.benchmarks.common import write_report
+from psiz_datasets.transforms import pad_sequence_batch
+
+_COLUMNS = (
+    ("dataset", "{0}"),
+    ("config", "{0}"),
+    ("batch_size", "{0}"),
+    ("parallelism", "{0}"),
+    ("examples_per_second", "{0:.0f}"),
+    ("file_bytes_per_second", "{0:.3g}"),
+    ("tensor_bytes_per_second", "{0:.3g}"),
+)
+
+
+def _batch_size(batch):
+    """Return the number of examples of a batch."""
+    return tf.nest.flatten(batch)[0].shape[0]
+
+
+def _tensor_bytes(batch):
+    """Return the number of bytes of the (decoded) tensors of a batch."""
+    n_bytes = 0
+    for tensor in tf.nest.flatten(batch):
+        if tensor.dtype == tf.string:
+            n_bytes += int(tf.reduce_sum(tf.strings.length(tensor)))
+        else:
+            n_bytes += tensor.shape.num_elements() * tensor.dtype.size
+    return n_bytes
+
+
+def benchmark_read(
+    builder,
+    split="train",
+    batch_size=32,
+    parallelism=None,
+    n_epoch=1,
+    as_supervised=False,
+):
+    """Measure the input throughput of a prepared builder config.
+
+    The pipeline mirrors a typical training input pipeline: examples
+    are read and decoded with `as_dataset`, batched (ragged configs are
+    padded per batch with `pad_sequence_batch`) and prefetched. The
+    first batch is read before timing starts, so that one-time costs
+    (e.g., tracing) are excluded.
+
+    Args:
+        builder: A prepared `RankSequenceBuilder`.
+        split (optional): String indicating the split to read.
+        batch_size (optional): Integer indicating the batch size.
+        parallelism (optional): Integer indicating the number of
+            parallel calls used to read files and decode examples. By
+            default, `tf.data.AUTOTUNE` is used.
+        n_epoch (optional): Integer indicating the number of passes
+            over the split.
+        as_supervised (optional): Boolean indicating if examples should
+            be read as `(inputs, targets, sample_weights)` tuples.
+
+    Returns:
+        A dictionary of measurements:
+            `seconds`: Wall-clock time after the first batch.
+            `n_example`: Number of examples read after the first batch.
+            `examples_per_second`: Example throughput.
+            `file_bytes_per_second`: Throughput of serialized records,
+                estimated from the size of the split.
+            `tensor_bytes_per_second`: Throughput of decoded batches,
+                estimated from the (untimed) first batch.
+
+    """
+    if parallelism is None:
+        parallelism = tf.data.AUTOTUNE
+    read_config = tfds.ReadConfig(
+        num_parallel_calls_for_decode=parallelism,
+        num_parallel_calls_for_interleave_files=parallelism,
+    )
+    ds = builder.as_dataset(
+        split=split,
+        shuffle_files=False,
+        read_config=read_config,
+        as_supervised=as_supervised,
+    )
+    ds = ds.repeat(n_epoch)
+    if builder.builder_config.ragged_timestep:
+        ds = pad_sequence_batch(ds, batch_size)
+    else:
+        ds = ds.batch(batch_size)
+    ds = ds.prefetch(tf.data.AUTOTUNE)
+
+    iterator = iter(ds)
+    first_batch = next(iterator)
+    # NOTE: Tensor bytes are measured outside of the timed loop, since
+    # eager ops on every batch would distort the throughput.
+    tensor_bytes_per_example = _tensor_bytes(first_batch) / _batch_size(first_batch)
+    n_example = 0
+    time_start = time.perf_counter()
+    for batch in iterator:
+        n_example += _batch_size(batch)
+    seconds = time.perf_counter() - time_start
+
+    split_info = builder.info.splits[split]
+    bytes_per_example = split_info.num_bytes / max(split_info.num_examples, 1)
+    seconds = max(seconds, 1e-9)
+    return {
+        "seconds": seconds,
+        "n_example": n_example,
+        "examples_per_second": n_example / seconds,
+        "file_bytes_per_second": n_example * bytes_per_example / seconds,
+        "tensor_bytes_per_second": n_example * tensor_bytes_per_example / seconds,
+    }
+
+
+def run_read_benchmarks(
+    data_dir,
+    datasets=None,
+    configs=None,
+    batch_sizes=(32,),
+    parallelisms=(None,),
+    split="train",
+    n_epoch=1,
+):
+    """Benchmark reading prepared datasets.
+
+    Every combination of dataset, config, batch size and parallelism is
+    measured. Configs that have not been prepared in `data_dir` are
+    skipped.
+
+    Args:
+        data_dir: Path of the TFDS data directory.
+        datasets (optional): A list of dataset names. By default, all
+            datasets.
+        configs (optional): A list of builder config names. By default,
+            all configs.
+        batch_sizes (optional): A list of batch sizes.
+        parallelisms (optional): A list of parallelism settings (see
+            `benchmark_read`).
+        split (optional): String indicating the split to read.
+        n_epoch (optional): Integer indicating the number of passes
+            over the split.
+
+    Returns:
+        A list of result dictionaries.
+
+    """
+    results = []
+    for dataset in datasets or DATASETS:
+        dataset_class = builder_class(dataset)
+        if configs is None:
+            config_names = [config.name for config in dataset_class.BUILDER_CONFIGS]
+        else:
+            config_names = list(configs)
+        for config in config_names:
+            builder = dataset_class(config=config, data_dir=data_dir)
+            if not builder.is_prepared():
+                continue
+            for batch_size, parallelism in itertools.product(batch_sizes, parallelisms):
+                result = {
+                    "dataset": dataset,
+                    "config": config,
+                    "version": str(builder.version),
+                    "split": split,
+                    "batch_size": batch_size,
+                    "parallelism": "autotune" if parallelism is None else parallelism,
+                }
+                result.update(
+                    benchmark_read(
+                        builder,
+                        split=split,
+                        batch_size=batch_size,
+                        parallelism=parallelism,
+                        n_epoch=n_epoch,
+                    )
+                )
+                results.append(result)
+    return results
+
+
+def _parallelism(value):
+    """Parse a parallelism setting."""
+    if value == "autotune":
+        return None
+    return int(value)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the input throughput of prepared datasets."
+    )
+    parser.add_argument(
+        "--data-dir", required=True, help="TFDS data directory to read from."
+    )
+    parser.add_argument("--datasets", nargs="+", choices=DATASETS)
+    parser.add_argument("--configs", nargs="+")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[32])
+    parser.add_argument(
+        "--parallelism",
+        nargs="+",
+        type=_parallelism,
+        default=[None],
+        help="Parallel calls for reading and decoding, or 'autotune'.",
+    )
+    parser.add_argument("--split", default="train")
+    parser.add_argument("--n-epoch", type=int, default=1)
+    parser.add_argument(
+        "--output", required=True, help="Path of a JSON file for the results."
+    )
+    args = parser.parse_args(argv)
+
+    results = run_read_benchmarks(
+        args.data_dir,
+        datasets=args.datasets,
+        configs=args.configs,
+        batch_sizes=args.batch_sizes,
+        parallelisms=args.parallelism,
+        split=args.split,
+        n_epoch=args.n_epoch,
+    )
+    print(format_table(results, _COLUMNS))
+    write_report(args.output, "read", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
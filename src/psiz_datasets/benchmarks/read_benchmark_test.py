@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test read_benchmark."""
+
+import json
+
+from psiz_datasets.benchmarks.read_benchmark import main
+
+_DATASET = "skin_lesions2018_rank2018"
+
+
+def test_read_benchmark(tmp_path, write_synthetic, prepare_synthetic):
+    """Test reading prepared synthetic datasets."""
+    data_dir = tmp_path / "data"
+    write_synthetic(_DATASET, 5)
+    for config in ("without_timestep", "with_timestep_ragged"):
+        prepare_synthetic(_DATASET, config, data_dir=data_dir)
+    output = tmp_path / "report.json"
+
+    main(
+        [
+            "--data-dir",
+            str(data_dir),
+            "--datasets",
+            _DATASET,
+            "--batch-sizes",
+            "1",
+            "2",
+            "--parallelism",
+            "1",
+            "autotune",
+            "--output",
+            str(output),
+        ]
+    )
+
+    report = json.loads(output.read_text())
+    assert report["benchmark"] == "read"
+    results = report["results"]
+    # Only prepared configs are benchmarked.
+    assert len(results) == 8
+    assert {result["config"] for result in results} == {
+        "without_timestep",
+        "with_timestep_ragged",
+    }
+    assert {result["parallelism"] for result in results} == {1, "autotune"}
+    for result in results:
+        assert result["examples_per_second"] > 0
+        assert result["file_bytes_per_second"] > 0
+        assert result["tensor_bytes_per_second"] > 0
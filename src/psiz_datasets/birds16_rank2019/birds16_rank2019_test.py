@@ -39,5 +39,65 @@ class Birds16Rank2019WithoutTimestepTest(tfds.testing.DatasetBuilderTestCase):
     }
 
 
+class Birds16Rank2019WithTimestepSparseTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for birds16_rank2019 dataset."""
+
+    DATASET_CLASS = birds16_rank2019.Birds16Rank2019
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_sparse"]
+    SPLITS = {
+        "train": 2,
+    }
+
+
+class Birds16Rank2019WithoutTimestepSparseTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for birds16_rank2019 dataset."""
+
+    DATASET_CLASS = birds16_rank2019.Birds16Rank2019
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep_sparse"]
+    SPLITS = {
+        "train": 60,
+    }
+
+
+class Birds16Rank2019WithTimestepRaggedTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for birds16_rank2019 dataset."""
+
+    DATASET_CLASS = birds16_rank2019.Birds16Rank2019
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_ragged"]
+    SPLITS = {
+        "train": 2,
+    }
+
+
+class Birds16Rank2019WithTimestepRaggedSparseTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for birds16_rank2019 dataset."""
+
+    DATASET_CLASS = birds16_rank2019.Birds16Rank2019
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_ragged_sparse"]
+    SPLITS = {
+        "train": 2,
+    }
+
+
+class Birds16Rank2019WithTimestepUnifiedTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for birds16_rank2019 dataset."""
+
+    DATASET_CLASS = birds16_rank2019.Birds16Rank2019
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_unified"]
+    SPLITS = {
+        "train": 2,
+    }
+
+
+class Birds16Rank2019WithoutTimestepUnifiedTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for birds16_rank2019 dataset."""
+
+    DATASET_CLASS = birds16_rank2019.Birds16Rank2019
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep_unified"]
+    SPLITS = {
+        "train": 60,
+    }
+
+
 if __name__ == "__main__":
     tfds.testing.test_main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Fixtures shared by the tests of all subpackages."""
+
+import importlib
+from unittest import mock
+
+from etils import epath
+import pytest
+import tensorflow_datasets as tfds
+
+from psiz_datasets.synthetic import write_synthetic_dataset
+
+_N_SEQUENCE = 4
+_N_STIMULI = 20
+
+
+def _builder_class(dataset):
+    """Return the builder class of a dataset."""
+    importlib.import_module("psiz_datasets.{0}".format(dataset))
+    return tfds.builder_cls(dataset)
+
+
+@pytest.fixture
+def write_synthetic(tmp_path):
+    """Return a function that writes the synthetic raw data of a dataset.
+
+    The function accepts a dataset name, the number of sequences of
+    each split and keyword arguments of `write_synthetic_dataset`, and
+    returns the path of the raw data and the counts of
+    `write_synthetic_dataset`. The raw data of each dataset is written
+    once per test.
+
+    """
+    written = {}
+
+    def write(dataset, n_sequence=_N_SEQUENCE, **kwargs):
+        if dataset not in written:
+            raw_path = tmp_path / "raw" / dataset
+            kwargs.setdefault("n_stimuli", _N_STIMULI)
+            counts = write_synthetic_dataset(
+                _builder_class(dataset).SPEC, raw_path, n_sequence, **kwargs
+            )
+            written[dataset] = (raw_path, counts)
+        return written[dataset]
+
+    return write
+
+
+@pytest.fixture
+def prepare_synthetic(tmp_path, write_synthetic):
+    """Return a function that prepares a synthetic dataset.
+
+    The function accepts a dataset name, a builder config name and the
+    optional keyword arguments `download_path` (the downloaded and
+    extracted raw data, by default the output of `write_synthetic`)
+    and `data_dir` (by default "data" in the temporary directory).
+    Remaining keyword arguments are forwarded to the builder. The
+    download is mocked, the dataset prepared and a freshly loaded
+    builder returned.
+
+    """
+
+    def prepare(dataset, config, download_path=None, data_dir=None, **builder_kwargs):
+        if download_path is None:
+            download_path, _ = write_synthetic(dataset)
+        if data_dir is None:
+            data_dir = tmp_path / "data"
+        builder_class = _builder_class(dataset)
+        builder = builder_class(config=config, data_dir=data_dir, **builder_kwargs)
+        download_path = epath.Path(download_path)
+        with mock.patch.object(
+            tfds.download.DownloadManager,
+            "download_and_extract",
+            return_value=download_path,
+        ), mock.patch.object(
+            tfds.download.DownloadManager, "download", return_value=download_path
+        ):
+            builder.download_and_prepare()
+        return builder_class(config=config, data_dir=data_dir, **builder_kwargs)
+
+    return prepare
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Core initialization file.
+
+The TFDS builder classes are imported lazily, so that the sequence
+engine can be used without importing TensorFlow. Import them from
+`psiz_datasets.core.rank_sequence_builder`; they are also reachable as
+attributes of this package for backwards compatibility.
+
+"""
+
+import importlib
+
+from psiz_datasets.core.build_manifest import BuildManifest
+from psiz_datasets.core.build_manifest import generate_cached_sequence_examples
+from psiz_datasets.core.build_stats import BuildStats
+from psiz_datasets.core.build_stats import call_with_stats
+from psiz_datasets.core.packed_sequences import SequenceRecord
+from psiz_datasets.core.packed_sequences import directory_sequence_files
+from psiz_datasets.core.packed_sequences import is_packed_file
+from psiz_datasets.core.packed_sequences import read_packed_sequences
+from psiz_datasets.core.parsed_sequence_cache import ParsedSequenceCache
+from psiz_datasets.core.rank_sequence import PARSER_VERSION
+from psiz_datasets.core.rank_sequence import format_parsed_sequence
+from psiz_datasets.core.rank_sequence import format_sequence
+from psiz_datasets.core.rank_sequence import format_sequence_file
+from psiz_datasets.core.rank_sequence import generate_sequence_examples
+from psiz_datasets.core.rank_sequence import parse_sequence_file
+from psiz_datasets.core.rank_sequence import participant_fold
+from psiz_datasets.core.rank_sequence import participant_sort_key
+from psiz_datasets.core.rank_sequence import read_anonymous_id
+from psiz_datasets.core.rank_sequence import select_timestep
+from psiz_datasets.core.rank_sequence import sequence_examples
+from psiz_datasets.core.rank_sequence_spec import RankSequenceSpec
+from psiz_datasets.core.sequence_archive import ArchiveMember
+from psiz_datasets.core.sequence_archive import archive_sequence_members
+from psiz_datasets.core.sequence_archive import read_archive_member
+from psiz_datasets.core.stimulus_table import StimulusTable
+
+__all__ = [
+    "ArchiveMember",
+    "BuildManifest",
+    "BuildStats",
+    "PARSER_VERSION",
+    "ParsedSequenceCache",
+    "RankSequenceSpec",
+    "SequenceRecord",
+    "StimulusTable",
+    "archive_sequence_members",
+    "call_with_stats",
+    "directory_sequence_files",
+    "format_parsed_sequence",
+    "format_sequence",
+    "format_sequence_file",
+    "generate_cached_sequence_examples",
+    "generate_sequence_examples",
+    "is_packed_file",
+    "parse_sequence_file",
+    "participant_fold",
+    "participant_sort_key",
+    "read_anonymous_id",
+    "read_archive_member",
+    "read_packed_sequences",
+    "select_timestep",
+    "sequence_examples",
+]
+
+_LAZY_ATTRIBUTES = {
+    "RankSequenceBuilder": "psiz_datasets.core.rank_sequence_builder",
+    "RankSequenceConfig": "psiz_datasets.core.rank_sequence_builder",
+    "RankSequenceMetadata": "psiz_datasets.core.rank_sequence_builder",
+    "rank_sequence_configs": "psiz_datasets.core.rank_sequence_builder",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(
+        "module 'psiz_datasets.core' has no attribute '{0}'".format(name)
+    )
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
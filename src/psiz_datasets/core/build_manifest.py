@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    BuildManifest: Manifest of the sequence files of previous builds.
+
+Functions:
+    generate_cached_sequence_examples: Return the examples of a
+        sequence file, reusing cached formatted sequences.
+
+NOTE: This module does not depend on TensorFlow so that it can be
+used by worker processes.
+
+"""
+
+import hashlib
+import json
+import zipfile
+
+from etils import epath
+import numpy as np
+
+from psiz_datasets.core.build_stats import BuildStats
+from psiz_datasets.core.rank_sequence import PARSER_VERSION
+from psiz_datasets.core.rank_sequence import format_sequence_file
+from psiz_datasets.core.rank_sequence import sequence_examples
+from psiz_datasets.utils import atomic_open
+
+# Increment when the format of cache entries changes.
+_CACHE_FORMAT = 2
+# Name of the cache subdirectory. Cache entries depend on the parser as
+# well as on the entry format, so changing either starts a new cache.
+CACHE_VERSION = "parser_v{0}_format_v{1}".format(PARSER_VERSION, _CACHE_FORMAT)
+_SEQUENCE_ID_KEY = "__sequence_id__"
+
+
+class BuildManifest:
+    """Manifest of the sequence files of previous builds.
+
+    The manifest records the content hash of every sequence file that
+    was used to build a dataset and lives in the same directory as the
+    cached formatted sequences. It is used to report which files are
+    new, changed or removed since the previous build, and to evict
+    cache entries that are no longer referenced.
+
+    Attributes:
+        cache_dir: The cache directory.
+        splits: A dictionary mapping split directory names to a
+            dictionary of `{filename: digest}`.
+
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, cache_dir):
+        """Initialize.
+
+        Args:
+            cache_dir: Path of cache directory. The manifest of the
+                previous build is loaded if it exists.
+
+        """
+        self.cache_dir = epath.Path(cache_dir)
+        self.splits = {}
+        manifest_path = self.cache_dir / self.FILENAME
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            if manifest.get("format") == _CACHE_FORMAT:
+                self.splits = manifest["splits"]
+
+    def update(self, split, digests):
+        """Replace the files of a split.
+
+        Args:
+            split: String indicating the split directory name.
+            digests: A dictionary of `{filename: digest}` for all files
+                of the split in the current build.
+
+        Returns:
+            A dictionary counting the files that are "new", "changed",
+            "unchanged" and "removed" relative to the previous build.
+
+        """
+        previous = self.splits.get(split, {})
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+        for filename, digest in digests.items():
+            if filename not in previous:
+                counts["new"] += 1
+            elif previous[filename] != digest:
+                counts["changed"] += 1
+            else:
+                counts["unchanged"] += 1
+        counts["removed"] = len(set(previous).difference(digests))
+        self.splits[split] = dict(digests)
+        return counts
+
+    def save(self):
+        """Save manifest and evict unreferenced cache entries."""
+        manifest = {"format": _CACHE_FORMAT, "splits": self.splits}
+        _atomic_write_bytes(
+            self.cache_dir / self.FILENAME, json.dumps(manifest).encode("utf-8")
+        )
+
+        referenced = set()
+        for digests in self.splits.values():
+            referenced.update(digests.values())
+        for entry_path in self.cache_dir.glob("*.npz"):
+            if entry_path.stem not in referenced:
+                entry_path.unlink(missing_ok=True)
+
+
+def generate_cached_sequence_examples(sequence_path, cache_dir, stats=None, **kwargs):
+    """Returns the examples of a sequence file, reusing cached sequences.
+
+    Formatted sequences are cached in `cache_dir` keyed by the content
+    hash of the sequence file. If an entry exists, decoding and
+    formatting the sequence is skipped. Unreadable (e.g., truncated)
+    entries are treated as missing and replaced.
+
+    Args:
+        sequence_path: Path of sequence file.
+        cache_dir: Path of cache directory. The directory must be
+            specific to the builder config and to `CACHE_VERSION`,
+            since the cached sequences depend on both.
+        stats (optional): A `BuildStats` object that records per-stage
+            timings and counters. Trials are only counted for sequences
+            that are not cached.
+        **kwargs: Keyword arguments forwarded to `format_sequence_file`.
+
+    Returns:
+        digest: String indicating the content hash of the file.
+        examples: A list of (example_id, example) tuples.
+
+    """
+    stats = stats or BuildStats.disabled()
+    with stats.stage("read"):
+        content = sequence_path.read_bytes()
+    stats.count("files")
+    with stats.stage("hash"):
+        digest = hashlib.sha256(content).hexdigest()
+    entry_path = epath.Path(cache_dir) / (digest + ".npz")
+
+    with stats.stage("cache_load"):
+        entry = _load_entry(entry_path)
+    if entry is not None:
+        stats.count("cache_hits")
+        sequence_id, formatted_sequence = entry
+    else:
+        stats.count("cache_misses")
+        sequence_id, formatted_sequence = format_sequence_file(
+            content, stats=stats, **kwargs
+        )
+        with stats.stage("cache_save"):
+            _save_entry(entry_path, sequence_id, formatted_sequence)
+
+    with stats.stage("unroll"):
+        examples = sequence_examples(
+            sequence_id,
+            formatted_sequence,
+            with_timestep_axis=kwargs.get("with_timestep_axis"),
+        )
+    stats.count("examples", len(examples))
+    return digest, examples
+
+
+def _save_entry(entry_path, sequence_id, formatted_sequence):
+    """Save a formatted sequence as a cache entry."""
+    arrays = {key: np.asarray(value) for key, value in formatted_sequence.items()}
+    arrays[_SEQUENCE_ID_KEY] = np.asarray(sequence_id)
+    with atomic_open(entry_path) as f:
+        np.savez(f, **arrays)
+
+
+def _load_entry(entry_path):
+    """Load a formatted sequence from a cache entry.
+
+    Returns:
+        A `(sequence_id, formatted_sequence)` tuple, or `None` if the
+        entry does not exist or cannot be read, in which case an
+        unreadable entry is deleted.
+
+    """
+    try:
+        with entry_path.open("rb") as f:
+            with np.load(f, allow_pickle=False) as arrays:
+                formatted_sequence = {key: arrays[key] for key in arrays.files}
+        # NOTE: Use `item` to preserve the type of the sequence ID (which
+        # is used as the example key).
+        sequence_id = formatted_sequence.pop(_SEQUENCE_ID_KEY).item()
+    except FileNotFoundError:
+        return None
+    except (EOFError, OSError, ValueError, KeyError, zipfile.BadZipFile):
+        entry_path.unlink(missing_ok=True)
+        return None
+    formatted_sequence["anonymous_id"] = formatted_sequence["anonymous_id"].tolist()
+    return sequence_id, formatted_sequence
+
+
+def _atomic_write_bytes(path, content):
+    """Write bytes to a file atomically."""
+    with atomic_open(path) as f:
+        f.write(content)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test build_manifest."""
+
+import shutil
+
+from etils import epath
+import numpy as np
+import pytest
+
+from psiz_datasets.core import BuildManifest
+from psiz_datasets.core import generate_cached_sequence_examples
+from psiz_datasets.core import generate_sequence_examples
+
+
+@pytest.fixture
+def seqs_path(tmp_path, dummy_path):
+    """Writable copy of dummy sequence files."""
+    seqs_path = epath.Path(tmp_path) / "train_seqs"
+    shutil.copytree(dummy_path / "train_seqs", seqs_path)
+    return seqs_path
+
+
+@pytest.mark.parametrize("with_timestep_axis", [True, False])
+def test_cache_hit(spec, seqs_path, tmp_path, with_timestep_axis):
+    """Test that cached sequences yield the same examples."""
+    cache_dir = epath.Path(tmp_path) / "cache"
+    cache_dir.mkdir()
+    sequence_path = seqs_path / "seq_a.json"
+    expected = generate_sequence_examples(
+        sequence_path, spec, with_timestep_axis=with_timestep_axis
+    )
+
+    digest_0, examples_0 = generate_cached_sequence_examples(
+        sequence_path, cache_dir, spec=spec, with_timestep_axis=with_timestep_axis
+    )
+    assert (cache_dir / (digest_0 + ".npz")).exists()
+    digest_1, examples_1 = generate_cached_sequence_examples(
+        sequence_path, cache_dir, spec=spec, with_timestep_axis=with_timestep_axis
+    )
+
+    assert digest_0 == digest_1
+    for examples in (examples_0, examples_1):
+        assert len(examples) == len(expected)
+        for (key, example), (expected_key, expected_example) in zip(examples, expected):
+            assert key == expected_key
+            assert example.keys() == expected_example.keys()
+            for name, value in example.items():
+                np.testing.assert_array_equal(value, expected_example[name])
+
+
+@pytest.mark.parametrize("content", [b"", b"PK\x03\x04truncated"])
+def test_corrupt_entry(spec, seqs_path, tmp_path, content):
+    """Test that an unreadable cache entry is replaced."""
+    cache_dir = epath.Path(tmp_path) / "cache"
+    cache_dir.mkdir()
+    sequence_path = seqs_path / "seq_a.json"
+    digest, expected = generate_cached_sequence_examples(
+        sequence_path, cache_dir, spec=spec, with_timestep_axis=True
+    )
+    entry_path = cache_dir / (digest + ".npz")
+    entry_path.write_bytes(content)
+
+    _, examples = generate_cached_sequence_examples(
+        sequence_path, cache_dir, spec=spec, with_timestep_axis=True
+    )
+
+    assert len(examples) == len(expected)
+    for (key, example), (expected_key, expected_example) in zip(examples, expected):
+        assert key == expected_key
+        for name, value in example.items():
+            np.testing.assert_array_equal(value, expected_example[name])
+    assert entry_path.stat().length > len(content)
+
+
+def test_manifest(spec, seqs_path, tmp_path):
+    """Test manifest bookkeeping across builds."""
+    cache_dir = epath.Path(tmp_path) / "cache"
+    cache_dir.mkdir()
+
+    def build():
+        digests = {}
+        for sequence_path in sorted(seqs_path.glob("seq_*.json")):
+            digest, _ = generate_cached_sequence_examples(
+                sequence_path, cache_dir, spec=spec, with_timestep_axis=True
+            )
+            digests[sequence_path.name] = digest
+        manifest = BuildManifest(cache_dir)
+        counts = manifest.update(seqs_path.name, digests)
+        manifest.save()
+        return counts
+
+    assert build() == {"new": 2, "changed": 0, "unchanged": 0, "removed": 0}
+    assert build() == {"new": 0, "changed": 0, "unchanged": 2, "removed": 0}
+
+    # Modify one file, remove another and add a new one.
+    content = (seqs_path / "seq_a.json").read_text()
+    (seqs_path / "seq_a.json").write_text(
+        content.replace('"grade": 100', '"grade": 50')
+    )
+    (seqs_path / "seq_b.json").rename(seqs_path / "seq_c.json")
+    assert build() == {"new": 1, "changed": 1, "unchanged": 0, "removed": 1}
+
+    # Only entries referenced by the manifest are kept.
+    assert len(list(cache_dir.glob("*.npz"))) == 2
+    assert BuildManifest(cache_dir).splits[seqs_path.name].keys() == {
+        "seq_a.json",
+        "seq_c.json",
+    }
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    BuildStats: Per-stage timings, counters and memory of a build.
+
+Functions:
+    call_with_stats: Call a function with a fresh `BuildStats`.
+    peak_rss_mb: Return the peak resident set size in MiB.
+
+NOTE: This module does not depend on TensorFlow so that it can be
+used by worker processes.
+
+"""
+
+import contextlib
+import json
+import sys
+import time
+
+from etils import epath
+
+try:
+    import resource
+except ImportError:
+    # NOTE: `resource` is only available on Unix.
+    resource = None
+
+_PROMETHEUS_PREFIX = "psiz_datasets_build"
+
+
+class BuildStats:
+    """Per-stage timings, counters and memory of a build.
+
+    Stages are timed with the `stage` context manager and events are
+    counted with `count`. Statistics collected in worker processes are
+    combined with `merge`. A disabled instance (see `disabled`) ignores
+    all calls, so instrumented code does not need to check whether
+    instrumentation is enabled.
+
+    Attributes:
+        seconds: A dictionary mapping stage names to the accumulated
+            wall time (in seconds).
+        counts: A dictionary mapping counter names to integers.
+
+    """
+
+    def __init__(self, enabled=True):
+        """Initialize.
+
+        Args:
+            enabled (optional): Boolean indicating if statistics are
+                recorded.
+
+        """
+        self.enabled = enabled
+        self.seconds = {}
+        self.counts = {}
+
+    @classmethod
+    def disabled(cls):
+        """Return an instance that does not record anything."""
+        return cls(enabled=False)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Context manager that adds its wall time to a stage."""
+        if not self.enabled:
+            yield
+            return
+        time_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_seconds(name, time.perf_counter() - time_start)
+
+    def add_seconds(self, name, seconds):
+        """Add wall time to a stage."""
+        if self.enabled:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        """Increment a counter."""
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + int(n)
+
+    def merge(self, other):
+        """Add the statistics of another instance to this instance."""
+        if not self.enabled:
+            return
+        for name, seconds in other.seconds.items():
+            self.add_seconds(name, seconds)
+        for name, n in other.counts.items():
+            self.count(name, n)
+
+    def summary(self):
+        """Return a JSON-serializable summary.
+
+        Returns:
+            A dictionary with the keys "seconds" and "counts" (see
+            class attributes) and "peak_rss_mb", the peak resident set
+            size (in MiB) of this process and of its largest terminated
+            child process (e.g., a worker).
+
+        """
+        return {
+            "seconds": dict(sorted(self.seconds.items())),
+            "counts": dict(sorted(self.counts.items())),
+            "peak_rss_mb": {
+                "self": peak_rss_mb(),
+                "children": peak_rss_mb(children=True),
+            },
+        }
+
+    def write(self, path, labels=None):
+        """Write the summary to a file.
+
+        Args:
+            path: Path of the output file. Files with a ".json" suffix
+                are written as JSON, all others using the Prometheus
+                text exposition format (e.g., for the node exporter's
+                textfile collector).
+            labels (optional): A dictionary of labels (e.g., the
+                dataset and config names) included in the output.
+
+        """
+        path = epath.Path(path)
+        labels = labels or {}
+        summary = self.summary()
+        if path.suffix == ".json":
+            content = json.dumps(dict(labels, **summary), indent=2)
+        else:
+            content = _prometheus_text(summary, labels)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def call_with_stats(func, item, **kwargs):
+    """Call a function with a fresh `BuildStats`.
+
+    Intended for use with `parallel_imap`, so that statistics collected
+    in worker processes can be returned to the main process.
+
+    Args:
+        func: A function accepting a `stats` keyword argument.
+        item: The positional argument of `func`.
+        **kwargs: Additional keyword arguments of `func`.
+
+    Returns:
+        result: The return value of `func`.
+        stats: The `BuildStats` collected during the call.
+
+    """
+    stats = BuildStats()
+    result = func(item, stats=stats, **kwargs)
+    return result, stats
+
+
+def peak_rss_mb(children=False):
+    """Return the peak resident set size in MiB.
+
+    Args:
+        children (optional): Boolean indicating if the peak of the
+            largest terminated child process should be returned
+            instead of the peak of this process.
+
+    Returns:
+        A float, or `None` if the platform does not provide the
+        `resource` module (e.g., Windows).
+
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # NOTE: `ru_maxrss` is reported in bytes on macOS and KiB elsewhere.
+    if sys.platform == "darwin":
+        return peak / 2**20
+    return peak / 2**10
+
+
+def _prometheus_labels(labels):
+    """Format Prometheus labels."""
+    if not labels:
+        return ""
+    return "{{{0}}}".format(
+        ",".join(
+            '{0}="{1}"'.format(key, str(value).replace('"', '\\"'))
+            for key, value in sorted(labels.items())
+        )
+    )
+
+
+def _prometheus_text(summary, labels):
+    """Return a summary in the Prometheus text exposition format."""
+    lines = []
+    metrics = (
+        ("stage_seconds", "gauge", "stage", summary["seconds"]),
+        ("count", "gauge", "name", summary["counts"]),
+        ("peak_rss_mebibytes", "gauge", "process", summary["peak_rss_mb"]),
+    )
+    for name, kind, key, values in metrics:
+        metric = "{0}_{1}".format(_PROMETHEUS_PREFIX, name)
+        lines.append("# TYPE {0} {1}".format(metric, kind))
+        for value_name, value in values.items():
+            if value is None:
+                continue
+            metric_labels = dict(labels, **{key: value_name})
+            lines.append(
+                "{0}{1} {2}".format(metric, _prometheus_labels(metric_labels), value)
+            )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test build_stats."""
+
+import json
+
+import pytest
+
+from psiz_datasets.core import BuildStats
+from psiz_datasets.core import build_stats
+from psiz_datasets.core import call_with_stats
+
+
+def _work(item, stats=None, offset=0):
+    """Record a stage and a counter."""
+    with stats.stage("work"):
+        stats.count("items", item + offset)
+    return item * 2
+
+
+def test_merge():
+    """Test combining statistics of several calls."""
+    stats = BuildStats()
+    for item in (1, 2):
+        result, call_stats = call_with_stats(_work, item, offset=1)
+        assert result == item * 2
+        stats.merge(call_stats)
+
+    assert stats.counts == {"items": 5}
+    assert stats.seconds["work"] >= 0.0
+    summary = stats.summary()
+    assert summary["peak_rss_mb"]["self"] > 0
+
+
+def test_disabled():
+    """Test that a disabled instance does not record anything."""
+    stats = BuildStats.disabled()
+    with stats.stage("work"):
+        stats.count("items")
+    stats.merge(call_with_stats(_work, 1)[1])
+
+    assert stats.seconds == {}
+    assert stats.counts == {}
+
+
+def test_stage_records_on_error():
+    """Test that a stage is recorded if its body raises."""
+    stats = BuildStats()
+    with pytest.raises(ValueError):
+        with stats.stage("work"):
+            raise ValueError()
+
+    assert "work" in stats.seconds
+
+
+def test_write(tmp_path):
+    """Test writing JSON and Prometheus text files."""
+    stats = BuildStats()
+    stats.count("trials:rank:8rank2", 3)
+    stats.add_seconds("parse", 1.5)
+    labels = {"dataset": "birds16_rank2019", "config": "with_timestep"}
+
+    stats.write(tmp_path / "stats.json", labels=labels)
+    stats.write(tmp_path / "stats.prom", labels=labels)
+
+    summary = json.loads((tmp_path / "stats.json").read_text())
+    assert summary["dataset"] == "birds16_rank2019"
+    assert summary["counts"] == {"trials:rank:8rank2": 3}
+    lines = (tmp_path / "stats.prom").read_text().splitlines()
+    assert "# TYPE psiz_datasets_build_stage_seconds gauge" in lines
+    assert (
+        'psiz_datasets_build_stage_seconds{config="with_timestep",'
+        'dataset="birds16_rank2019",stage="parse"} 1.5'
+    ) in lines
+    assert (
+        'psiz_datasets_build_count{config="with_timestep",'
+        'dataset="birds16_rank2019",name="trials:rank:8rank2"} 3'
+    ) in lines
+
+
+def test_without_resource(tmp_path, monkeypatch):
+    """Test platforms without the `resource` module."""
+    monkeypatch.setattr(build_stats, "resource", None)
+    stats = BuildStats()
+    stats.count("files")
+
+    assert build_stats.peak_rss_mb() is None
+    assert stats.summary()["peak_rss_mb"] == {"self": None, "children": None}
+    stats.write(tmp_path / "stats.prom")
+    assert "peak_rss_mebibytes{" not in (tmp_path / "stats.prom").read_text()
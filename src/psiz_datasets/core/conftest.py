@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Fixtures shared by the tests of the core subpackage."""
+
+from etils import epath
+import pytest
+
+from psiz_datasets.core.rank_sequence_spec import RankSequenceSpec
+
+
+@pytest.fixture
+def dummy_path():
+    """Path of the dummy data of the birds16_rank2019 dataset."""
+    return epath.Path(__file__).parent.parent / "birds16_rank2019" / "dummy_data"
+
+
+@pytest.fixture
+def spec():
+    """Spec of a dataset with two rank configurations."""
+    return RankSequenceSpec(
+        data_url="",
+        rank_configs=((8, 2), (2, 1)),
+        max_timestep=120,
+        metadata_columns=("common_name",),
+        other_kinds=("questionnaire:feedback",),
+    )
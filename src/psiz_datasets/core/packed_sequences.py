@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    SequenceRecord: A sequence record read from a packed file.
+
+Functions:
+    is_packed_file: Return if a file is a packed sequence file.
+    read_packed_sequences: Yield the sequence records of a packed file.
+    directory_sequence_files: Return the sequence files of a split
+        directory.
+
+Packed sequence files use the JSON Lines format, i.e., every line holds
+one sequence record with the same content as a "seq_*.json" file. Files
+may be uncompressed (".jsonl"), gzip compressed (".jsonl.gz") or zstd
+compressed (".jsonl.zst", requires the `zstandard` package, see the
+"zstd" extra).
+
+NOTE: This module does not depend on TensorFlow so that sequence
+records can be sent to worker processes.
+
+"""
+
+import dataclasses
+import gzip
+import importlib
+import io
+import itertools
+
+from psiz_datasets.core.build_stats import BuildStats
+
+_SEQUENCE_PATTERN = "seq_*.json"
+_PACKED_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+
+@dataclasses.dataclass(frozen=True)
+class SequenceRecord:
+    """A sequence record read from a packed file.
+
+    Implements the subset of the `pathlib.Path` interface that is used
+    to read sequence files (`name` and `read_bytes`), so that records
+    can be used in place of the paths of "seq_*.json" files.
+
+    Attributes:
+        name: String identifying the record by the name of its packed
+            file and its (1-based) line number, e.g.,
+            "chunk_000.jsonl.gz:12".
+        content: The raw bytes of the record.
+
+    """
+
+    name: str
+    content: bytes = dataclasses.field(repr=False)
+
+    def read_bytes(self):
+        """Return the raw bytes of the record."""
+        return self.content
+
+
+def is_packed_file(name):
+    """Return if a file is a packed sequence file.
+
+    Args:
+        name: String indicating the name of a file.
+
+    Returns:
+        Boolean.
+
+    """
+    return name.endswith(_PACKED_SUFFIXES)
+
+
+def read_packed_sequences(fobj, name, stats=None):
+    """Yield the sequence records of a packed file.
+
+    The file is decompressed and split into lines as it is read, so
+    only a single record is held in memory at a time. Blank lines are
+    skipped.
+
+    Args:
+        fobj: A binary file object of the packed file.
+        name: String indicating the name of the packed file, which
+            determines the compression (see module docstring).
+        stats (optional): A `BuildStats` object. Packed files are
+            counted as "packed_files".
+
+    Yields:
+        `SequenceRecord` objects.
+
+    Raises:
+        ImportError: If the file is zstd compressed and `zstandard` is
+            not installed.
+
+    """
+    stats = stats or BuildStats.disabled()
+    stats.count("packed_files")
+    if name.endswith(".gz"):
+        fobj = gzip.GzipFile(fileobj=fobj)
+    elif name.endswith(".zst"):
+        try:
+            zstandard = importlib.import_module("zstandard")
+        except ImportError as err:
+            raise ImportError(
+                "Reading '{0}' requires the `zstandard` package, e.g., "
+                "`pip install psiz-datasets[zstd]`.".format(name)
+            ) from err
+        fobj = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(fobj))
+    for idx_line, line in enumerate(fobj):
+        line = line.strip()
+        if line:
+            yield SequenceRecord("{0}:{1}".format(name, idx_line + 1), line)
+
+
+def directory_sequence_files(seqs_path, stats=None):
+    """Return the sequence files of a split directory.
+
+    Files are listed eagerly and sorted so that sequences are
+    generated in a deterministic order: every "seq_*.json" file,
+    followed by the records of every packed file (see module
+    docstring). Packed files are read lazily.
+
+    Args:
+        seqs_path: Path of the split directory.
+        stats (optional): See `read_packed_sequences`.
+
+    Returns:
+        An iterator of sequence file paths and `SequenceRecord`
+        objects.
+
+    """
+    sequence_paths = sorted(seqs_path.glob(_SEQUENCE_PATTERN))
+    packed_paths = sorted(
+        itertools.chain.from_iterable(
+            seqs_path.glob("*" + suffix) for suffix in _PACKED_SUFFIXES
+        )
+    )
+    return itertools.chain(
+        sequence_paths,
+        itertools.chain.from_iterable(
+            _read_packed_path(packed_path, stats) for packed_path in packed_paths
+        ),
+    )
+
+
+def _read_packed_path(packed_path, stats):
+    """Yield the sequence records of a packed file path."""
+    with packed_path.open("rb") as f:
+        yield from read_packed_sequences(f, packed_path.name, stats=stats)
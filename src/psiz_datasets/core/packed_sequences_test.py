@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test packed_sequences."""
+
+import gzip
+import io
+import pickle
+
+import pytest
+
+from psiz_datasets.core import directory_sequence_files
+from psiz_datasets.core import is_packed_file
+from psiz_datasets.core import read_packed_sequences
+
+_LINES = [b'{"sequence_id": "a"}', b"", b'{"sequence_id": "b"}']
+
+
+def _compress(content, name):
+    """Return content compressed according to file name."""
+    if name.endswith(".gz"):
+        return gzip.compress(content)
+    if name.endswith(".zst"):
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdCompressor().compress(content)
+    return content
+
+
+def test_is_packed_file():
+    """Test recognizing packed files."""
+    assert is_packed_file("chunk_000.jsonl")
+    assert is_packed_file("chunk_000.jsonl.gz")
+    assert is_packed_file("chunk_000.jsonl.zst")
+    assert not is_packed_file("seq_a.json")
+    assert not is_packed_file("chunk_000.json.gz")
+
+
+@pytest.mark.parametrize(
+    "name", ["chunk_000.jsonl", "chunk_000.jsonl.gz", "chunk_000.jsonl.zst"]
+)
+def test_read_packed_sequences(name):
+    """Test reading the records of a packed file."""
+    content = _compress(b"\n".join(_LINES) + b"\n", name)
+
+    records = list(read_packed_sequences(io.BytesIO(content), name))
+
+    assert [record.name for record in records] == [name + ":1", name + ":3"]
+    assert [record.read_bytes() for record in records] == [_LINES[0], _LINES[2]]
+    assert pickle.loads(pickle.dumps(records[0])) == records[0]
+
+
+def test_directory_sequence_files(tmp_path):
+    """Test listing sequence files and packed records."""
+    (tmp_path / "seq_b.json").write_bytes(b"{}")
+    (tmp_path / "seq_a.json").write_bytes(b"{}")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    (tmp_path / "chunk_001.jsonl").write_bytes(_LINES[0])
+    (tmp_path / "chunk_000.jsonl.gz").write_bytes(gzip.compress(_LINES[2]))
+
+    names = [sequence_file.name for sequence_file in directory_sequence_files(tmp_path)]
+
+    assert names == [
+        "seq_a.json",
+        "seq_b.json",
+        "chunk_000.jsonl.gz:1",
+        "chunk_001.jsonl:1",
+    ]
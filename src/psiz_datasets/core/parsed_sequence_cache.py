@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    ParsedSequenceCache: Persistent content-addressed cache of parsed
+        sequences.
+
+NOTE: This module does not depend on TensorFlow so that it can be
+used by worker processes.
+
+"""
+
+import contextlib
+import os
+import zipfile
+
+from etils import epath
+import numpy as np
+
+from psiz_datasets.utils import atomic_open
+
+# Keys of parsed sequences that are stored as scalars.
+_SCALAR_KEYS = ("sequence_id", "anonymous_id", "grade")
+_VERSION_PREFIX = "parser_v"
+
+
+class ParsedSequenceCache:
+    """Persistent content-addressed cache of parsed sequences.
+
+    Entries hold the output of `parse_sequence_file` and are keyed by
+    the content hash of the sequence file. Parsed sequences depend on
+    neither the builder config nor the dataset version, so a single
+    cache directory is shared by all configs and versions of a
+    dataset, and building a second config (or rebuilding after a
+    version bump) skips JSON decoding and trial parsing.
+
+    Entries are invalidated as follows:
+        * A changed sequence file has a different content hash.
+        * Entries live in a subdirectory named after the parser
+            version (e.g., "parser_v1"). Subdirectories of other
+            versions are removed by `evict`.
+        * Everything that depends on the dataset spec (e.g.,
+            validating timestep kinds) is recomputed when a parsed
+            sequence is formatted.
+        * Entries are written atomically, and unreadable entries are
+            removed and treated as misses.
+
+    Attributes:
+        cache_dir: The cache directory.
+        version: Integer indicating the parser version.
+        max_bytes: Integer indicating the maximum total size of the
+            entries, or `None` if the size is not limited.
+
+    """
+
+    def __init__(self, cache_dir, version, max_bytes=None):
+        """Initialize.
+
+        Args:
+            cache_dir: Path of cache directory.
+            version: Integer indicating the parser version, i.e.,
+                `rank_sequence.PARSER_VERSION`.
+            max_bytes (optional): See class attributes.
+
+        """
+        self.cache_dir = epath.Path(cache_dir)
+        self.version = int(version)
+        self.max_bytes = max_bytes
+
+    @property
+    def entry_dir(self):
+        """Directory of the entries of the current parser version."""
+        return self.cache_dir / "{0}{1}".format(_VERSION_PREFIX, self.version)
+
+    def load(self, digest):
+        """Load a parsed sequence.
+
+        Loading an entry refreshes its modification time, which is
+        used to evict the least recently used entries.
+
+        Args:
+            digest: String indicating the content hash of the sequence
+                file.
+
+        Returns:
+            A parsed sequence, or `None` if the cache does not hold
+            an entry for `digest`.
+
+        """
+        entry_path = self._entry_path(digest)
+        try:
+            with entry_path.open("rb") as f:
+                with np.load(f, allow_pickle=False) as arrays:
+                    parsed_sequence = {key: arrays[key] for key in arrays.files}
+        except FileNotFoundError:
+            return None
+        except (EOFError, OSError, ValueError, zipfile.BadZipFile):
+            entry_path.unlink(missing_ok=True)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(os.fspath(entry_path))
+        # NOTE: Use `item` to preserve the type of scalars.
+        for key in _SCALAR_KEYS:
+            parsed_sequence[key] = parsed_sequence[key].item()
+        return parsed_sequence
+
+    def save(self, digest, parsed_sequence):
+        """Save a parsed sequence.
+
+        Args:
+            digest: String indicating the content hash of the sequence
+                file.
+            parsed_sequence: A dictionary as returned by
+                `parse_sequence_file`.
+
+        """
+        self.entry_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {key: np.asarray(value) for key, value in parsed_sequence.items()}
+        with atomic_open(self._entry_path(digest)) as f:
+            np.savez(f, **arrays)
+
+    def evict(self):
+        """Evict stale and least recently used entries.
+
+        Removes the entries of other parser versions and, if
+        `max_bytes` is set, removes the least recently used entries
+        until the total size is at most `max_bytes`.
+
+        Returns:
+            A dictionary counting the "stale" parser versions and the
+            "evicted" entries that were removed.
+
+        """
+        counts = {"stale": 0, "evicted": 0}
+        if not self.cache_dir.exists():
+            return counts
+        for version_dir in self.cache_dir.glob(_VERSION_PREFIX + "*"):
+            if version_dir.is_dir() and version_dir != self.entry_dir:
+                version_dir.rmtree(missing_ok=True)
+                counts["stale"] += 1
+        if self.max_bytes is None or not self.entry_dir.exists():
+            return counts
+
+        entries = []
+        for entry_path in self.entry_dir.glob("*.npz"):
+            try:
+                entry_stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.mtime, entry_stat.length, entry_path))
+        total_bytes = sum(length for _, length, _ in entries)
+        for _, length, entry_path in sorted(entries, key=lambda entry: entry[0:2]):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= length
+            counts["evicted"] += 1
+        return counts
+
+    def _entry_path(self, digest):
+        """Return the path of an entry."""
+        return self.entry_dir / (digest + ".npz")
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test parsed_sequence_cache."""
+
+import os
+
+import numpy as np
+import pytest
+
+from psiz_datasets.core import PARSER_VERSION
+from psiz_datasets.core import ParsedSequenceCache
+from psiz_datasets.core import RankSequenceSpec
+from psiz_datasets.core import format_sequence_file
+from psiz_datasets.core import parse_sequence_file
+
+
+@pytest.fixture
+def content(dummy_path):
+    """Raw bytes of a dummy sequence file."""
+    return (dummy_path / "train_seqs" / "seq_a.json").read_bytes()
+
+
+def test_save_load(tmp_path, content):
+    """Test round trip of a parsed sequence."""
+    cache = ParsedSequenceCache(tmp_path, PARSER_VERSION)
+    expected = parse_sequence_file(content)
+
+    assert cache.load("abc") is None
+    cache.save("abc", expected)
+    parsed_sequence = cache.load("abc")
+
+    assert parsed_sequence.keys() == expected.keys()
+    for key, value in expected.items():
+        np.testing.assert_array_equal(parsed_sequence[key], value)
+    for key in ("sequence_id", "anonymous_id", "grade"):
+        assert type(parsed_sequence[key]) is type(expected[key])
+
+
+@pytest.mark.parametrize("with_timestep_axis", [True, False])
+@pytest.mark.parametrize("unified_trial", [True, False])
+def test_format_cached(spec, tmp_path, content, with_timestep_axis, unified_trial):
+    """Test formatting cached parsed sequences."""
+    cache = ParsedSequenceCache(tmp_path, PARSER_VERSION)
+    kwargs = {"with_timestep_axis": with_timestep_axis, "unified_trial": unified_trial}
+    expected_id, expected = format_sequence_file(content, spec, **kwargs)
+
+    # Populate the cache, then reuse it.
+    format_sequence_file(content, spec, parsed_cache=cache, **kwargs)
+    sequence_id, formatted_sequence = format_sequence_file(
+        content, spec, parsed_cache=cache, **kwargs
+    )
+
+    assert sequence_id == expected_id
+    assert formatted_sequence.keys() == expected.keys()
+    for key, value in expected.items():
+        np.testing.assert_array_equal(formatted_sequence[key], value)
+
+
+def test_validate_cached(spec, tmp_path, content):
+    """Test cached sequences are validated against the spec."""
+    cache = ParsedSequenceCache(tmp_path, PARSER_VERSION)
+    format_sequence_file(content, spec, parsed_cache=cache)
+    other_spec = RankSequenceSpec(
+        data_url="", rank_configs=((2, 1),), max_timestep=120, metadata_columns=()
+    )
+
+    with pytest.raises(NotImplementedError):
+        format_sequence_file(content, other_spec, parsed_cache=cache)
+
+
+@pytest.mark.parametrize("entry_content", [b"", b"corrupt"])
+def test_corrupt_entry(tmp_path, content, entry_content):
+    """Test unreadable entries are treated as misses."""
+    cache = ParsedSequenceCache(tmp_path, PARSER_VERSION)
+    cache.save("abc", parse_sequence_file(content))
+    entry_path = cache.entry_dir / "abc.npz"
+    entry_path.write_bytes(entry_content)
+
+    assert cache.load("abc") is None
+    assert not entry_path.exists()
+
+
+def test_evict(tmp_path, content):
+    """Test evicting stale versions and least recently used entries."""
+    parsed_sequence = parse_sequence_file(content)
+    ParsedSequenceCache(tmp_path, 0).save("abc", parsed_sequence)
+    cache = ParsedSequenceCache(tmp_path, 1)
+    for idx, digest in enumerate(["a", "b", "c"]):
+        cache.save(digest, parsed_sequence)
+        os.utime(cache.entry_dir / (digest + ".npz"), (idx, idx))
+    # Loading an entry marks it as recently used.
+    cache.load("a")
+    entry_bytes = os.path.getsize(cache.entry_dir / "a.npz")
+
+    assert cache.evict() == {"stale": 1, "evicted": 0}
+    assert not (tmp_path / "parser_v0").exists()
+
+    cache.max_bytes = 2 * entry_bytes
+    assert cache.evict() == {"stale": 0, "evicted": 1}
+    assert sorted(path.name for path in cache.entry_dir.iterdir()) == [
+        "a.npz",
+        "c.npz",
+    ]
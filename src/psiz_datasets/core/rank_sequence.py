@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core functions.
+
+Functions:
+    generate_sequence_examples: Return the examples of a sequence file.
+    format_sequence_file: Decode and format a sequence file.
+    parse_sequence_file: Decode and parse a sequence file.
+    format_parsed_sequence: Format a parsed sequence.
+    sequence_examples: Return the examples of a formatted sequence.
+    format_sequence: Format sequence.
+    select_timestep: Select a single timestep of a formatted sequence.
+    read_anonymous_id: Read the participant of a sequence file.
+    participant_sort_key: Return a stable sort key for a participant.
+    participant_fold: Return the cross-validation fold of a
+        participant.
+
+NOTE: This module does not depend on TensorFlow so that it can be
+used by worker processes (and other tools) without paying for a
+TensorFlow import.
+
+"""
+
+import hashlib
+
+import numpy as np
+
+from psiz_datasets.core.build_stats import BuildStats
+from psiz_datasets.utils import format_kind_trials
+from psiz_datasets.utils import format_rank_trials
+from psiz_datasets.utils import json_decoder
+from psiz_datasets.utils import parse_rank_sequence
+
+# Increment when the output of `parse_sequence_file` changes, which
+# invalidates all entries of a `ParsedSequenceCache`.
+PARSER_VERSION = 1
+
+
+def generate_sequence_examples(
+    sequence_path,
+    spec,
+    with_timestep_axis=None,
+    sparse_outcome=False,
+    max_timestep=None,
+    ragged_timestep=False,
+    unified_trial=False,
+    parsed_cache=None,
+    stats=None,
+):
+    """Returns the examples of a single sequence file.
+
+    Args:
+        sequence_path: Path of sequence file.
+        spec: A `RankSequenceSpec` object.
+        with_timestep_axis: Boolean indicating if examples should have
+            a timestep axis.
+        sparse_outcome: Boolean indicating if outcomes should be
+            sparse outcome indices.
+        max_timestep (optional): Integer indicating the length that
+            sequences are padded to if `with_timestep_axis=True`. By
+            default, `spec.max_timestep` is used.
+        ragged_timestep (optional): Boolean indicating if sequences
+            with a timestep axis should keep their own length instead
+            of being padded to `max_timestep`.
+        unified_trial (optional): Boolean indicating if trials should
+            be formatted as kind-tagged trials (see `format_sequence`).
+        parsed_cache (optional): A `ParsedSequenceCache` object. If
+            provided, parsed sequences are reused (and saved), so that
+            decoding and parsing is skipped for sequence files that
+            were parsed before, e.g., by another builder config.
+        stats (optional): A `BuildStats` object that records per-stage
+            timings and counters.
+
+    Returns:
+        A list of (example_id, example) tuples.
+
+    """
+    stats = stats or BuildStats.disabled()
+    with stats.stage("read"):
+        content = sequence_path.read_bytes()
+    stats.count("files")
+    sequence_id, formatted_sequence = format_sequence_file(
+        content,
+        spec,
+        with_timestep_axis=with_timestep_axis,
+        sparse_outcome=sparse_outcome,
+        max_timestep=max_timestep,
+        ragged_timestep=ragged_timestep,
+        unified_trial=unified_trial,
+        parsed_cache=parsed_cache,
+        stats=stats,
+    )
+    with stats.stage("unroll"):
+        examples = sequence_examples(
+            sequence_id, formatted_sequence, with_timestep_axis=with_timestep_axis
+        )
+    stats.count("examples", len(examples))
+    return examples
+
+
+def format_sequence_file(
+    content,
+    spec,
+    with_timestep_axis=None,
+    sparse_outcome=False,
+    max_timestep=None,
+    ragged_timestep=False,
+    unified_trial=False,
+    parsed_cache=None,
+    stats=None,
+):
+    """Decode and format the content of a single sequence file.
+
+    Args:
+        content: The raw bytes of a sequence file.
+        spec: See `generate_sequence_examples`.
+        with_timestep_axis: See `generate_sequence_examples`.
+        sparse_outcome: See `generate_sequence_examples`.
+        max_timestep: See `generate_sequence_examples`.
+        ragged_timestep: See `generate_sequence_examples`.
+        unified_trial: See `generate_sequence_examples`.
+        parsed_cache: See `generate_sequence_examples`.
+        stats: See `generate_sequence_examples`.
+
+    Returns:
+        sequence_id: A string identifying the sequence.
+        formatted_sequence: A dictionary of formatted fields. If
+            `with_timestep_axis=True`, the dictionary also includes the
+            number of (unpadded) timesteps as "n_timestep".
+
+    """
+    stats = stats or BuildStats.disabled()
+    if parsed_cache is None:
+        parsed_sequence = parse_sequence_file(content, stats=stats)
+    else:
+        with stats.stage("hash"):
+            digest = hashlib.sha256(content).hexdigest()
+        with stats.stage("parsed_cache_load"):
+            parsed_sequence = parsed_cache.load(digest)
+        if parsed_sequence is None:
+            stats.count("parsed_cache_misses")
+            parsed_sequence = parse_sequence_file(content, stats=stats)
+            with stats.stage("parsed_cache_save"):
+                parsed_cache.save(digest, parsed_sequence)
+        else:
+            stats.count("parsed_cache_hits")
+    return format_parsed_sequence(
+        parsed_sequence,
+        spec,
+        with_timestep_axis=with_timestep_axis,
+        sparse_outcome=sparse_outcome,
+        max_timestep=max_timestep,
+        ragged_timestep=ragged_timestep,
+        unified_trial=unified_trial,
+        stats=stats,
+    )
+
+
+def parse_sequence_file(content, stats=None):
+    """Decode and parse the content of a single sequence file.
+
+    The parsed sequence does not depend on the builder config or the
+    dataset spec, so that it can be cached (see `ParsedSequenceCache`)
+    and formatted for any config (see `format_parsed_sequence`).
+
+    Args:
+        content: The raw bytes of a sequence file.
+        stats (optional): A `BuildStats` object that records the
+            "decode" and "parse" stages.
+
+    Returns:
+        A dictionary of parsed rank trials (see `parse_rank_sequence`)
+        that also includes:
+            `sequence_id`: A string identifying the sequence.
+            `anonymous_id`: A string identifying the participant.
+            `grade`: Numeric sequence grade in [0, 100].
+            `timestep_kind`: A 1D array of the kind of every timestep,
+                including timesteps that are not rank trials.
+
+    """
+    stats = stats or BuildStats.disabled()
+    with stats.stage("decode"):
+        data = json_decoder()(content)
+    # version = data['version']
+    data = data["data"][0]
+    # design_id = data['design_id']
+    # project = data['project']
+    # protocol = data['protocol']
+    sequence = data["sequence"]
+    with stats.stage("parse"):
+        parsed_sequence = parse_rank_sequence(sequence)
+        parsed_sequence["timestep_kind"] = np.array(
+            [timestep["kind"] for timestep in sequence], dtype=np.str_
+        )
+    parsed_sequence["sequence_id"] = data["sequence_id"]
+    parsed_sequence["anonymous_id"] = data["anonymous_id"]
+    parsed_sequence["grade"] = data["grade"]
+    return parsed_sequence
+
+
+def format_parsed_sequence(
+    parsed_sequence,
+    spec,
+    with_timestep_axis=None,
+    sparse_outcome=False,
+    max_timestep=None,
+    ragged_timestep=False,
+    unified_trial=False,
+    stats=None,
+):
+    """Format a parsed sequence.
+
+    Args:
+        parsed_sequence: A dictionary as returned by
+            `parse_sequence_file`.
+        spec: See `generate_sequence_examples`.
+        with_timestep_axis: See `generate_sequence_examples`.
+        sparse_outcome: See `generate_sequence_examples`.
+        max_timestep: See `generate_sequence_examples`.
+        ragged_timestep: See `generate_sequence_examples`.
+        unified_trial: See `generate_sequence_examples`.
+        stats: See `generate_sequence_examples`.
+
+    Returns:
+        sequence_id: A string identifying the sequence.
+        formatted_sequence: See `format_sequence_file`.
+
+    Raises:
+        NotImplementedError: If the sequence contains a timestep kind
+            that is not in `spec.timestep_kinds`.
+
+    """
+    stats = stats or BuildStats.disabled()
+    timestep_kind = parsed_sequence["timestep_kind"]
+    with stats.stage("parse"):
+        spec.validate_kinds(timestep_kind)
+    groups = {
+        "anonymous_id": parsed_sequence["anonymous_id"],
+    }
+
+    # Pad sequence if preserving timestep axis.
+    if not with_timestep_axis or ragged_timestep:
+        max_timestep = None
+    elif max_timestep is None:
+        max_timestep = spec.max_timestep
+    formatted_sequence = _format_trials(
+        spec,
+        groups,
+        parsed_sequence["grade"],
+        parsed_sequence,
+        timestep_kind,
+        sparse_outcome=sparse_outcome,
+        max_timestep=max_timestep,
+        unified_trial=unified_trial,
+        stats=stats,
+    )
+    if with_timestep_axis:
+        # Number of rank trials, i.e., timesteps that are not padding.
+        # NOTE: Stored with the feature's dtype, so that the value
+        # survives a round trip through the incremental cache.
+        formatted_sequence["n_timestep"] = np.int32(
+            np.sum(np.isin(timestep_kind, spec.rank_kinds))
+        )
+    return parsed_sequence["sequence_id"], formatted_sequence
+
+
+def sequence_examples(sequence_id, formatted_sequence, with_timestep_axis=None):
+    """Returns the examples of a formatted sequence.
+
+    Args:
+        sequence_id: A string identifying the sequence.
+        formatted_sequence: A dictionary of formatted fields.
+        with_timestep_axis: Boolean indicating if the sequence should
+            be emitted as a single example. Otherwise, the sequence is
+            unrolled into one example per timestep.
+
+    Returns:
+        A list of (example_id, example) tuples.
+
+    """
+    examples = []
+    if with_timestep_axis:
+        example_id = sequence_id
+        examples.append((example_id, formatted_sequence))
+    else:
+        # Unroll single timesteps.
+        example_id_prefix = "{0}".format(sequence_id)
+
+        n_timestep = len(formatted_sequence["anonymous_id"])
+        for idx_timestep in range(n_timestep):
+            example_id = example_id_prefix + "/{0}".format(idx_timestep)
+            formatted_timestep = select_timestep(formatted_sequence, idx_timestep)
+            examples.append((example_id, formatted_timestep))
+    return examples
+
+
+def select_timestep(sequence, idx_timestep):
+    """Select a single timestep of a formatted sequence."""
+    timestep = {}
+    for key, value in sequence.items():
+        timestep[key] = value[idx_timestep]
+    return timestep
+
+
+def format_sequence(
+    spec,
+    groups,
+    grade,
+    sequence,
+    sparse_outcome=False,
+    max_timestep=None,
+    unified_trial=False,
+    stats=None,
+):
+    """Format sequence.
+
+    Every rank trial is paired with a placeholder trial of each of the
+    other rank configurations in `spec`. Alternatively, if
+    `unified_trial=True`, every rank trial is stored once and tagged
+    with a kind ID (see `format_kind_trials`). If `max_timestep` is
+    provided, fields are preallocated with `max_timestep` rows and rows
+    beyond the sequence are placeholder trials.
+
+    Args:
+        spec: A `RankSequenceSpec` object.
+        groups: A dictionary of group membership, i.e., "anonymous_id".
+        grade: Numeric sequence grade in [0, 100].
+        sequence: A list of timestep dictionaries.
+        sparse_outcome (optional): Boolean indicating if outcomes should
+            be sparse outcome indices.
+        max_timestep (optional): Integer indicating the number of rows
+            to allocate.
+        unified_trial (optional): Boolean indicating if trials should
+            be formatted as kind-tagged trials. Outcomes of kind-tagged
+            trials are always sparse.
+        stats (optional): A `BuildStats` object that records the
+            "parse" and "format" stages and counts trials of each kind,
+            placeholder rows and skipped (non-rank) timesteps.
+
+    Returns:
+        A dictionary of formatted fields.
+
+    Raises:
+        NotImplementedError: If the sequence contains a timestep kind
+            that is not in `spec.timestep_kinds`.
+
+    """
+    stats = stats or BuildStats.disabled()
+    with stats.stage("parse"):
+        spec.validate_sequence(sequence)
+        trials = parse_rank_sequence(sequence)
+    timestep_kind = [timestep["kind"] for timestep in sequence]
+    return _format_trials(
+        spec,
+        groups,
+        grade,
+        trials,
+        timestep_kind,
+        sparse_outcome=sparse_outcome,
+        max_timestep=max_timestep,
+        unified_trial=unified_trial,
+        stats=stats,
+    )
+
+
+def _format_trials(
+    spec,
+    groups,
+    grade,
+    trials,
+    timestep_kind,
+    sparse_outcome=False,
+    max_timestep=None,
+    unified_trial=False,
+    stats=None,
+):
+    """Format the parsed rank trials of a sequence (see `format_sequence`)."""
+    n_timestep = len(trials["kind"])
+    if max_timestep is not None:
+        n_timestep = max_timestep
+    sample_weight = grade / 100
+    if stats.enabled:
+        _count_sequence(stats, spec, timestep_kind, trials, n_timestep, unified_trial)
+
+    with stats.stage("format"):
+        formatted_sequence = {
+            "anonymous_id": [groups["anonymous_id"]] * n_timestep,
+        }
+        if unified_trial:
+            formatted_sequence.update(
+                format_kind_trials(
+                    trials,
+                    spec.rank_configs,
+                    sample_weight=sample_weight,
+                    n_timestep=n_timestep,
+                )
+            )
+            return formatted_sequence
+        for n_reference, n_select in spec.rank_configs:
+            formatted_sequence.update(
+                format_rank_trials(
+                    trials,
+                    n_reference=n_reference,
+                    n_select=n_select,
+                    sample_weight=sample_weight,
+                    sparse_outcome=sparse_outcome,
+                    n_timestep=n_timestep,
+                )
+            )
+    return formatted_sequence
+
+
+def _count_sequence(stats, spec, timestep_kind, trials, n_timestep, unified_trial):
+    """Count the trials, placeholder rows and skipped timesteps."""
+    n_trial = len(trials["kind"])
+    for kind in spec.rank_kinds:
+        n_kind = int(np.sum(np.equal(trials["kind"], kind)))
+        stats.count("trials:" + kind, n_kind)
+        if not unified_trial:
+            stats.count("placeholder_rows", n_timestep - n_kind)
+    if unified_trial:
+        stats.count("placeholder_rows", n_timestep - n_trial)
+    for kind in timestep_kind:
+        if kind not in spec.rank_kinds:
+            stats.count("skipped:" + str(kind))
+
+
+def read_anonymous_id(sequence_path):
+    """Read the participant of a sequence file.
+
+    Args:
+        sequence_path: Path of sequence file.
+
+    Returns:
+        A string indicating the anonymous ID of the participant.
+
+    """
+    data = json_decoder()(sequence_path.read_bytes())
+    return data["data"][0]["anonymous_id"]
+
+
+def participant_sort_key(anonymous_id):
+    """Return a stable sort key for a participant.
+
+    Sorting participants by a hash of their anonymous ID (rather than
+    the ID itself) spreads participants with similar IDs across the
+    dataset, while remaining deterministic across builds and machines.
+
+    Args:
+        anonymous_id: A string indicating the anonymous ID of a
+            participant.
+
+    Returns:
+        A hexadecimal string.
+
+    """
+    return hashlib.sha256(anonymous_id.encode("utf-8")).hexdigest()
+
+
+def participant_fold(anonymous_id, num_folds):
+    """Return the cross-validation fold of a participant.
+
+    Folds are assigned by hashing the anonymous ID (see
+    `participant_sort_key`), so the fold of a participant does not
+    depend on which other participants are in the dataset, i.e., new
+    data does not reassign existing participants.
+
+    Args:
+        anonymous_id: A string indicating the anonymous ID of a
+            participant.
+        num_folds: Integer indicating the number of folds.
+
+    Returns:
+        An integer in `[0, num_folds)`.
+
+    """
+    return int(participant_sort_key(anonymous_id), 16) % num_folds
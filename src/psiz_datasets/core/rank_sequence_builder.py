@@ -0,0 +1,839 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    RankSequenceConfig: BuilderConfig for rank-sequence datasets.
+    RankSequenceMetadata: Dataset metadata with columnar stimulus
+        metadata.
+    RankSequenceBuilder: Base DatasetBuilder for rank-sequence
+        datasets.
+
+Functions:
+    rank_sequence_configs: Return the standard builder configs.
+
+"""
+
+import dataclasses
+import functools
+import io
+import json
+import logging
+import pkgutil
+import time
+
+from etils import epath
+import tensorflow as tf
+import tensorflow_datasets as tfds
+
+from psiz_datasets.core.build_manifest import CACHE_VERSION
+from psiz_datasets.core.build_manifest import BuildManifest
+from psiz_datasets.core.build_manifest import generate_cached_sequence_examples
+from psiz_datasets.core.build_stats import BuildStats
+from psiz_datasets.core.build_stats import call_with_stats
+from psiz_datasets.core.packed_sequences import directory_sequence_files
+from psiz_datasets.core.parsed_sequence_cache import ParsedSequenceCache
+from psiz_datasets.core.rank_sequence import PARSER_VERSION
+from psiz_datasets.core.rank_sequence import generate_sequence_examples
+from psiz_datasets.core.rank_sequence import participant_fold
+from psiz_datasets.core.rank_sequence import participant_sort_key
+from psiz_datasets.core.rank_sequence import read_anonymous_id
+from psiz_datasets.core.sequence_archive import archive_sequence_members
+from psiz_datasets.core.sequence_archive import read_archive_member
+from psiz_datasets.core.stimulus_table import StimulusTable
+from psiz_datasets.utils import parallel_imap
+from psiz_datasets.utils import rank_n_outcome
+
+_HOMEPAGE = "https://psiz.readthedocs.io/en/latest/src/datasets/datasets.html"
+
+
+class RankSequenceConfig(tfds.core.BuilderConfig):
+    """BuilderConfig for rank-sequence datasets."""
+
+    def __init__(
+        self,
+        *,
+        with_timestep_axis=None,
+        sparse_outcome=False,
+        max_timestep=None,
+        ragged_timestep=False,
+        unified_trial=False,
+        data_url=None,
+        **kwargs
+    ):
+        """BuilderConfig for rank-sequence datasets.
+
+        Args:
+            with_timestep_axis: Boolean indicating if dataset should be
+                returned with a timestep axis. If `True`, dataset
+                includes timestep axis.
+            sparse_outcome: Boolean indicating if outcomes should be
+                stored as sparse (integer) outcome indices instead of
+                one-hot encodings.
+            max_timestep: Integer indicating the length that sequences
+                are padded to if `with_timestep_axis=True`.
+            ragged_timestep: Boolean indicating if sequences with a
+                timestep axis should be stored with their own length
+                (i.e., without trailing placeholder trials) instead of
+                being padded to `max_timestep`. Batches can be padded
+                at read time using `pad_sequence_batch`.
+            unified_trial: Boolean indicating if each timestep should
+                store a single kind-tagged trial (padded to the largest
+                rank configuration) instead of one trial of every rank
+                configuration. Outcomes are sparse outcome indices. The
+                per-configuration layout can be reconstructed at read
+                time using `split_trial_kinds`.
+            data_url: String indicating the URL of the raw data archive.
+            **kwargs: keyword arguments forwarded to super.
+
+        """
+        super(RankSequenceConfig, self).__init__(**kwargs)
+        self.with_timestep_axis = with_timestep_axis
+        self.sparse_outcome = sparse_outcome
+        self.max_timestep = max_timestep
+        self.ragged_timestep = ragged_timestep
+        self.unified_trial = unified_trial
+        self.data_url = data_url
+
+
+class RankSequenceMetadata(tfds.core.Metadata):
+    """Dataset metadata with columnar stimulus metadata.
+
+    Acts like a `tfds.core.MetadataDict`, except that a `StimulusTable`
+    stored under the "stimuli" key is saved as a directory of binary
+    arrays (rather than as part of the JSON metadata file). When
+    restored, the table is loaded lazily.
+
+    """
+
+    STIMULI_KEY = "stimuli"
+    _FILENAME = "metadata.json"
+
+    def save_metadata(self, data_dir):
+        """Save the metadata."""
+        data_dir = epath.Path(data_dir)
+        metadata = dict(self)
+        stimuli = metadata.pop(self.STIMULI_KEY, None)
+        if isinstance(stimuli, StimulusTable):
+            stimuli.save(data_dir / self.STIMULI_KEY)
+        elif stimuli is not None:
+            metadata[self.STIMULI_KEY] = stimuli
+        with (data_dir / self._FILENAME).open(mode="w") as f:
+            json.dump(metadata, f)
+
+    def load_metadata(self, data_dir):
+        """Restore the metadata."""
+        data_dir = epath.Path(data_dir)
+        self.clear()
+        metadata_path = data_dir / self._FILENAME
+        if metadata_path.exists():
+            self.update(json.loads(metadata_path.read_text()))
+        stimuli_dir = data_dir / self.STIMULI_KEY
+        if stimuli_dir.exists():
+            self[self.STIMULI_KEY] = StimulusTable.load(stimuli_dir)
+
+
+def rank_sequence_configs(config_class, description):
+    """Return the standard builder configs.
+
+    Args:
+        config_class: A `RankSequenceConfig` subclass.
+        description: String describing the dataset. The description
+            of each config is appended to it.
+
+    Returns:
+        A list of builder configs.
+
+    """
+    with_description = (
+        " Dataset is formatted with a timestep axis to facilitate sequence " "modeling."
+    )
+    without_description = (
+        " Dataset is formatted without a timestep axis by 'unrolling' all "
+        "sequences and dropping placeholder trials."
+    )
+    sparse_description = " Outcomes are stored as sparse outcome indices."
+    unified_description = " Each timestep stores a single trial tagged with its kind."
+    ragged_description = (
+        " Sequences are stored without trailing placeholder trials and have "
+        "variable length."
+    )
+    return [
+        config_class(
+            name="with_timestep",
+            description=description + with_description,
+            with_timestep_axis=True,
+        ),
+        config_class(
+            name="without_timestep",
+            description=description + without_description,
+            with_timestep_axis=False,
+        ),
+        config_class(
+            name="with_timestep_sparse",
+            description=description + with_description + sparse_description,
+            with_timestep_axis=True,
+            sparse_outcome=True,
+        ),
+        config_class(
+            name="without_timestep_sparse",
+            description=description + without_description + sparse_description,
+            with_timestep_axis=False,
+            sparse_outcome=True,
+        ),
+        config_class(
+            name="with_timestep_ragged",
+            description=description + with_description + ragged_description,
+            with_timestep_axis=True,
+            ragged_timestep=True,
+        ),
+        config_class(
+            name="with_timestep_ragged_sparse",
+            description=(
+                description + with_description + ragged_description + sparse_description
+            ),
+            with_timestep_axis=True,
+            sparse_outcome=True,
+            ragged_timestep=True,
+        ),
+        config_class(
+            name="with_timestep_unified",
+            description=description + with_description + unified_description,
+            with_timestep_axis=True,
+            sparse_outcome=True,
+            unified_trial=True,
+        ),
+        config_class(
+            name="without_timestep_unified",
+            description=description + without_description + unified_description,
+            with_timestep_axis=False,
+            sparse_outcome=True,
+            unified_trial=True,
+        ),
+    ]
+
+
+class RankSequenceBuilder(tfds.core.GeneratorBasedBuilder, skip_registration=True):
+    """Base DatasetBuilder for rank-sequence datasets.
+
+    Subclasses declare the dataset using the `SPEC` class attribute (a
+    `RankSequenceSpec`) along with the usual `VERSION`,
+    `BUILDER_CONFIGS` and `RELEASE_NOTES`. The description and citation
+    are read from the "DESCRIPTION.md" and "CITATIONS.bib" files that
+    live alongside the subclass.
+
+    The directory of each split holds one "seq_*.json" file per
+    sequence and/or a few large packed files in the (optionally gzip or
+    zstd compressed) JSON Lines format with one sequence per line (see
+    `psiz_datasets.core.packed_sequences`). Packed files are streamed
+    line by line, which avoids per-file overhead on shared storage.
+
+    """
+
+    SPEC = None
+
+    def __init__(
+        self,
+        *,
+        num_workers=None,
+        incremental_cache_dir=None,
+        num_participant_shards=None,
+        build_stats=False,
+        build_stats_path=None,
+        stream_archive=False,
+        parsed_cache_dir=None,
+        parsed_cache_max_bytes=None,
+        num_folds=None,
+        **kwargs
+    ):
+        """DatasetBuilder for rank-sequence datasets.
+
+        Args:
+            num_workers (optional): Integer indicating the number of
+                worker processes used to parse and format sequence
+                files when preparing the dataset. By default, files are
+                processed serially.
+            incremental_cache_dir (optional): Path of a directory that
+                persists formatted sequences (keyed by file content
+                hash) and a build manifest between builds. Entries are
+                stored per config, dataset version and `CACHE_VERSION`
+                (parser version and entry format). When
+                provided, a rebuild only decodes and formats sequence
+                files that are new or have changed since the previous
+                build. By default, every file is processed.
+            num_participant_shards (optional): Integer indicating the
+                number of shards of each split. When provided, examples
+                are written grouped by participant (`anonymous_id`) in
+                a deterministic order (see `participant_sort_key`) and
+                split into shards with (nearly) equal numbers of
+                examples. Each participant's examples are contiguous,
+                so a participant spans at most two adjacent shards.
+                This allows file-based auto-sharding (e.g., by
+                `tf.distribute`) to give each worker balanced and
+                (nearly) participant-disjoint data. Note that the raw
+                content of streamed archive members and packed records
+                is held in memory while grouping participants. By
+                default, TFDS shuffles examples across an automatically
+                chosen number of shards.
+
+                Whenever examples are grouped by participant (i.e.,
+                `num_participant_shards` or `num_folds` is provided),
+                the example range of every participant is stored in the
+                "participant_index" metadata (see
+                `psiz_datasets.loaders.participant_split`).
+            build_stats (optional): Boolean indicating if per-stage
+                wall time (e.g., "read", "decode", "parse", "format"
+                and "write"), counters (e.g., files, trials of each
+                kind, placeholder rows and skipped timesteps) and peak
+                memory are recorded while preparing the dataset. A
+                summary is logged at the end of `download_and_prepare`
+                and the statistics are available as the `build_stats`
+                attribute. By default, nothing is recorded.
+            build_stats_path (optional): Path of a file the summary is
+                written to. Implies `build_stats=True`. Paths with a
+                ".json" suffix are written as JSON and all others using
+                the Prometheus text exposition format.
+            stream_archive (optional): Boolean indicating if sequence
+                files are read directly from the downloaded archive
+                instead of extracting it first. Members are read
+                sequentially in archive order, which avoids doubling
+                disk usage and one filesystem round trip per sequence
+                file. The examples (and their IDs) are identical to
+                those of an extracted build. By default, the archive is
+                extracted.
+            parsed_cache_dir (optional): Path of a directory that
+                persists parsed sequences (keyed by file content hash
+                and parser version, see `ParsedSequenceCache`) between
+                builds. Parsed sequences do not depend on the config or
+                the dataset version, so all configs of a dataset share
+                the cache and preparing another config (or a new
+                version) mostly skips JSON decoding and trial parsing.
+                Unlike `incremental_cache_dir`, formatting still runs
+                for every sequence. By default, nothing is cached.
+            parsed_cache_max_bytes (optional): Integer indicating the
+                maximum total size of the parsed sequence cache. When
+                exceeded, the least recently used entries are evicted
+                at the end of `download_and_prepare`. By default, the
+                size is not limited.
+            num_folds (optional): Integer indicating the number of
+                participant-level cross-validation folds. When
+                provided, every participant is assigned to a fold by
+                hashing its `anonymous_id` (see `participant_fold`), so
+                that new data does not reassign existing participants,
+                and examples are written grouped by fold and then by
+                participant. Each fold is therefore a contiguous range
+                of examples that can be selected with TFDS split
+                slicing (see
+                `psiz_datasets.loaders.participant_fold_splits`) without
+                scanning records. The ranges are stored in the
+                "participant_folds" metadata. By default, no folds are
+                assigned.
+            **kwargs: keyword arguments forwarded to super.
+
+        """
+        # NOTE: Options are set before calling super, since they are used
+        # by `_info`.
+        self.num_workers = num_workers
+        self.incremental_cache_dir = incremental_cache_dir
+        self.num_participant_shards = num_participant_shards
+        self.build_stats_path = build_stats_path
+        self.stream_archive = stream_archive
+        self.parsed_cache_dir = parsed_cache_dir
+        self.parsed_cache_max_bytes = parsed_cache_max_bytes
+        self.num_folds = num_folds
+        self.build_stats = BuildStats(
+            enabled=build_stats or build_stats_path is not None
+        )
+        super(RankSequenceBuilder, self).__init__(**kwargs)
+        # Preserve options when pickling.
+        self._original_state["num_workers"] = num_workers
+        self._original_state["incremental_cache_dir"] = incremental_cache_dir
+        self._original_state["num_participant_shards"] = num_participant_shards
+        self._original_state["build_stats"] = build_stats
+        self._original_state["build_stats_path"] = build_stats_path
+        self._original_state["stream_archive"] = stream_archive
+        self._original_state["parsed_cache_dir"] = parsed_cache_dir
+        self._original_state["parsed_cache_max_bytes"] = parsed_cache_max_bytes
+        self._original_state["num_folds"] = num_folds
+
+    def download_and_prepare(self, *, download_config=None, **kwargs):
+        """Downloads and prepares dataset for reading.
+
+        See `tfds.core.DatasetBuilder.download_and_prepare`.
+
+        Raises:
+            ValueError: If `download_config.num_shards` conflicts with
+                `num_participant_shards`.
+
+        """
+        if self.num_participant_shards is not None:
+            download_config = download_config or tfds.download.DownloadConfig()
+            if download_config.num_shards not in (
+                None,
+                self.num_participant_shards,
+            ):
+                raise ValueError(
+                    "`download_config.num_shards`={0} conflicts with "
+                    "`num_participant_shards`={1}.".format(
+                        download_config.num_shards, self.num_participant_shards
+                    )
+                )
+            download_config = dataclasses.replace(
+                download_config, num_shards=self.num_participant_shards
+            )
+        with self.build_stats.stage("total"):
+            super(RankSequenceBuilder, self).download_and_prepare(
+                download_config=download_config, **kwargs
+            )
+        parsed_cache = self._parsed_cache()
+        if parsed_cache is not None:
+            counts = parsed_cache.evict()
+            logging.info(
+                "Parsed sequence cache of %s: removed %d stale parser versions "
+                "and evicted %d entries.",
+                self.name,
+                counts["stale"],
+                counts["evicted"],
+            )
+        if self.build_stats.enabled:
+            self._emit_build_stats()
+
+    def _parsed_cache(self):
+        """Return the parsed sequence cache, or `None` if disabled."""
+        if self.parsed_cache_dir is None:
+            return None
+        # Parsed sequences are shared by all configs and versions.
+        return ParsedSequenceCache(
+            epath.Path(self.parsed_cache_dir) / self.name,
+            PARSER_VERSION,
+            max_bytes=self.parsed_cache_max_bytes,
+        )
+
+    def _emit_build_stats(self):
+        """Log and (optionally) write the build statistics."""
+        summary = self.build_stats.summary()
+        logging.info(
+            "Build statistics of %s/%s: %s",
+            self.name,
+            self.builder_config.name,
+            json.dumps(summary),
+        )
+        if self.build_stats_path is not None:
+            self.build_stats.write(
+                self.build_stats_path,
+                labels={
+                    "dataset": self.name,
+                    "config": self.builder_config.name,
+                    "version": str(self.version),
+                },
+            )
+
+    def _info(self) -> tfds.core.DatasetInfo:
+        """Returns the dataset metadata."""
+        encoding = tfds.features.Encoding.NONE
+        if self.builder_config.with_timestep_axis:
+            # NOTE: Fields with a timestep axis are declared as tensors
+            # (rather than a `Sequence` of tensors) so that the
+            # preallocated sequence arrays are encoded in a single call.
+            # The serialized examples are identical.
+            if self.builder_config.ragged_timestep:
+                n_timestep = None
+            else:
+                n_timestep = self.builder_config.max_timestep
+            timestep_shape = (n_timestep,)
+            anonymous_id = tfds.features.Sequence(
+                tfds.features.Text(), length=n_timestep
+            )
+        else:
+            timestep_shape = ()
+            anonymous_id = tfds.features.Text()
+        if self.builder_config.sparse_outcome:
+            outcome_dtype = tf.int32
+        else:
+            outcome_dtype = tf.float32
+
+        features = {"anonymous_id": anonymous_id}
+        if self.builder_config.with_timestep_axis:
+            # Number of timesteps before padding, e.g., for bucketing
+            # sequences by length at read time.
+            features["n_timestep"] = tfds.features.Scalar(dtype=tf.int32)
+        inputs = {"anonymous_id": "anonymous_id"}
+        targets = {}
+        sample_weights = {}
+        if self.builder_config.unified_trial:
+            rank_configs = ()
+            max_reference = max(
+                n_reference for n_reference, _ in self.SPEC.rank_configs
+            )
+            features.update(
+                {
+                    "kind": tfds.features.Tensor(
+                        shape=timestep_shape, dtype=tf.int32, encoding=encoding
+                    ),
+                    "stimulus_set": tfds.features.Tensor(
+                        shape=timestep_shape + (max_reference + 1,),
+                        dtype=tf.int32,
+                        encoding=encoding,
+                    ),
+                    "outcome": tfds.features.Tensor(
+                        shape=timestep_shape, dtype=tf.int32, encoding=encoding
+                    ),
+                    "response_time_ms": tfds.features.Tensor(
+                        shape=timestep_shape, dtype=tf.float32, encoding=encoding
+                    ),
+                    "sample_weight": tfds.features.Tensor(
+                        shape=timestep_shape, dtype=tf.float32, encoding=encoding
+                    ),
+                }
+            )
+            inputs.update({"kind": "kind", "stimulus_set": "stimulus_set"})
+            targets.update(
+                {"outcome": "outcome", "response_time_ms": "response_time_ms"}
+            )
+            sample_weights["sample_weight"] = "sample_weight"
+        else:
+            rank_configs = sorted(zip(self.SPEC.prefixes, self.SPEC.rank_configs))
+        for prefix, (n_reference, n_select) in rank_configs:
+            if self.builder_config.sparse_outcome:
+                outcome_shape = ()
+            else:
+                outcome_shape = (rank_n_outcome(n_reference, n_select),)
+            features.update(
+                {
+                    prefix
+                    + "_stimulus_set": tfds.features.Tensor(
+                        shape=timestep_shape + (n_reference + 1,),
+                        dtype=tf.int32,
+                        encoding=encoding,
+                    ),
+                    prefix
+                    + "_outcome": tfds.features.Tensor(
+                        shape=timestep_shape + outcome_shape,
+                        dtype=outcome_dtype,
+                        encoding=encoding,
+                    ),
+                    prefix
+                    + "_response_time_ms": tfds.features.Tensor(
+                        shape=timestep_shape, dtype=tf.float32, encoding=encoding
+                    ),
+                    prefix
+                    + "_sample_weight": tfds.features.Tensor(
+                        shape=timestep_shape, dtype=tf.float32, encoding=encoding
+                    ),
+                }
+            )
+            inputs[prefix + "_stimulus_set"] = prefix + "_stimulus_set"
+            targets[prefix + "_outcome"] = prefix + "_outcome"
+            targets[prefix + "_response_time_ms"] = prefix + "_response_time_ms"
+            sample_weights[prefix + "_sample_weight"] = prefix + "_sample_weight"
+
+        return tfds.core.DatasetInfo(
+            builder=self,
+            description=self._read_package_file("DESCRIPTION.md"),
+            features=tfds.features.FeaturesDict(features),
+            supervised_keys=(inputs, targets, sample_weights),
+            homepage=_HOMEPAGE,
+            citation=self._read_package_file("CITATIONS.bib"),
+            # Participant sharding and folds rely on examples being
+            # written in the order they are generated.
+            disable_shuffling=self._group_participants,
+            # Empty metadata object that will be filled dynamically.
+            metadata=RankSequenceMetadata(),
+        )
+
+    @classmethod
+    def _read_package_file(cls, filename):
+        """Returns the text of a file in the subclass' package."""
+        return pkgutil.get_data(cls.__module__, filename).decode("utf-8")
+
+    def _split_generators(self, dl_manager: tfds.download.DownloadManager):
+        """Returns SplitGenerators."""
+        data_url = self.builder_config.data_url
+        metadata_columns = self.SPEC.metadata_columns
+        if self.stream_archive:
+            archive_path = dl_manager.download(data_url)
+            archive = functools.partial(dl_manager.iter_archive, archive_path)
+            # Load metadata file.
+            content = read_archive_member(archive(), "stimuli.txt")
+            self.info.metadata["stimuli"] = StimulusTable.from_buffer(
+                io.StringIO(content.decode("utf-8")), metadata_columns
+            )
+            extracted_path = None
+        else:
+            extracted_path = dl_manager.download_and_extract(data_url)
+            archive = None
+            # Load metadata file.
+            metadata_file = extracted_path / "stimuli.txt"
+            self.info.metadata["stimuli"] = StimulusTable.from_file(
+                metadata_file, metadata_columns
+            )
+        if self.builder_config.unified_trial:
+            # Kind ID `i + 1` corresponds to the i-th prefix.
+            self.info.metadata["trial_kinds"] = list(self.SPEC.prefixes)
+        # Filled while generating examples.
+        if self._group_participants:
+            self.info.metadata["participant_index"] = {}
+        if self.num_folds is not None:
+            self.info.metadata["participant_folds"] = {
+                "num_folds": self.num_folds,
+                "splits": {},
+            }
+
+        return {
+            split: self._generate_examples(
+                split, seqs_dir, extracted_path=extracted_path, archive=archive
+            )
+            for split, seqs_dir in self.SPEC.splits.items()
+        }
+
+    @property
+    def _group_participants(self):
+        """Whether examples are written grouped by participant."""
+        return self.num_participant_shards is not None or self.num_folds is not None
+
+    def _generate_examples(self, split, seqs_dir, extracted_path=None, archive=None):
+        """Yields examples.
+
+        Args:
+            split: String indicating the name of the split.
+            seqs_dir: String indicating the directory of the split's
+                sequence files.
+            extracted_path (optional): Path of the extracted archive.
+            archive (optional): A callable that returns an iterator of
+                the (path, file object) members of the archive. Used
+                instead of `extracted_path` when streaming.
+
+        """
+        stats = self.build_stats
+        with stats.stage("list_files"):
+            if archive is None:
+                sequence_paths = directory_sequence_files(
+                    extracted_path / seqs_dir, stats=stats
+                )
+            else:
+                # Archive order is deterministic and examples are keyed
+                # by ID, so members are streamed without sorting.
+                sequence_paths = archive_sequence_members(
+                    archive(), seqs_dir, stats=stats
+                )
+        if not self._group_participants:
+            yield from self._generate_file_examples(seqs_dir, sequence_paths)
+            return
+
+        # Group sequences by participant. Files are read twice, but the
+        # formatted examples are never held in memory. The raw content
+        # of streamed archive members and packed records is held in
+        # memory though.
+        sequence_paths = list(sequence_paths)
+        with stats.stage("group_participants"):
+            anonymous_ids = list(
+                parallel_imap(
+                    read_anonymous_id, sequence_paths, num_workers=self.num_workers
+                )
+            )
+            folds = [0] * len(anonymous_ids)
+            if self.num_folds is not None:
+                folds = [
+                    participant_fold(anonymous_id, self.num_folds)
+                    for anonymous_id in anonymous_ids
+                ]
+            # NOTE: Ties are broken by name (rather than path), which is
+            # unique within a split and does not depend on whether files
+            # are extracted, streamed or packed.
+            sort_keys = [
+                (
+                    folds[idx],
+                    participant_sort_key(anonymous_id),
+                    anonymous_id,
+                    sequence_path.name,
+                    idx,
+                )
+                for idx, (anonymous_id, sequence_path) in enumerate(
+                    zip(anonymous_ids, sequence_paths)
+                )
+            ]
+            order = [sort_key[-1] for sort_key in sorted(sort_keys)]
+            sequence_paths = [sequence_paths[idx] for idx in order]
+        # NOTE: When shuffling is disabled, TFDS writes examples in the
+        # order of their (integer) keys, so examples are keyed by their
+        # position.
+        example_counts = []
+        examples = self._generate_file_examples(
+            seqs_dir, sequence_paths, example_counts=example_counts
+        )
+        for idx, (_, example) in enumerate(examples):
+            yield idx, example
+
+        participant_index, fold_ranges = _participant_ranges(
+            [anonymous_ids[idx] for idx in order],
+            [folds[idx] for idx in order],
+            example_counts,
+            self.num_folds or 1,
+        )
+        self.info.metadata["participant_index"][split] = participant_index
+        if self.num_folds is not None:
+            self.info.metadata["participant_folds"]["splits"][split] = fold_ranges
+
+    def _generate_file_examples(self, seqs_dir, sequence_paths, example_counts=None):
+        """Yields the examples of sequence files in the provided order.
+
+        Args:
+            seqs_dir: String indicating the directory of the split's
+                sequence files.
+            sequence_paths: An iterable of sequence files.
+            example_counts (optional): A list that the number of
+                examples of each sequence file is appended to.
+
+        """
+        if example_counts is None:
+            example_counts = []
+        builder_config = self.builder_config
+        format_kwargs = {
+            "spec": self.SPEC,
+            "with_timestep_axis": builder_config.with_timestep_axis,
+            "sparse_outcome": builder_config.sparse_outcome,
+            "max_timestep": builder_config.max_timestep,
+            "ragged_timestep": builder_config.ragged_timestep,
+            "unified_trial": builder_config.unified_trial,
+            "parsed_cache": self._parsed_cache(),
+        }
+
+        if self.incremental_cache_dir is None:
+            generate = functools.partial(generate_sequence_examples, **format_kwargs)
+            for examples in self._imap(generate, sequence_paths):
+                example_counts.append(len(examples))
+                yield from self._timed_examples(examples)
+            return
+
+        # Cached sequences depend on the config, version, parser and
+        # cache entry format.
+        cache_dir = (
+            epath.Path(self.incremental_cache_dir)
+            / self.name
+            / builder_config.name
+            / str(self.version)
+            / CACHE_VERSION
+        )
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = BuildManifest(cache_dir)
+        generate = functools.partial(
+            generate_cached_sequence_examples, cache_dir=cache_dir, **format_kwargs
+        )
+        # NOTE: Names are recorded as files are submitted, since
+        # `sequence_paths` may be a single-pass iterator.
+        names = []
+        digests = []
+        results = self._imap(generate, _record_names(sequence_paths, names))
+        for digest, examples in results:
+            digests.append(digest)
+            example_counts.append(len(examples))
+            yield from self._timed_examples(examples)
+        counts = manifest.update(seqs_dir, dict(zip(names, digests)))
+        manifest.save()
+        logging.info(
+            "Incremental build of %s: %d new, %d changed, %d unchanged and "
+            "%d removed sequence files.",
+            seqs_dir,
+            counts["new"],
+            counts["changed"],
+            counts["unchanged"],
+            counts["removed"],
+        )
+
+    def _imap(self, func, sequence_paths):
+        """Lazily map a function over sequence files using the workers.
+
+        If build statistics are enabled, `func` must accept a `stats`
+        keyword argument. The statistics of every call are merged into
+        `build_stats`, and the time spent waiting for results is
+        recorded as the "generate" stage.
+
+        """
+        stats = self.build_stats
+        if not stats.enabled:
+            yield from parallel_imap(func, sequence_paths, num_workers=self.num_workers)
+            return
+        results = parallel_imap(
+            functools.partial(call_with_stats, func),
+            sequence_paths,
+            num_workers=self.num_workers,
+        )
+        while True:
+            with stats.stage("generate"):
+                item = next(results, None)
+            if item is None:
+                return
+            result, call_stats = item
+            stats.merge(call_stats)
+            yield result
+
+    def _timed_examples(self, examples):
+        """Yield examples, recording the time TFDS spends on each one.
+
+        While the generator is suspended, TFDS encodes, serializes and
+        writes the example, which is recorded as the "write" stage.
+
+        """
+        stats = self.build_stats
+        if not stats.enabled:
+            yield from examples
+            return
+        for example in examples:
+            time_start = time.perf_counter()
+            yield example
+            stats.add_seconds("write", time.perf_counter() - time_start)
+
+
+def _participant_ranges(anonymous_ids, folds, example_counts, num_folds):
+    """Return the example ranges of participants and folds.
+
+    Args:
+        anonymous_ids: A list of the participant of every sequence file,
+            in the order examples are written.
+        folds: A list of the fold of every sequence file.
+        example_counts: A list of the number of examples of every
+            sequence file.
+        num_folds: Integer indicating the number of folds.
+
+    Returns:
+        participant_index: A dictionary mapping anonymous IDs to
+            `[start, stop)` example ranges.
+        fold_ranges: A list of `[start, stop)` example ranges of every
+            fold.
+
+    """
+    participant_index = {}
+    fold_counts = [0] * num_folds
+    position = 0
+    for anonymous_id, fold, n_example in zip(anonymous_ids, folds, example_counts):
+        start = participant_index.get(anonymous_id, [position])[0]
+        participant_index[anonymous_id] = [start, position + n_example]
+        fold_counts[fold] += n_example
+        position += n_example
+
+    fold_ranges = []
+    start = 0
+    for n_example in fold_counts:
+        fold_ranges.append([start, start + n_example])
+        start += n_example
+    return participant_index, fold_ranges
+
+
+def _record_names(sequence_paths, names):
+    """Yield sequence files, appending their names to `names`."""
+    for sequence_path in sequence_paths:
+        names.append(sequence_path.name)
+        yield sequence_path
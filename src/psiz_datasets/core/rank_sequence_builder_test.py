@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test rank_sequence_builder."""
+
+import gzip
+import json
+import zipfile
+
+from etils import epath
+import numpy as np
+import pytest
+
+
+from psiz_datasets.core import StimulusTable
+from psiz_datasets.core.build_manifest import CACHE_VERSION
+from psiz_datasets.core.rank_sequence_builder import RankSequenceConfig
+from psiz_datasets.core.rank_sequence_builder import RankSequenceMetadata
+from psiz_datasets.core.rank_sequence_builder import rank_sequence_configs
+
+
+def test_rank_sequence_configs():
+    """Test the standard builder configs."""
+    configs = rank_sequence_configs(RankSequenceConfig, "Ranked judgments.")
+
+    assert [config.name for config in configs] == [
+        "with_timestep",
+        "without_timestep",
+        "with_timestep_sparse",
+        "without_timestep_sparse",
+        "with_timestep_ragged",
+        "with_timestep_ragged_sparse",
+        "with_timestep_unified",
+        "without_timestep_unified",
+    ]
+    assert [config.with_timestep_axis for config in configs] == [
+        True,
+        False,
+        True,
+        False,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert [config.sparse_outcome for config in configs] == [
+        False,
+        False,
+        True,
+        True,
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert [config.ragged_timestep for config in configs] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert [config.unified_trial for config in configs] == [False] * 6 + [True] * 2
+    assert configs[0].description.startswith("Ranked judgments. Dataset")
+
+
+def test_metadata_save_load(tmp_path, dummy_path):
+    """Test that stimulus metadata is saved as a separate table."""
+    data_dir = epath.Path(tmp_path)
+    table = StimulusTable.from_file(dummy_path / "stimuli.txt", ("common_name",))
+    metadata = RankSequenceMetadata()
+    metadata["stimuli"] = table
+    metadata["n_participant"] = 2
+    metadata.save_metadata(data_dir)
+
+    loaded = RankSequenceMetadata()
+    loaded.load_metadata(data_dir)
+
+    assert "stimuli" not in (data_dir / "metadata.json").read_text()
+    assert loaded["n_participant"] == 2
+    assert isinstance(loaded["stimuli"], StimulusTable)
+    np.testing.assert_array_equal(
+        loaded["stimuli"]["common_name"], table["common_name"]
+    )
+
+
+@pytest.mark.parametrize("config", ["with_timestep", "without_timestep_unified"])
+def test_build_stats(tmp_path, write_synthetic, prepare_synthetic, config):
+    """Test per-stage build statistics."""
+    _, counts = write_synthetic("birds16_rank2019", 4)
+    stats_path = tmp_path / "stats.json"
+
+    prepare_synthetic("birds16_rank2019", config, build_stats_path=stats_path)
+
+    summary = json.loads(stats_path.read_text())
+    assert summary["config"] == config
+    n_trial = counts["train"]["n_trial"]
+    assert summary["counts"]["files"] == 4
+    assert summary["counts"]["skipped:questionnaire:feedback"] == 4
+    assert (
+        summary["counts"]["trials:rank:8rank2"]
+        + summary["counts"]["trials:rank:2rank1"]
+        == n_trial
+    )
+    if config == "with_timestep":
+        assert summary["counts"]["examples"] == 4
+        assert summary["counts"]["placeholder_rows"] == 4 * 2 * 120 - n_trial
+    else:
+        assert summary["counts"]["examples"] == n_trial
+        assert summary["counts"]["placeholder_rows"] == 0
+    for stage in ("list_files", "read", "decode", "parse", "format", "write"):
+        assert summary["seconds"][stage] >= 0.0
+    assert summary["seconds"]["total"] >= summary["seconds"]["write"]
+
+
+@pytest.mark.parametrize(
+    "builder_kwargs",
+    [
+        {},
+        {"num_participant_shards": 2},
+        {"incremental_cache_dir": "cache", "num_workers": 2},
+    ],
+)
+def test_stream_archive(tmp_path, write_synthetic, prepare_synthetic, builder_kwargs):
+    """Test streaming sequence files from the downloaded archive."""
+    extracted_path, _ = write_synthetic("ilsvrc2012_val_hsj", 6, n_participant=3)
+    archive_path = tmp_path / "ilsvrc2012_val_hsj.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for path in sorted(extracted_path.rglob("*"), reverse=True):
+            archive.write(path, path.relative_to(extracted_path).as_posix())
+    if "incremental_cache_dir" in builder_kwargs:
+        builder_kwargs["incremental_cache_dir"] = tmp_path / "cache"
+
+    builders = {}
+    for stream_archive, path in ((False, extracted_path), (True, archive_path)):
+        builders[stream_archive] = prepare_synthetic(
+            "ilsvrc2012_val_hsj",
+            "with_timestep",
+            download_path=path,
+            data_dir=tmp_path / "data_{0}".format(stream_archive),
+            stream_archive=stream_archive,
+            **builder_kwargs
+        )
+
+    np.testing.assert_array_equal(
+        builders[True].info.metadata["stimuli"]["wordnet_id"],
+        builders[False].info.metadata["stimuli"]["wordnet_id"],
+    )
+    for split in ("train", "test"):
+        expected = list(builders[False].as_dataset(split=split).as_numpy_iterator())
+        examples = list(builders[True].as_dataset(split=split).as_numpy_iterator())
+        assert len(examples) == len(expected) > 0
+        for example, expected_example in zip(examples, expected):
+            assert example.keys() == expected_example.keys()
+            for key in example:
+                np.testing.assert_array_equal(example[key], expected_example[key])
+    if "incremental_cache_dir" in builder_kwargs:
+        version_dir = (
+            tmp_path
+            / "cache"
+            / "ilsvrc2012_val_hsj"
+            / "with_timestep"
+            / str(builders[True].version)
+        )
+        assert [path.name for path in version_dir.iterdir()] == [CACHE_VERSION]
+
+
+@pytest.mark.parametrize("stream_archive", [False, True])
+@pytest.mark.parametrize("suffix", [".jsonl.gz", ".jsonl.zst"])
+def test_packed_sequences(
+    tmp_path, write_synthetic, prepare_synthetic, stream_archive, suffix
+):
+    """Test packed JSON Lines input."""
+    extracted_path, _ = write_synthetic("ilsvrc2012_val_hsj", 5)
+    packed_path = tmp_path / "packed"
+    packed_path.mkdir()
+    (packed_path / "stimuli.txt").write_bytes(
+        (extracted_path / "stimuli.txt").read_bytes()
+    )
+    for seqs_dir in sorted(path for path in extracted_path.iterdir() if path.is_dir()):
+        (packed_path / seqs_dir.name).mkdir()
+        sequence_paths = sorted(seqs_dir.glob("seq_*.json"))
+        for idx_chunk in range(2):
+            lines = [
+                json.dumps(json.loads(sequence_path.read_bytes())).encode()
+                for sequence_path in sequence_paths[idx_chunk::2]
+            ]
+            content = b"\n".join(lines) + b"\n"
+            if suffix == ".jsonl.gz":
+                content = gzip.compress(content)
+            else:
+                zstandard = pytest.importorskip("zstandard")
+                content = zstandard.ZstdCompressor().compress(content)
+            chunk_path = (
+                packed_path
+                / seqs_dir.name
+                / "chunk_{0:03d}{1}".format(idx_chunk, suffix)
+            )
+            chunk_path.write_bytes(content)
+    if stream_archive:
+        archive_path = tmp_path / "packed.zip"
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for path in sorted(packed_path.rglob("*")):
+                archive.write(path, path.relative_to(packed_path).as_posix())
+        packed_path = archive_path
+
+    builders = {}
+    for packed, path in ((False, extracted_path), (True, packed_path)):
+        builders[packed] = prepare_synthetic(
+            "ilsvrc2012_val_hsj",
+            "without_timestep",
+            download_path=path,
+            data_dir=tmp_path / "data_{0}".format(packed),
+            stream_archive=packed and stream_archive,
+        )
+
+    for split in ("train", "test"):
+        expected = list(builders[False].as_dataset(split=split).as_numpy_iterator())
+        examples = list(builders[True].as_dataset(split=split).as_numpy_iterator())
+        assert len(examples) == len(expected) > 0
+        for example, expected_example in zip(examples, expected):
+            for key in example:
+                np.testing.assert_array_equal(example[key], expected_example[key])
+
+
+def test_parsed_cache(tmp_path, prepare_synthetic):
+    """Test parsed sequences are shared by configs."""
+    parsed_cache_dir = tmp_path / "parsed"
+
+    summaries = {}
+    for config in ("with_timestep", "without_timestep_unified"):
+        stats_path = tmp_path / "stats_{0}.json".format(config)
+        prepare_synthetic(
+            "birds16_rank2019",
+            config,
+            parsed_cache_dir=parsed_cache_dir,
+            build_stats_path=stats_path,
+        )
+        summaries[config] = json.loads(stats_path.read_text())
+
+    assert summaries["with_timestep"]["counts"]["parsed_cache_misses"] == 4
+    assert "parsed_cache_hits" not in summaries["with_timestep"]["counts"]
+    counts = summaries["without_timestep_unified"]["counts"]
+    assert counts["parsed_cache_hits"] == 4
+    assert "parsed_cache_misses" not in counts
+    assert "decode" not in summaries["without_timestep_unified"]["seconds"]
+    assert len(list((parsed_cache_dir / "birds16_rank2019").rglob("*.npz"))) == 4
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    RankSequenceSpec: Declarative specification of a rank-sequence
+        dataset.
+
+"""
+
+
+class RankSequenceSpec:
+    """Declarative specification of a rank-sequence dataset.
+
+    A spec describes everything that differs between rank-sequence
+    datasets, so that parsing, padding and example emission can be
+    shared by all datasets.
+
+    Attributes:
+        data_url: String indicating the URL of the raw data archive.
+        rank_configs: A tuple of `(n_reference, n_select)` tuples
+            indicating the rank trial configurations in the dataset.
+        max_timestep: Integer indicating the length that sequences are
+            padded to when preserving the timestep axis.
+        metadata_columns: A tuple of column names to read from the
+            stimulus metadata file.
+        splits: A dictionary mapping split names to the directory (in
+            the extracted archive) that holds the split's sequence
+            files.
+        other_kinds: A tuple of non-rank timestep kinds that may appear
+            in a sequence. These timesteps are skipped.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        data_url,
+        rank_configs,
+        max_timestep,
+        metadata_columns,
+        splits=None,
+        other_kinds=(),
+    ):
+        """Initialize.
+
+        Args:
+            data_url: See class attributes.
+            rank_configs: See class attributes.
+            max_timestep: See class attributes.
+            metadata_columns: See class attributes.
+            splits (optional): See class attributes. By default, the
+                dataset has a single "train" split stored in
+                "train_seqs".
+            other_kinds (optional): See class attributes.
+
+        """
+        if splits is None:
+            splits = {"train": "train_seqs"}
+        self.data_url = data_url
+        self.rank_configs = tuple(
+            (int(n_reference), int(n_select)) for n_reference, n_select in rank_configs
+        )
+        self.max_timestep = int(max_timestep)
+        self.metadata_columns = tuple(metadata_columns)
+        self.splits = dict(splits)
+        self.other_kinds = tuple(other_kinds)
+
+    @property
+    def rank_kinds(self):
+        """Timestep kinds of the rank trials, e.g., "rank:8rank2"."""
+        return tuple(
+            "rank:{0}rank{1}".format(n_reference, n_select)
+            for n_reference, n_select in self.rank_configs
+        )
+
+    @property
+    def timestep_kinds(self):
+        """All timestep kinds that may appear in a sequence."""
+        return self.rank_kinds + self.other_kinds
+
+    @property
+    def prefixes(self):
+        """Feature prefixes of the rank trials, e.g., "given8rank2"."""
+        return tuple(
+            "given{0}rank{1}".format(n_reference, n_select)
+            for n_reference, n_select in self.rank_configs
+        )
+
+    def validate_sequence(self, sequence):
+        """Validate the timestep kinds of a sequence.
+
+        Args:
+            sequence: A list of timestep dictionaries.
+
+        Raises:
+            NotImplementedError: If the sequence contains a timestep
+                kind that is not in `timestep_kinds`.
+
+        """
+        self.validate_kinds(timestep["kind"] for timestep in sequence)
+
+    def validate_kinds(self, kinds):
+        """Validate timestep kinds.
+
+        Args:
+            kinds: An iterable of timestep kind strings.
+
+        Raises:
+            NotImplementedError: If a kind is not in `timestep_kinds`.
+
+        """
+        timestep_kinds = self.timestep_kinds
+        for kind in kinds:
+            if kind not in timestep_kinds:
+                raise NotImplementedError(
+                    "Unrecognized timestep['kind']={}".format(kind)
+                )
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test rank_sequence."""
+
+import json
+
+import numpy as np
+import pytest
+
+from psiz_datasets.core import RankSequenceSpec
+from psiz_datasets.core import format_sequence
+from psiz_datasets.core import generate_sequence_examples
+from psiz_datasets.core import participant_fold
+from psiz_datasets.core import participant_sort_key
+from psiz_datasets.core import read_anonymous_id
+
+
+def test_spec(spec):
+    """Test derived spec properties."""
+    assert spec.rank_kinds == ("rank:8rank2", "rank:2rank1")
+    assert spec.timestep_kinds == (
+        "rank:8rank2",
+        "rank:2rank1",
+        "questionnaire:feedback",
+    )
+    assert spec.prefixes == ("given8rank2", "given2rank1")
+    assert spec.splits == {"train": "train_seqs"}
+
+
+@pytest.mark.parametrize("with_timestep_axis", [True, False])
+def test_generate_sequence_examples(spec, with_timestep_axis, dummy_path):
+    """Test examples of a sequence file."""
+    sequence_path = dummy_path / "train_seqs" / "seq_a.json"
+    n_trial = len(json.loads(sequence_path.read_text())["data"][0]["sequence"])
+
+    examples = generate_sequence_examples(
+        sequence_path, spec, with_timestep_axis=with_timestep_axis
+    )
+
+    if with_timestep_axis:
+        assert len(examples) == 1
+        example = examples[0][1]
+        assert example["given8rank2_stimulus_set"].shape == (120, 9)
+        assert example["given2rank1_outcome"].shape == (120, 2)
+        np.testing.assert_array_equal(example["given8rank2_sample_weight"][n_trial:], 0)
+    else:
+        assert len(examples) == n_trial
+        assert examples[1][0].endswith("/1")
+        assert examples[1][1]["given8rank2_stimulus_set"].shape == (9,)
+
+
+def test_format_sequence_single_config(spec, dummy_path):
+    """Test that only configurations in the spec are formatted."""
+    spec = RankSequenceSpec(
+        data_url="",
+        rank_configs=((8, 2),),
+        max_timestep=30,
+        metadata_columns=(),
+    )
+    sequence_path = dummy_path / "train_seqs" / "seq_a.json"
+    data = json.loads(sequence_path.read_text())["data"][0]
+    sequence = [t for t in data["sequence"] if t["kind"] == "rank:8rank2"]
+
+    formatted = format_sequence(
+        spec, {"anonymous_id": "abc"}, 50, sequence, sparse_outcome=True
+    )
+
+    assert set(formatted.keys()) == {
+        "anonymous_id",
+        "given8rank2_stimulus_set",
+        "given8rank2_outcome",
+        "given8rank2_response_time_ms",
+        "given8rank2_sample_weight",
+    }
+    np.testing.assert_array_equal(formatted["given8rank2_sample_weight"], 0.5)
+
+
+def test_format_sequence_unrecognized_kind(spec):
+    """Test timestep kind that is not in the spec."""
+    with pytest.raises(NotImplementedError):
+        format_sequence(spec, {"anonymous_id": "abc"}, 100, [{"kind": "rank:4rank1"}])
+
+
+def test_participant_order(dummy_path):
+    """Test stable participant ordering of sequence files."""
+    sequence_paths = sorted((dummy_path / "train_seqs").glob("seq_*.json"))
+    anonymous_ids = [read_anonymous_id(path) for path in sequence_paths]
+
+    assert anonymous_ids == [
+        "175fa273-d044-4d1e-82de-afb06e080239",
+        "692a2e02-22e7-48ab-a9bf-1a5f89ca1cc4",
+    ]
+    sort_key = participant_sort_key(anonymous_ids[0])
+    assert sort_key == participant_sort_key(anonymous_ids[0])
+    assert sort_key != participant_sort_key(anonymous_ids[1])
+
+
+def test_participant_fold():
+    """Test folds are assigned by hashing the participant."""
+    anonymous_ids = ["participant_{0}".format(idx) for idx in range(100)]
+
+    folds = [participant_fold(anonymous_id, 5) for anonymous_id in anonymous_ids]
+
+    assert set(folds) == {0, 1, 2, 3, 4}
+    assert folds[0] == int(participant_sort_key(anonymous_ids[0]), 16) % 5
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    ArchiveMember: A file read from an archive.
+
+Functions:
+    archive_sequence_members: Yield the sequence files of a split
+        directory in an archive.
+    read_archive_member: Read a single file of an archive.
+
+NOTE: This module does not depend on TensorFlow so that archive
+members can be sent to worker processes.
+
+"""
+
+import dataclasses
+import fnmatch
+import posixpath
+
+from psiz_datasets.core.build_stats import BuildStats
+from psiz_datasets.core.packed_sequences import is_packed_file
+from psiz_datasets.core.packed_sequences import read_packed_sequences
+
+_SEQUENCE_PATTERN = "seq_*.json"
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class ArchiveMember:
+    """A file read from an archive.
+
+    Implements the subset of the `pathlib.Path` interface that is used
+    to read sequence files (`name` and `read_bytes`), so that members
+    can be used in place of the paths of extracted files. Members are
+    ordered by their path within the archive.
+
+    Attributes:
+        path: String indicating the path of the file within the
+            archive.
+        content: The raw bytes of the file.
+
+    """
+
+    path: str
+    content: bytes = dataclasses.field(repr=False, compare=False)
+
+    @property
+    def name(self):
+        """Return the final component of the path."""
+        return posixpath.basename(self.path)
+
+    def read_bytes(self):
+        """Return the raw bytes of the file."""
+        return self.content
+
+
+def archive_sequence_members(archive, seqs_dir, stats=None):
+    """Yield the sequence files of a split directory in an archive.
+
+    Files are read as they are encountered, i.e., in archive order,
+    which keeps reading sequential and only one file in memory at a
+    time. Only the files that `glob("seq_*.json")` would match in the
+    extracted directory are yielded, along with the records of packed
+    sequence files (see `read_packed_sequences`).
+
+    Args:
+        archive: An iterator of (path, file object) tuples, as returned
+            by `tfds.download.DownloadManager.iter_archive`.
+        seqs_dir: String indicating the directory of the split within
+            the archive.
+        stats (optional): A `BuildStats` object. Time spent reading
+            files is recorded as the "read" stage.
+
+    Yields:
+        `ArchiveMember` and `SequenceRecord` objects.
+
+    """
+    stats = stats or BuildStats.disabled()
+    for path, fobj in archive:
+        if posixpath.dirname(path) != seqs_dir:
+            continue
+        name = posixpath.basename(path)
+        if is_packed_file(name):
+            yield from read_packed_sequences(fobj, name, stats=stats)
+            continue
+        if not fnmatch.fnmatchcase(name, _SEQUENCE_PATTERN):
+            continue
+        with stats.stage("read"):
+            content = fobj.read()
+        yield ArchiveMember(path, content)
+
+
+def read_archive_member(archive, path):
+    """Read a single file of an archive.
+
+    Args:
+        archive: An iterator of (path, file object) tuples, as returned
+            by `tfds.download.DownloadManager.iter_archive`.
+        path: String indicating the path of the file within the
+            archive.
+
+    Returns:
+        The raw bytes of the file.
+
+    Raises:
+        FileNotFoundError: If the archive does not contain the file.
+
+    """
+    for member_path, fobj in archive:
+        if member_path == path:
+            return fobj.read()
+    raise FileNotFoundError("Archive does not contain '{0}'.".format(path))
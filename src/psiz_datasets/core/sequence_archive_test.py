@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test sequence_archive."""
+
+import io
+import pickle
+
+import pytest
+
+from psiz_datasets.core import ArchiveMember
+from psiz_datasets.core import archive_sequence_members
+from psiz_datasets.core import read_archive_member
+
+
+def _archive():
+    """Return iterator of (path, file object) archive members."""
+    members = [
+        ("train_seqs/seq_b.json", b"b"),
+        ("stimuli.txt", b"local_id|filepath"),
+        ("test_seqs/seq_c.json", b"c"),
+        ("train_seqs/notes.txt", b"notes"),
+        ("train_seqs/nested/seq_d.json", b"d"),
+        ("train_seqs/seq_a.json", b"a"),
+    ]
+    for path, content in members:
+        yield path, io.BytesIO(content)
+
+
+def test_archive_sequence_members():
+    """Test selecting the sequence files of a split."""
+    members = list(archive_sequence_members(_archive(), "train_seqs"))
+
+    assert [member.path for member in members] == [
+        "train_seqs/seq_b.json",
+        "train_seqs/seq_a.json",
+    ]
+    assert [member.name for member in members] == ["seq_b.json", "seq_a.json"]
+    assert [member.read_bytes() for member in members] == [b"b", b"a"]
+    # Members are ordered by path and can be sent to worker processes.
+    assert [member.name for member in sorted(members)] == [
+        "seq_a.json",
+        "seq_b.json",
+    ]
+    assert pickle.loads(pickle.dumps(members[0])) == members[0]
+
+
+def test_read_archive_member():
+    """Test reading a single file."""
+    assert read_archive_member(_archive(), "stimuli.txt") == b"local_id|filepath"
+    with pytest.raises(FileNotFoundError):
+        read_archive_member(_archive(), "missing.txt")
+
+
+def test_archive_member_equality():
+    """Test members are identified by path."""
+    assert ArchiveMember("seq_a.json", b"a") == ArchiveMember("seq_a.json", b"b")
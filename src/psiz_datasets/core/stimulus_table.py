@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of core classes.
+
+Classes:
+    StimulusTable: Columnar stimulus metadata indexed by stimulus ID.
+
+"""
+
+import csv
+import json
+import os
+
+from etils import epath
+import numpy as np
+
+_INDEX_FILENAME = "columns.json"
+
+
+class StimulusTable:
+    """Columnar stimulus metadata indexed by stimulus ID.
+
+    Every column is dictionary-encoded: an int32 `codes` array with
+    one entry per stimulus ID (i.e., dense and indexed by ID) and a
+    `categories` array of unique values. Category 0 is reserved for
+    the empty string, which is the value of the placeholder stimulus
+    (ID 0) and of any ID without metadata. Looking up values is
+    therefore a vectorized gather, `categories[codes[stimulus_ids]]`.
+
+    Tables saved with `save` are loaded lazily by `load`: nothing is
+    read until a column is accessed, and local arrays are
+    memory-mapped.
+
+    """
+
+    def __init__(self, columns=None, path=None):
+        """Initialize.
+
+        Args:
+            columns (optional): A dictionary mapping column names to a
+                `(codes, categories)` tuple.
+            path (optional): Path of a saved table. Used instead of
+                `columns` to lazily load a table.
+
+        """
+        self._columns = columns
+        self._path = None if path is None else epath.Path(path)
+        self._column_names = None
+        if columns is not None:
+            self._column_names = tuple(columns)
+
+    @classmethod
+    def from_file(cls, path, columns):
+        """Read a pipe-separated stimulus metadata file.
+
+        Args:
+            path: Path of metadata file with a base-36 "local_id"
+                column.
+            columns: A tuple of column names to read.
+
+        Returns:
+            A `StimulusTable`.
+
+        """
+        with epath.Path(path).open() as f:
+            return cls.from_buffer(f, columns)
+
+    @classmethod
+    def from_buffer(cls, f, columns):
+        """Read pipe-separated stimulus metadata from a text file object.
+
+        Args:
+            f: A text file object (see `from_file`).
+            columns: A tuple of column names to read.
+
+        Returns:
+            A `StimulusTable`.
+
+        """
+        base = 36
+        stimulus_ids = []
+        values = {column: [] for column in columns}
+        reader = csv.DictReader(f, delimiter="|")
+        for row in reader:
+            stimulus_ids.append(int(row["local_id"], base))
+            for column in columns:
+                values[column].append(row[column])
+
+        stimulus_ids = np.array(stimulus_ids, dtype=np.int64)
+        n_stimuli = int(np.max(stimulus_ids, initial=0)) + 1
+        encoded = {}
+        for column in columns:
+            categories, inverse = np.unique(
+                np.array(values[column], dtype=np.str_), return_inverse=True
+            )
+            if categories.size == 0 or categories[0] != "":
+                categories = np.concatenate([np.array([""]), categories])
+                inverse = inverse + 1
+            codes = np.zeros([n_stimuli], dtype=np.int32)
+            codes[stimulus_ids] = inverse
+            encoded[column] = (codes, categories)
+        return cls(columns=encoded)
+
+    @classmethod
+    def load(cls, path):
+        """Lazily load a table saved with `save`."""
+        return cls(path=path)
+
+    def save(self, path):
+        """Save table as a directory of `.npy` files.
+
+        Args:
+            path: Path of directory.
+
+        """
+        path = epath.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for column in self.column_names:
+            codes, categories = self._column(column)
+            for suffix, array in (
+                (".codes.npy", codes),
+                (".categories.npy", categories),
+            ):
+                with (path / (column + suffix)).open("wb") as f:
+                    np.save(f, np.asarray(array), allow_pickle=False)
+        (path / _INDEX_FILENAME).write_text(
+            json.dumps({"columns": list(self.column_names)})
+        )
+
+    @property
+    def column_names(self):
+        """The names of the columns."""
+        if self._column_names is None:
+            index = json.loads((self._path / _INDEX_FILENAME).read_text())
+            self._column_names = tuple(index["columns"])
+        return self._column_names
+
+    def __len__(self):
+        """The number of stimulus IDs, including the placeholder ID 0."""
+        codes, _ = self._column(self.column_names[0])
+        return len(codes)
+
+    def __contains__(self, column):
+        return column in self.column_names
+
+    def __getitem__(self, column):
+        """Return the dense values of a column (indexed by stimulus ID)."""
+        codes, categories = self._column(column)
+        return categories[codes]
+
+    def codes(self, column):
+        """Return the int32 category codes of a column."""
+        return self._column(column)[0]
+
+    def categories(self, column):
+        """Return the categories of a column."""
+        return self._column(column)[1]
+
+    def lookup(self, column, stimulus_ids):
+        """Return the values of a column for an array of stimulus IDs.
+
+        Args:
+            column: String indicating the column name.
+            stimulus_ids: Array-like of integer stimulus IDs with any
+                shape, e.g., a `stimulus_set` array.
+
+        Returns:
+            An np.NDArray of strings with the same shape as
+            `stimulus_ids`.
+
+        """
+        codes, categories = self._column(column)
+        return categories[codes[np.asarray(stimulus_ids)]]
+
+    def row(self, stimulus_id):
+        """Return all metadata of a single stimulus as a dictionary."""
+        return {
+            column: str(self.lookup(column, stimulus_id))
+            for column in self.column_names
+        }
+
+    def _column(self, column):
+        """Return the `(codes, categories)` of a column."""
+        if self._columns is None:
+            self._columns = {}
+        if column not in self._columns:
+            if self._path is None or column not in self.column_names:
+                raise KeyError(column)
+            self._columns[column] = (
+                _load_array(self._path / (column + ".codes.npy")),
+                _load_array(self._path / (column + ".categories.npy")),
+            )
+        return self._columns[column]
+
+
+def _load_array(path):
+    """Load an array, using a memory map for local files."""
+    uri = os.fspath(path)
+    if "://" not in uri:
+        return np.load(uri, mmap_mode="r", allow_pickle=False)
+    with path.open("rb") as f:
+        return np.load(f, allow_pickle=False)
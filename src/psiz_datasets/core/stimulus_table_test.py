@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test stimulus_table."""
+
+from etils import epath
+import numpy as np
+import pytest
+
+from psiz_datasets.core import StimulusTable
+
+_COLUMNS = ("filepath", "common_name", "taxonomic_family")
+
+
+@pytest.fixture
+def table(dummy_path):
+    """Table of dummy birds16 stimuli."""
+    return StimulusTable.from_file(dummy_path / "stimuli.txt", _COLUMNS)
+
+
+def test_from_file(table, dummy_path):
+    """Test agreement with the raw metadata file."""
+    lines = (dummy_path / "stimuli.txt").read_text().splitlines()
+    header = lines[0].split("|")
+    rows = [dict(zip(header, line.split("|"))) for line in lines[1:]]
+
+    assert table.column_names == _COLUMNS
+    assert len(table) == max(int(row["local_id"], 36) for row in rows) + 1
+    for row in rows:
+        stimulus_id = int(row["local_id"], 36)
+        assert table.row(stimulus_id) == {column: row[column] for column in _COLUMNS}
+    assert table.codes("common_name").dtype == np.int32
+
+
+def test_lookup(table):
+    """Test vectorized lookup, including the placeholder ID 0."""
+    stimulus_set = np.array([[1, 2, 0], [0, 0, 0]])
+
+    common_name = table.lookup("common_name", stimulus_set)
+
+    assert common_name.shape == (2, 3)
+    assert common_name[0, 0] == "Blue Grosbeak"
+    assert common_name[0, 2] == ""
+    np.testing.assert_array_equal(common_name[1], "")
+    np.testing.assert_array_equal(table["common_name"][[1, 2]], common_name[0, 0:2])
+
+
+def test_save_load(table, tmp_path):
+    """Test lazily loading a saved table."""
+    path = epath.Path(tmp_path) / "stimuli"
+    table.save(path)
+
+    loaded = StimulusTable.load(path)
+
+    assert loaded.column_names == _COLUMNS
+    assert "common_name" in loaded
+    assert isinstance(loaded.codes("filepath"), np.memmap)
+    for column in _COLUMNS:
+        np.testing.assert_array_equal(loaded[column], table[column])
+    with pytest.raises(KeyError):
+        loaded.codes("wordnet_id")
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of export functions.
+
+Functions:
+    export_rank_trials: Export rank trials as columnar tables.
+    load_rank_trials: Load an exported table of rank trials.
+
+NOTE: This module requires `pyarrow` (see the "arrow" extra), but does
+not depend on TensorFlow.
+
+"""
+
+import functools
+import os
+
+from etils import epath
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from psiz_datasets.core.packed_sequences import directory_sequence_files
+from psiz_datasets.core.rank_sequence import read_anonymous_id
+from psiz_datasets.utils import json_decoder
+from psiz_datasets.utils import parallel_imap
+from psiz_datasets.utils import parse_rank_sequence
+from psiz_datasets.utils import rank_n_outcome
+
+_FILE_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def export_rank_trials(
+    extracted_path,
+    spec,
+    output_dir,
+    file_format="parquet",
+    row_group_size=65536,
+    num_workers=None,
+):
+    """Export rank trials as columnar tables.
+
+    One table is written per split and rank configuration, e.g.,
+    "{output_dir}/train/given8rank2.parquet". Each table has one row
+    per (non-placeholder) trial with the columns:
+        `anonymous_id`: String identifying the participant.
+        `sequence_id`: String identifying the sequence.
+        `timestep`: Int32 position of the trial among the rank trials
+            of its sequence. Rows of a `without_timestep` config are
+            keyed "{sequence_id}/{timestep}" and a `with_timestep`
+            sequence is recovered by grouping on `sequence_id` and
+            ordering by `timestep`.
+        `stimulus_set`: Fixed-size list of int32 stimulus indices with
+            `n_reference + 1` items (query first).
+        `outcome`: Int32 sparse outcome index.
+        `response_time_ms`: Float32 response time.
+        `sample_weight`: Float32 sample weight.
+
+    Rows are ordered by `anonymous_id` (then by sequence file name and
+    timestep), so Parquet row group statistics allow predicate
+    pushdown on participants. Since every table holds a single trial
+    kind, filtering on trial kind amounts to selecting a table.
+
+    Args:
+        extracted_path: Path of the extracted raw data archive (i.e.,
+            the directory holding the split directories). Splits may
+            hold "seq_*.json" files as well as packed JSON Lines files
+            (see `psiz_datasets.core.packed_sequences`).
+        spec: A `RankSequenceSpec` object, e.g.,
+            `Birds16Rank2019.SPEC`.
+        output_dir: Path of output directory.
+        file_format (optional): Either "parquet" or "arrow". Arrow IPC
+            files are uncompressed and can be memory-mapped without
+            copying (see `load_rank_trials`).
+        row_group_size (optional): Integer indicating the (approximate)
+            number of rows per row group (or record batch).
+        num_workers (optional): Integer indicating the number of
+            worker processes used to parse sequence files.
+
+    Returns:
+        A dictionary mapping split names to a dictionary of table
+        paths keyed by rank configuration prefix.
+
+    Raises:
+        ValueError: If `file_format` is not recognized.
+
+    """
+    if file_format not in _FILE_SUFFIXES:
+        raise ValueError(
+            "Unrecognized `file_format`='{0}'. Expected one of {1}.".format(
+                file_format, sorted(_FILE_SUFFIXES)
+            )
+        )
+    extracted_path = epath.Path(extracted_path)
+    output_dir = epath.Path(output_dir)
+
+    table_paths = {}
+    for split, seqs_dir in spec.splits.items():
+        split_dir = output_dir / split
+        split_dir.mkdir(parents=True, exist_ok=True)
+        table_paths[split] = {
+            prefix: split_dir / (prefix + _FILE_SUFFIXES[file_format])
+            for prefix in spec.prefixes
+        }
+        _export_split(
+            extracted_path / seqs_dir,
+            spec,
+            table_paths[split],
+            file_format,
+            row_group_size,
+            num_workers,
+        )
+    return table_paths
+
+
+def load_rank_trials(path, columns=None, filters=None):
+    """Load an exported table of rank trials.
+
+    Arrow IPC files are memory-mapped, so unfiltered columns are
+    loaded without copying (e.g., `to_numpy(zero_copy_only=True)`
+    works on the flattened columns). Parquet files use row group
+    statistics to skip row groups that do not satisfy `filters`.
+
+    Args:
+        path: Path of a table written by `export_rank_trials`.
+        columns (optional): A list of column names to load.
+        filters (optional): Row filters in the format accepted by
+            `pyarrow.parquet.read_table`, e.g.,
+            `[("anonymous_id", "in", ["abc", "def"])]`.
+
+    Returns:
+        A `pyarrow.Table`.
+
+    """
+    path = os.fspath(path)
+    if path.endswith(_FILE_SUFFIXES["parquet"]):
+        return pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+
+    # NOTE: The buffers of the table reference the memory map, which
+    # stays open for the lifetime of the table.
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if filters is not None:
+        table = table.filter(pq.filters_to_expression(filters))
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def _export_split(
+    seqs_path, spec, table_paths, file_format, row_group_size, num_workers
+):
+    """Export the rank trials of a single split."""
+    # NOTE: The raw content of packed records is held in memory.
+    sequence_paths = list(directory_sequence_files(seqs_path))
+    # Order sequences by participant, so that tables are sorted by
+    # `anonymous_id`. Ties are broken by name, which is unique within a
+    # split.
+    anonymous_ids = list(
+        parallel_imap(read_anonymous_id, sequence_paths, num_workers=num_workers)
+    )
+    order = sorted(
+        range(len(sequence_paths)),
+        key=lambda idx: (anonymous_ids[idx], sequence_paths[idx].name),
+    )
+    sequence_paths = [sequence_paths[idx] for idx in order]
+
+    writers = {}
+    buffers = {}
+    for (n_reference, n_select), prefix in zip(spec.rank_configs, spec.prefixes):
+        schema = _table_schema(n_reference, n_select)
+        writers[prefix] = _open_writer(table_paths[prefix], schema, file_format)
+        buffers[prefix] = _TableBuffer(schema)
+
+    extract = functools.partial(_sequence_trials, spec=spec)
+    try:
+        for sequence_trials in parallel_imap(
+            extract, sequence_paths, num_workers=num_workers
+        ):
+            for prefix, columns in sequence_trials.items():
+                buffers[prefix].append(columns)
+                if buffers[prefix].n_row >= row_group_size:
+                    _write_table(writers[prefix], buffers[prefix].pop(), row_group_size)
+        for prefix, buffer in buffers.items():
+            if buffer.n_row > 0:
+                _write_table(writers[prefix], buffer.pop(), row_group_size)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+def _sequence_trials(sequence_path, spec):
+    """Return the columns of each rank configuration of a sequence file."""
+    data = json_decoder()(sequence_path.read_bytes())
+    data = data["data"][0]
+    sequence = data["sequence"]
+    spec.validate_sequence(sequence)
+    trials = parse_rank_sequence(sequence)
+
+    timestep = np.arange(len(trials["kind"]), dtype=np.int32)
+    sequence_trials = {}
+    for kind, prefix, (n_reference, _) in zip(
+        spec.rank_kinds, spec.prefixes, spec.rank_configs
+    ):
+        is_kind = np.equal(trials["kind"], kind)
+        n_row = int(np.sum(is_kind))
+        stimulus_set = np.zeros([n_row, n_reference + 1], dtype=np.int32)
+        if n_row > 0:
+            stimulus_set[:] = trials["stimulus_set"][is_kind, 0 : (n_reference + 1)]
+        sequence_trials[prefix] = {
+            "anonymous_id": [data["anonymous_id"]] * n_row,
+            "sequence_id": [str(data["sequence_id"])] * n_row,
+            "timestep": timestep[is_kind],
+            "stimulus_set": stimulus_set,
+            "outcome": trials["outcome_idx"][is_kind],
+            "response_time_ms": trials["response_time_ms"][is_kind],
+            "sample_weight": np.full([n_row], data["grade"] / 100, dtype=np.float32),
+        }
+    return sequence_trials
+
+
+def _table_schema(n_reference, n_select):
+    """Return the table schema of a rank configuration."""
+    metadata = {
+        "kind": "rank:{0}rank{1}".format(n_reference, n_select),
+        "n_reference": str(n_reference),
+        "n_select": str(n_select),
+        "n_outcome": str(rank_n_outcome(n_reference, n_select)),
+    }
+    return pa.schema(
+        [
+            ("anonymous_id", pa.string()),
+            ("sequence_id", pa.string()),
+            ("timestep", pa.int32()),
+            ("stimulus_set", pa.list_(pa.int32(), n_reference + 1)),
+            ("outcome", pa.int32()),
+            ("response_time_ms", pa.float32()),
+            ("sample_weight", pa.float32()),
+        ],
+        metadata=metadata,
+    )
+
+
+def _open_writer(path, schema, file_format):
+    """Return a table writer."""
+    path = os.fspath(path)
+    if file_format == "parquet":
+        return pq.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
+
+
+def _write_table(writer, table, row_group_size):
+    """Write a table with a writer returned by `_open_writer`."""
+    if isinstance(writer, pq.ParquetWriter):
+        writer.write_table(table, row_group_size=row_group_size)
+    else:
+        writer.write_table(table, max_chunksize=row_group_size)
+
+
+class _TableBuffer:
+    """Buffer of table columns."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.n_row = 0
+        self._columns = {name: [] for name in schema.names}
+
+    def append(self, columns):
+        """Append the columns of a sequence."""
+        for name, value in columns.items():
+            self._columns[name].append(value)
+        self.n_row += len(columns["timestep"])
+
+    def pop(self):
+        """Return buffered rows as a table and clear the buffer."""
+        arrays = []
+        for field in self.schema:
+            values = self._columns[field.name]
+            if field.name in ("anonymous_id", "sequence_id"):
+                array = pa.array(
+                    [item for value in values for item in value], type=field.type
+                )
+            elif field.name == "stimulus_set":
+                stimulus_set = np.concatenate(values, axis=0)
+                array = pa.FixedSizeListArray.from_arrays(
+                    pa.array(stimulus_set.reshape([-1])), field.type.list_size
+                )
+            else:
+                array = pa.array(np.concatenate(values), type=field.type)
+            arrays.append(array)
+        self.n_row = 0
+        self._columns = {name: [] for name in self.schema.names}
+        return pa.Table.from_arrays(arrays, schema=self.schema)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test rank_trials."""
+
+import gzip
+import json
+
+from etils import epath
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from psiz_datasets.birds16_rank2019 import Birds16Rank2019  # noqa: E402
+from psiz_datasets.core import generate_sequence_examples  # noqa: E402
+from psiz_datasets.export import export_rank_trials  # noqa: E402
+from psiz_datasets.export import load_rank_trials  # noqa: E402
+
+_DUMMY_PATH = epath.Path(__file__).parent.parent / "birds16_rank2019" / "dummy_data"
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_export(tmp_path, file_format):
+    """Test agreement with `without_timestep_sparse` examples."""
+    spec = Birds16Rank2019.SPEC
+    table_paths = export_rank_trials(
+        _DUMMY_PATH, spec, tmp_path, file_format=file_format
+    )
+
+    expected = {}
+    for sequence_path in (_DUMMY_PATH / "train_seqs").glob("seq_*.json"):
+        for key, example in generate_sequence_examples(
+            sequence_path, spec, with_timestep_axis=False, sparse_outcome=True
+        ):
+            expected[key] = example
+
+    n_row = 0
+    for prefix, path in table_paths["train"].items():
+        assert path.name == prefix + "." + file_format
+        table = load_rank_trials(path)
+        n_row += table.num_rows
+        anonymous_id = table.column("anonymous_id").to_pylist()
+        assert anonymous_id == sorted(anonymous_id)
+        for row in table.to_pylist():
+            example = expected["{0}/{1}".format(row["sequence_id"], row["timestep"])]
+            assert example[prefix + "_sample_weight"] == row["sample_weight"]
+            assert example["anonymous_id"] == row["anonymous_id"]
+            np.testing.assert_array_equal(
+                example[prefix + "_stimulus_set"], row["stimulus_set"]
+            )
+            assert example[prefix + "_outcome"] == row["outcome"]
+            assert example[prefix + "_response_time_ms"] == pytest.approx(
+                row["response_time_ms"]
+            )
+    assert n_row == len(expected)
+
+
+def test_packed_sequences(tmp_path):
+    """Test agreement of packed and individual sequence files."""
+    packed_path = tmp_path / "packed"
+    (packed_path / "train_seqs").mkdir(parents=True)
+    lines = [
+        json.dumps(json.loads(sequence_path.read_bytes())).encode()
+        for sequence_path in sorted((_DUMMY_PATH / "train_seqs").glob("seq_*.json"))
+    ]
+    (packed_path / "train_seqs" / "chunk_000.jsonl.gz").write_bytes(
+        gzip.compress(b"\n".join(reversed(lines)) + b"\n")
+    )
+
+    table_paths = {}
+    for name, path in (("files", _DUMMY_PATH), ("packed", packed_path)):
+        table_paths[name] = export_rank_trials(
+            path, Birds16Rank2019.SPEC, tmp_path / name
+        )
+
+    n_row = 0
+    for prefix, path in table_paths["files"]["train"].items():
+        expected = load_rank_trials(path)
+        table = load_rank_trials(table_paths["packed"]["train"][prefix])
+        n_row += table.num_rows
+        assert table.num_rows == expected.num_rows
+        assert table.column("anonymous_id").equals(expected.column("anonymous_id"))
+        assert sorted(table.column("sequence_id").to_pylist()) == sorted(
+            expected.column("sequence_id").to_pylist()
+        )
+    assert n_row > 0
+
+
+def test_participant_pushdown(tmp_path):
+    """Test that row groups are clustered by participant."""
+    anonymous_id = "175fa273-d044-4d1e-82de-afb06e080239"
+    table_paths = export_rank_trials(
+        _DUMMY_PATH, Birds16Rank2019.SPEC, tmp_path, row_group_size=8
+    )
+    path = table_paths["train"]["given8rank2"]
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups > 1
+    for idx in range(metadata.num_row_groups):
+        statistics = metadata.row_group(idx).column(0).statistics
+        assert statistics.has_min_max
+        assert statistics.min == statistics.max
+
+    table = load_rank_trials(
+        path,
+        columns=["anonymous_id", "outcome"],
+        filters=[("anonymous_id", "=", anonymous_id)],
+    )
+    assert table.num_rows > 0
+    assert set(table.column("anonymous_id").to_pylist()) == {anonymous_id}
+
+
+def test_arrow_zero_copy(tmp_path):
+    """Test zero-copy access to memory-mapped Arrow tables."""
+    table_paths = export_rank_trials(
+        _DUMMY_PATH, Birds16Rank2019.SPEC, tmp_path, file_format="arrow"
+    )
+    table = load_rank_trials(table_paths["train"]["given8rank2"])
+
+    stimulus_set = table.column("stimulus_set").chunk(0).flatten()
+    stimulus_set = stimulus_set.to_numpy(zero_copy_only=True).reshape([-1, 9])
+    assert stimulus_set.shape[0] == table.num_rows
+    assert table.schema.metadata[b"kind"] == b"rank:8rank2"
+
+
+def test_invalid_file_format(tmp_path):
+    """Test unrecognized file format."""
+    with pytest.raises(ValueError):
+        export_rank_trials(
+            _DUMMY_PATH, Birds16Rank2019.SPEC, tmp_path, file_format="csv"
+        )
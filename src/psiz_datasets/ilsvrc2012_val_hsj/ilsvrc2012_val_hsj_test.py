@@ -41,5 +41,71 @@ class Ilsvrc2012ValHsjWithoutTimestepTest(tfds.testing.DatasetBuilderTestCase):
     }
 
 
+class Ilsvrc2012ValHsjWithTimestepSparseTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for ilsvrc2012_val_hsj dataset."""
+
+    DATASET_CLASS = ilsvrc2012_val_hsj.Ilsvrc2012ValHsj
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_sparse"]
+    SPLITS = {
+        "train": 2,
+        "test": 1,
+    }
+
+
+class Ilsvrc2012ValHsjWithoutTimestepSparseTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for ilsvrc2012_val_hsj dataset."""
+
+    DATASET_CLASS = ilsvrc2012_val_hsj.Ilsvrc2012ValHsj
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep_sparse"]
+    SPLITS = {
+        "train": 80,
+        "test": 50,
+    }
+
+
+class Ilsvrc2012ValHsjWithTimestepRaggedTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for ilsvrc2012_val_hsj dataset."""
+
+    DATASET_CLASS = ilsvrc2012_val_hsj.Ilsvrc2012ValHsj
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_ragged"]
+    SPLITS = {
+        "train": 2,
+        "test": 1,
+    }
+
+
+class Ilsvrc2012ValHsjWithTimestepRaggedSparseTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for ilsvrc2012_val_hsj dataset."""
+
+    DATASET_CLASS = ilsvrc2012_val_hsj.Ilsvrc2012ValHsj
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_ragged_sparse"]
+    SPLITS = {
+        "train": 2,
+        "test": 1,
+    }
+
+
+class Ilsvrc2012ValHsjWithTimestepUnifiedTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for ilsvrc2012_val_hsj dataset."""
+
+    DATASET_CLASS = ilsvrc2012_val_hsj.Ilsvrc2012ValHsj
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_unified"]
+    SPLITS = {
+        "train": 2,
+        "test": 1,
+    }
+
+
+class Ilsvrc2012ValHsjWithoutTimestepUnifiedTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for ilsvrc2012_val_hsj dataset."""
+
+    DATASET_CLASS = ilsvrc2012_val_hsj.Ilsvrc2012ValHsj
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep_unified"]
+    SPLITS = {
+        "train": 80,
+        "test": 50,
+    }
+
+
 if __name__ == "__main__":
     tfds.testing.test_main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test import time of lightweight modules."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import psiz_datasets
+
+# Generous upper bound on the import time (in seconds) of lightweight
+# modules. Importing TensorFlow typically takes several seconds.
+_MAX_IMPORT_SECONDS = 2.0
+_HEAVY_MODULES = ("psiz", "tensorflow", "tensorflow_datasets")
+
+_BENCHMARK = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy_modules": [name for name in {heavy_modules!r} if name in sys.modules],
+}}))
+"""
+
+
+def _run_python(code):
+    """Run code in a fresh interpreter and return its standard output."""
+    env = dict(os.environ)
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(psiz_datasets.__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        [src_dir] + [path for path in [env.get("PYTHONPATH")] if path]
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        env=env,
+        text=True,
+    ).stdout
+
+
+def _benchmark_import(module):
+    """Import module in a fresh interpreter and report the import time."""
+    code = _BENCHMARK.format(module=module, heavy_modules=_HEAVY_MODULES)
+    output = _run_python(code)
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "psiz_datasets",
+        "psiz_datasets.utils",
+        "psiz_datasets.core",
+        "psiz_datasets.core.rank_sequence",
+        "psiz_datasets.synthetic",
+    ],
+)
+def test_import_time(module):
+    """Test that lightweight modules do not import heavy dependencies."""
+    report = _benchmark_import(module)
+
+    assert report["heavy_modules"] == []
+    assert report["seconds"] < _MAX_IMPORT_SECONDS
+
+
+def test_lazy_submodule():
+    """Test lazy access of submodules."""
+    assert psiz_datasets.utils.parse_rank_sequence is not None
+    assert "birds16_rank2019" in dir(psiz_datasets)
+    with pytest.raises(AttributeError):
+        psiz_datasets.not_a_submodule  # pylint: disable=pointless-statement
+
+
+def test_register_builders():
+    """Test registration of dataset builders with TFDS."""
+    tfds = pytest.importorskip("tensorflow_datasets")
+    psiz_datasets.register_builders()
+
+    assert "birds16_rank2019" in tfds.list_builders(with_community_datasets=False)
+
+
+def test_register_builders_import_order():
+    """Test registration when TFDS is imported after `psiz_datasets`."""
+    pytest.importorskip("tensorflow_datasets")
+    code = (
+        "import sys\n"
+        "meta_path = list(sys.meta_path)\n"
+        "import psiz_datasets\n"
+        "assert sys.meta_path == meta_path\n"
+        "import tensorflow_datasets as tfds\n"
+        "assert 'psiz_datasets.birds16_rank2019' not in sys.modules\n"
+        "psiz_datasets.register_builders()\n"
+        "print(tfds.builder_cls('birds16_rank2019').__name__)\n"
+    )
+    output = _run_python(code)
+
+    assert output.splitlines()[-1] == "Birds16Rank2019"
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` loaders.
+
+Functions:
+    global_shuffle_dataset: Return a dataset that is globally shuffled
+        every epoch.
+
+"""
+
+import tensorflow as tf
+import tensorflow_datasets as tfds
+
+
+def global_shuffle_dataset(
+    builder,
+    split,
+    seed=0,
+    n_epoch=1,
+    as_supervised=False,
+    num_parallel_calls=tf.data.AUTOTUNE,
+):
+    """Return a dataset that is globally shuffled every epoch.
+
+    Requires a dataset prepared in the random-access "array_record"
+    format, e.g.:
+
+        builder = tfds.builder(
+            "birds16_rank2019/without_timestep", file_format="array_record"
+        )
+        builder.download_and_prepare()
+        ds = global_shuffle_dataset(builder, "train", seed=252, n_epoch=10)
+
+    Every epoch visits all examples in a different, uniformly random
+    order. Rather than filling a shuffle buffer, the position of each
+    example is computed on the fly by a stateless random permutation
+    (`tf.random.experimental.index_shuffle`) and the example is looked
+    up by index in O(1), so memory usage does not depend on the size of
+    the split. For direct access to examples by index, use
+    `builder.as_data_source(split)`. Note that TFDS does not implement
+    `builder.as_dataset` for the "array_record" format, so this function
+    also serves as the `tf.data` entry point for such datasets.
+
+    Serialized records are fetched in parallel and decoded in the
+    graph. The order is deterministic given `seed`.
+
+    Args:
+        builder: A prepared `tfds.core.DatasetBuilder`.
+        split: The split to load, e.g., "train" or "train[:80%]".
+        seed (optional): Integer seed of the permutations.
+        n_epoch (optional): Integer indicating the number of epochs. If
+            `None`, epochs are repeated indefinitely.
+        as_supervised (optional): Boolean indicating if examples should
+            be returned as `(inputs, targets, sample_weights)` tuples
+            (see `supervised_keys`).
+        num_parallel_calls (optional): Number of parallel calls used to
+            fetch and decode examples.
+
+    Returns:
+        A `tf.data.Dataset`.
+
+    Raises:
+        ValueError: If the dataset was not prepared in the
+            "array_record" format.
+
+    """
+    if builder.info.file_format != tfds.core.file_adapters.FileFormat.ARRAY_RECORD:
+        raise ValueError(
+            "Global shuffling requires a dataset prepared with "
+            "`file_format='array_record'`, but the dataset uses "
+            "'{0}'.".format(builder.info.file_format.value)
+        )
+    data_source = builder.as_data_source(
+        split, deserialize_method=tfds.decode.DeserializeMethod.RAW_BYTES
+    )
+    n_example = len(data_source)
+    features = builder.info.features
+
+    def fetch(index):
+        return data_source[int(index)]
+
+    def read(index):
+        serialized = tf.numpy_function(fetch, [index], tf.string, stateful=False)
+        serialized.set_shape([])
+        return serialized
+
+    def shuffled_indices(epoch):
+        seed_epoch = tf.stack([tf.constant(seed, dtype=tf.int64), epoch])
+        return tf.data.Dataset.range(n_example).map(
+            lambda index: tf.random.experimental.index_shuffle(
+                index, seed_epoch, tf.constant(n_example - 1, dtype=tf.int64)
+            )
+        )
+
+    if n_epoch is None:
+        epochs = tf.data.Dataset.counter()
+    else:
+        epochs = tf.data.Dataset.range(n_epoch)
+    ds = epochs.flat_map(shuffled_indices)
+    ds = ds.map(read, num_parallel_calls=num_parallel_calls, deterministic=True)
+    ds = ds.map(
+        features.deserialize_example,
+        num_parallel_calls=num_parallel_calls,
+        deterministic=True,
+    )
+    if as_supervised:
+        supervised_keys = builder.info.supervised_keys
+        ds = ds.map(
+            lambda example: tf.nest.map_structure(
+                lambda key: example[key], supervised_keys
+            )
+        )
+    return ds
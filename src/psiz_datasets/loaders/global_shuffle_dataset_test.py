@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test global_shuffle_dataset."""
+
+import numpy as np
+import pytest
+
+from psiz_datasets.loaders import global_shuffle_dataset
+
+_DATASET = "skin_lesions2018_rank2018"
+_CONFIG = "without_timestep"
+
+
+def _signature(example):
+    """Return hashable signature of an example."""
+    signature = []
+    for key in sorted(example.keys()):
+        value = example[key]
+        if isinstance(value, float):
+            value = np.float32(value)
+        signature.append(np.asarray(value).tobytes())
+    return tuple(signature)
+
+
+def test_global_shuffle(prepare_synthetic):
+    """Test every epoch is a different permutation of the split."""
+    builder = prepare_synthetic(_DATASET, _CONFIG, file_format="array_record")
+    expected = sorted(
+        _signature(example) for example in builder.as_data_source(split="train")
+    )
+    n_example = len(expected)
+
+    ds = global_shuffle_dataset(builder, "train", seed=252, n_epoch=2)
+    examples = [_signature(example) for example in ds.as_numpy_iterator()]
+
+    assert len(examples) == 2 * n_example
+    epoch_0 = examples[0:n_example]
+    epoch_1 = examples[n_example:]
+    assert sorted(epoch_0) == expected
+    assert sorted(epoch_1) == expected
+    assert epoch_0 != epoch_1
+
+    # Order is deterministic given the seed.
+    ds = global_shuffle_dataset(builder, "train", seed=252, n_epoch=2)
+    assert [_signature(example) for example in ds.as_numpy_iterator()] == examples
+
+    # Unlimited epochs.
+    ds = global_shuffle_dataset(builder, "train", seed=252, n_epoch=None)
+    assert len(list(ds.take(3 * n_example).as_numpy_iterator())) == 3 * n_example
+
+
+def test_global_shuffle_supervised(prepare_synthetic):
+    """Test supervised examples."""
+    builder = prepare_synthetic(_DATASET, _CONFIG, file_format="array_record")
+
+    ds = global_shuffle_dataset(builder, "train", as_supervised=True)
+
+    assert len(ds.element_spec) == 3
+    inputs_spec, targets_spec, _ = ds.element_spec
+    assert "given8rank2_stimulus_set" in inputs_spec
+    assert targets_spec["given8rank2_outcome"].shape == [56]
+
+
+def test_requires_array_record(prepare_synthetic):
+    """Test error for datasets not prepared as array_record."""
+    builder = prepare_synthetic(_DATASET, _CONFIG, file_format="tfrecord")
+
+    with pytest.raises(ValueError, match="array_record"):
+        global_shuffle_dataset(builder, "train")
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of split selectors.
+
+Functions:
+    participant_fold_splits: Return the splits of a participant-level
+        cross-validation fold.
+    participant_split: Return the split of a set of participants.
+
+"""
+
+
+def _slices(split, ranges):
+    """Return a TFDS split string that concatenates example ranges."""
+    slices = [
+        "{0}[{1}:{2}]".format(split, start, stop)
+        for start, stop in ranges
+        if stop > start
+    ]
+    if not slices:
+        raise ValueError("The selection of split '{0}' is empty.".format(split))
+    return "+".join(slices)
+
+
+def participant_fold_splits(info, split, fold):
+    """Return the splits of a participant-level cross-validation fold.
+
+    Requires a dataset prepared with `num_folds` (see
+    `RankSequenceBuilder`), which writes every fold as a contiguous
+    range of examples. The fold is selected using TFDS split slicing,
+    i.e., without scanning records. For example:
+
+        builder = tfds.builder("birds16_rank2019/without_timestep", num_folds=5)
+        builder.download_and_prepare()
+        train_split, test_split = participant_fold_splits(
+            builder.info, "train", fold=0
+        )
+        ds_train = builder.as_dataset(split=train_split)
+        ds_test = builder.as_dataset(split=test_split)
+
+    Args:
+        info: The `tfds.core.DatasetInfo` of the prepared dataset.
+        split: String indicating the name of the split.
+        fold: Integer indicating the fold.
+
+    Returns:
+        train_split: A TFDS split string of the examples of all other
+            folds.
+        test_split: A TFDS split string of the examples of `fold`.
+
+    Raises:
+        ValueError: If the dataset was not prepared with folds, or if
+            `fold` is out of range or has no examples.
+
+    """
+    if "participant_folds" not in info.metadata:
+        raise ValueError(
+            "The dataset was not prepared with participant folds, see the "
+            "`num_folds` argument of the builder."
+        )
+    participant_folds = info.metadata["participant_folds"]
+    num_folds = participant_folds["num_folds"]
+    if not 0 <= fold < num_folds:
+        raise ValueError(
+            "`fold`={0} is out of range for {1} folds.".format(fold, num_folds)
+        )
+    fold_ranges = participant_folds["splits"][split]
+    start, stop = fold_ranges[fold]
+    n_example = fold_ranges[-1][1]
+    train_split = _slices(split, [[0, start], [stop, n_example]])
+    test_split = _slices(split, [[start, stop]])
+    return train_split, test_split
+
+
+def participant_split(info, split, anonymous_ids):
+    """Return the split of a set of participants.
+
+    Requires a dataset prepared with examples grouped by participant
+    (i.e., with `num_participant_shards` or `num_folds`, see
+    `RankSequenceBuilder`). The examples of every participant are
+    selected using TFDS split slicing, i.e., without scanning records.
+
+    Args:
+        info: The `tfds.core.DatasetInfo` of the prepared dataset.
+        split: String indicating the name of the split.
+        anonymous_ids: An iterable of anonymous IDs.
+
+    Returns:
+        A TFDS split string.
+
+    Raises:
+        ValueError: If the dataset was not prepared with a participant
+            index, or if none of the participants have examples.
+        KeyError: If a participant is not in the split.
+
+    """
+    if "participant_index" not in info.metadata:
+        raise ValueError(
+            "The dataset was not prepared with a participant index, see the "
+            "`num_participant_shards` and `num_folds` arguments of the builder."
+        )
+    participant_index = info.metadata["participant_index"][split]
+    ranges = sorted(participant_index[anonymous_id] for anonymous_id in anonymous_ids)
+    return _slices(split, ranges)
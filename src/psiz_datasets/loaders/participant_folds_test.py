@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test participant_folds."""
+
+import collections
+import functools
+
+import pytest
+
+from psiz_datasets.core import participant_fold
+from psiz_datasets.loaders import participant_fold_splits
+from psiz_datasets.loaders import participant_split
+
+_DATASET = "birds16_rank2019"
+_NUM_FOLDS = 3
+
+
+@pytest.fixture
+def prepare(write_synthetic, prepare_synthetic):
+    """Return a function that prepares a synthetic dataset."""
+    write_synthetic(_DATASET, 12, n_participant=8)
+    return functools.partial(prepare_synthetic, _DATASET)
+
+
+def _participants(builder, split):
+    """Return the anonymous ID of every example of a split."""
+    anonymous_ids = []
+    for example in builder.as_dataset(split=split).as_numpy_iterator():
+        anonymous_id = example["anonymous_id"]
+        if not isinstance(anonymous_id, bytes):
+            anonymous_id = anonymous_id[0]
+        anonymous_ids.append(anonymous_id.decode())
+    return anonymous_ids
+
+
+@pytest.mark.parametrize("config", ["with_timestep", "without_timestep"])
+def test_participant_fold_splits(prepare, config):
+    """Test selecting folds without scanning records."""
+    builder = prepare(config, num_folds=_NUM_FOLDS)
+    all_ids = _participants(builder, "train")
+
+    n_example = 0
+    for fold in range(_NUM_FOLDS):
+        if fold not in {participant_fold(x, _NUM_FOLDS) for x in all_ids}:
+            # Folds without participants cannot be selected.
+            with pytest.raises(ValueError):
+                participant_fold_splits(builder.info, "train", fold)
+            continue
+        train_split, test_split = participant_fold_splits(builder.info, "train", fold)
+        test_ids = _participants(builder, test_split)
+        train_ids = _participants(builder, train_split)
+        assert {participant_fold(x, _NUM_FOLDS) for x in test_ids} == {fold}
+        assert fold not in {participant_fold(x, _NUM_FOLDS) for x in train_ids}
+        assert len(test_ids) + len(train_ids) == len(all_ids)
+        n_example += len(test_ids)
+    assert n_example == len(all_ids)
+    # Examples of a participant are contiguous.
+    for anonymous_id, (start, stop) in builder.info.metadata["participant_index"][
+        "train"
+    ].items():
+        assert set(all_ids[start:stop]) == {anonymous_id}
+
+    with pytest.raises(ValueError):
+        participant_fold_splits(builder.info, "train", _NUM_FOLDS)
+
+
+def test_participant_split(prepare):
+    """Test selecting participants without scanning records."""
+    builder = prepare("without_timestep", num_participant_shards=2)
+    counts = collections.Counter(_participants(builder, "train"))
+    assert "participant_folds" not in builder.info.metadata
+
+    selected = sorted(counts)[0:2]
+    anonymous_ids = _participants(
+        builder, participant_split(builder.info, "train", selected)
+    )
+
+    assert collections.Counter(anonymous_ids) == {
+        anonymous_id: counts[anonymous_id] for anonymous_id in selected
+    }
+
+
+def test_not_grouped(prepare):
+    """Test error for datasets prepared without a participant index."""
+    builder = prepare("with_timestep")
+
+    with pytest.raises(ValueError):
+        participant_fold_splits(builder.info, "train", 0)
+    with pytest.raises(ValueError):
+        participant_split(builder.info, "train", [])
@@ -15,7 +15,12 @@
 # ============================================================================
 """skin_lesions2018_rank2018 dataset."""
 
+import itertools
+import os
+
+import tensorflow as tf
 import tensorflow_datasets as tfds
+
 from psiz_datasets import skin_lesions2018_rank2018
 
 
@@ -39,5 +44,124 @@ class SkinLesions2018Rank2018WithoutTimestepTest(tfds.testing.DatasetBuilderTest
     }
 
 
+class SkinLesions2018Rank2018WithTimestepSparseTest(
+    tfds.testing.DatasetBuilderTestCase
+):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_sparse"]
+    SPLITS = {
+        "train": 3,
+    }
+
+
+class SkinLesions2018Rank2018WithoutTimestepSparseTest(
+    tfds.testing.DatasetBuilderTestCase
+):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep_sparse"]
+    SPLITS = {
+        "train": 89,
+    }
+
+
+class SkinLesions2018Rank2018WithTimestepRaggedTest(
+    tfds.testing.DatasetBuilderTestCase
+):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_ragged"]
+    SPLITS = {
+        "train": 3,
+    }
+
+
+class SkinLesions2018Rank2018WithTimestepRaggedSparseTest(
+    tfds.testing.DatasetBuilderTestCase
+):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_ragged_sparse"]
+    SPLITS = {
+        "train": 3,
+    }
+
+
+class SkinLesions2018Rank2018WithTimestepUnifiedTest(
+    tfds.testing.DatasetBuilderTestCase
+):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["with_timestep_unified"]
+    SPLITS = {
+        "train": 3,
+    }
+
+
+class SkinLesions2018Rank2018WithoutTimestepUnifiedTest(
+    tfds.testing.DatasetBuilderTestCase
+):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep_unified"]
+    SPLITS = {
+        "train": 89,
+    }
+
+
+class SkinLesions2018Rank2018ParticipantShardsTest(tfds.testing.DatasetBuilderTestCase):
+    """Tests for skin_lesions2018_rank2018 dataset."""
+
+    DATASET_CLASS = skin_lesions2018_rank2018.SkinLesions2018Rank2018
+    BUILDER_CONFIG_NAMES_TO_TEST = ["without_timestep"]
+    SPLITS = {
+        "train": 89,
+    }
+
+    def _make_builder(self, config=None):
+        return self.dataset_class(
+            data_dir=self.tmp_dir,
+            config=config,
+            version=self.VERSION,
+            num_participant_shards=2,
+        )
+
+    def _download_and_prepare_as_dataset(self, builder):
+        super()._download_and_prepare_as_dataset(builder)
+
+        with self._subTest("participant_shards"):
+            split_info = builder.info.splits["train"]
+            self.assertEqual(split_info.num_shards, 2)
+            # Read the shards back in order, recording the participant and
+            # shard of every example.
+            rows = []
+            for idx_shard, filepath in enumerate(split_info.filepaths):
+                ds = tf.data.TFRecordDataset(os.fspath(filepath)).map(
+                    builder.info.features.deserialize_example
+                )
+                for example in ds.as_numpy_iterator():
+                    rows.append((example["anonymous_id"], idx_shard))
+            self.assertEqual(len(rows), split_info.num_examples)
+
+            # The examples of a participant are contiguous, and fall in
+            # one shard (or two adjacent shards at a shard boundary).
+            runs = [
+                (anonymous_id, [idx_shard for _, idx_shard in group])
+                for anonymous_id, group in itertools.groupby(rows, key=lambda r: r[0])
+            ]
+            participants = [anonymous_id for anonymous_id, _ in runs]
+            self.assertGreater(len(participants), 1)
+            self.assertCountEqual(participants, set(participants))
+            for anonymous_id, shards in runs:
+                self.assertIn(shards[-1] - shards[0], (0, 1), msg=anonymous_id)
+
+
 if __name__ == "__main__":
     tfds.testing.test_main()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Synthetic data initialization file."""
+
+from psiz_datasets.synthetic.rank_sequences import synthetic_sequence
+from psiz_datasets.synthetic.rank_sequences import write_synthetic_dataset
+from psiz_datasets.synthetic.rank_sequences import write_synthetic_stimuli
+
+__all__ = [
+    "synthetic_sequence",
+    "write_synthetic_dataset",
+    "write_synthetic_stimuli",
+]
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of synthetic data functions.
+
+Functions:
+    write_synthetic_dataset: Write a synthetic rank-sequence dataset.
+    write_synthetic_stimuli: Write a synthetic stimulus metadata file.
+    synthetic_sequence: Return the data of a synthetic sequence file.
+
+NOTE: This module does not depend on TensorFlow so that it can be
+used by worker processes without paying for a TensorFlow import.
+
+"""
+
+import csv
+import datetime
+import functools
+import json
+import uuid
+
+from etils import epath
+import numpy as np
+
+from psiz_datasets.utils import parallel_imap
+
+_BASE36_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_LOCAL_ID_LENGTH = 7
+_TIME_ORIGIN = datetime.datetime(2019, 1, 1)
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _base36(value, length=_LOCAL_ID_LENGTH):
+    """Return the zero-padded base-36 string of an integer."""
+    digits = []
+    while value > 0:
+        value, digit = divmod(value, 36)
+        digits.append(_BASE36_DIGITS[digit])
+    return "".join(reversed(digits)).rjust(length, "0").upper()
+
+
+def write_synthetic_stimuli(path, columns, n_stimuli, n_category=10):
+    """Write a synthetic stimulus metadata file.
+
+    Args:
+        path: Path of the pipe-separated metadata file.
+        columns: A tuple of metadata column names.
+        n_stimuli: Integer indicating the number of stimuli. Stimuli
+            have the local IDs `1, ..., n_stimuli`.
+        n_category (optional): Integer indicating the number of unique
+            values of each column other than "filepath".
+
+    """
+    path = epath.Path(path)
+    with path.open("w") as f:
+        writer = csv.writer(f, delimiter="|", lineterminator="\n")
+        writer.writerow(("local_id",) + tuple(columns))
+        for stimulus_id in range(1, n_stimuli + 1):
+            row = [_base36(stimulus_id)]
+            for column in columns:
+                if column == "filepath":
+                    row.append("/synthetic/stimulus_{0}.jpg".format(stimulus_id))
+                else:
+                    row.append("{0}_{1}".format(column, stimulus_id % n_category))
+            writer.writerow(row)
+
+
+def _read_local_ids(path):
+    """Return the local IDs of a stimulus metadata file."""
+    with epath.Path(path).open() as f:
+        return [row["local_id"] for row in csv.DictReader(f, delimiter="|")]
+
+
+def synthetic_sequence(
+    spec,
+    local_ids,
+    sequence_id,
+    anonymous_id,
+    seed=0,
+    asset_prefix="PZ001",
+    min_timestep=None,
+):
+    """Return the data of a synthetic sequence file.
+
+    Sequences follow the format of the raw sequence files: rank trials
+    of the kinds in `spec.rank_configs` (chosen uniformly at random)
+    with query, reference and ranked selection interactions, followed
+    by a single timestep of each of `spec.other_kinds`.
+
+    Args:
+        spec: A `RankSequenceSpec` object.
+        local_ids: A list of base-36 local ID strings to draw stimuli
+            from. Must have more entries than the largest number of
+            references.
+        sequence_id: Integer identifying the sequence.
+        anonymous_id: String identifying the participant.
+        seed (optional): Integer seed. Together with `sequence_id`, it
+            determines the sequence.
+        asset_prefix (optional): String indicating the domain and
+            subdomain of asset IDs.
+        min_timestep (optional): Integer indicating the minimum number
+            of rank trials. By default, half of `spec.max_timestep`.
+
+    Returns:
+        A JSON-serializable dictionary.
+
+    """
+    if min_timestep is None:
+        min_timestep = max(1, spec.max_timestep // 2)
+    rng = np.random.default_rng([seed, sequence_id])
+    n_timestep = int(rng.integers(min_timestep, spec.max_timestep + 1))
+    time_current = _TIME_ORIGIN + datetime.timedelta(
+        seconds=int(rng.integers(0, 3 * 365 * 24 * 3600))
+    )
+    time_begin = time_current
+
+    sequence = []
+    for position in range(n_timestep):
+        n_reference, n_select = spec.rank_configs[
+            int(rng.integers(len(spec.rank_configs)))
+        ]
+        stimulus_idx = rng.choice(len(local_ids), size=n_reference + 1, replace=False)
+        assets = [asset_prefix + local_ids[idx] for idx in stimulus_idx]
+        selections = rng.choice(n_reference, size=n_select, replace=False)
+        response_time_ms = int(rng.integers(1000, 30000))
+        trial_begin = time_current.strftime(_TIME_FORMAT)
+        time_current = time_current + datetime.timedelta(milliseconds=response_time_ms)
+        trial_end = time_current.strftime(_TIME_FORMAT)
+
+        interactions = [
+            {"time_begin": trial_begin, "kind": "content:query", "detail": assets[0]}
+        ]
+        for idx, asset in enumerate(assets[1:]):
+            interactions.append(
+                {
+                    "time_begin": trial_begin,
+                    "kind": "content:reference_{0}".format(idx),
+                    "detail": asset,
+                }
+            )
+        for idx, selection in enumerate(selections):
+            interactions.append(
+                {
+                    "time_begin": trial_end,
+                    "kind": "behavior:rank_{0}".format(idx),
+                    "detail": assets[1 + selection],
+                }
+            )
+        interactions.append(
+            {
+                "time_begin": trial_end,
+                "kind": "behavior:submit_response",
+                "detail": "NA",
+            }
+        )
+        sequence.append(
+            {
+                "position": position,
+                "kind": "rank:{0}rank{1}".format(n_reference, n_select),
+                "time_begin": trial_begin,
+                "time_end": trial_end,
+                "response_time_ms": response_time_ms,
+                "grade_subjective": 100,
+                "grade_objective": -1,
+                "interactions": interactions,
+            }
+        )
+    for kind in spec.other_kinds:
+        timestamp = time_current.strftime(_TIME_FORMAT)
+        sequence.append(
+            {
+                "position": len(sequence),
+                "kind": kind,
+                "time_begin": timestamp,
+                "time_end": timestamp,
+                "response_time_ms": 0,
+                "grade_subjective": -1,
+                "grade_objective": -1,
+                "interactions": [],
+            }
+        )
+
+    return {
+        "version": "1.0",
+        "data": [
+            {
+                "sequence_id": sequence_id,
+                "anonymous_id": anonymous_id,
+                "design_id": 0,
+                "project": "rank:synthetic",
+                "stimulus_set": "synthetic",
+                "protocol": "synthetic",
+                "time_begin": time_begin.strftime(_TIME_FORMAT),
+                "time_end": time_current.strftime(_TIME_FORMAT),
+                "n_timestep": len(sequence),
+                "grade": int(rng.choice([50, 75, 100])),
+                "sequence": sequence,
+            }
+        ],
+    }
+
+
+def _write_sequence(task, spec, local_ids, seed, asset_prefix):
+    """Write a single synthetic sequence file."""
+    path, sequence_id, anonymous_id = task
+    data = synthetic_sequence(
+        spec,
+        local_ids,
+        sequence_id,
+        anonymous_id,
+        seed=seed,
+        asset_prefix=asset_prefix,
+    )
+    epath.Path(path).write_text(json.dumps(data, indent=4))
+    return sum(
+        timestep["kind"] in spec.rank_kinds for timestep in data["data"][0]["sequence"]
+    )
+
+
+def write_synthetic_dataset(
+    spec,
+    output_dir,
+    n_sequence,
+    stimuli_path=None,
+    n_stimuli=1000,
+    n_participant=None,
+    asset_prefix="PZ001",
+    seed=0,
+    num_workers=None,
+):
+    """Write a synthetic rank-sequence dataset.
+
+    The output has the same layout as an extracted raw data archive,
+    i.e., a "stimuli.txt" file and one directory of "seq_*.json" files
+    per split in `spec.splits`, so it can be used in place of the
+    downloaded data when preparing a dataset.
+
+    Args:
+        spec: A `RankSequenceSpec` object.
+        output_dir: Path of the output directory.
+        n_sequence: Integer indicating the number of sequences of each
+            split.
+        stimuli_path (optional): Path of an existing stimulus metadata
+            file whose local IDs are used for the asset IDs. By
+            default, a synthetic metadata file with `n_stimuli`
+            stimuli is written.
+        n_stimuli (optional): Integer indicating the number of
+            synthetic stimuli.
+        n_participant (optional): Integer indicating the number of
+            participants of each split. By default, each participant
+            completes two sequences on average.
+        asset_prefix (optional): String indicating the domain and
+            subdomain of asset IDs, e.g., "PZ001".
+        seed (optional): Integer seed. The output is deterministic
+            given the arguments (regardless of `num_workers`).
+        num_workers (optional): Integer indicating the number of worker
+            processes used to write sequence files.
+
+    Returns:
+        A dictionary with the number of sequences and rank trials
+        written, keyed by split.
+
+    """
+    output_dir = epath.Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stimuli_output = output_dir / "stimuli.txt"
+    if stimuli_path is None:
+        write_synthetic_stimuli(stimuli_output, spec.metadata_columns, n_stimuli)
+    elif epath.Path(stimuli_path) != stimuli_output:
+        stimuli_output.write_text(epath.Path(stimuli_path).read_text())
+    local_ids = _read_local_ids(stimuli_output)
+    if n_participant is None:
+        n_participant = max(1, n_sequence // 2)
+
+    write = functools.partial(
+        _write_sequence,
+        spec=spec,
+        local_ids=local_ids,
+        seed=seed,
+        asset_prefix=asset_prefix,
+    )
+    counts = {}
+    for split_idx, (split, seqs_dir) in enumerate(sorted(spec.splits.items())):
+        seqs_path = output_dir / seqs_dir
+        seqs_path.mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng([seed, split_idx])
+        participants = [
+            str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(n_participant)
+        ]
+        assignment = rng.integers(n_participant, size=n_sequence)
+        # Sequence IDs are unique across splits.
+        tasks = (
+            (
+                seqs_path / "seq_{0:07d}.json".format(idx),
+                split_idx * n_sequence + idx,
+                participants[assignment[idx]],
+            )
+            for idx in range(n_sequence)
+        )
+        n_trial = sum(parallel_imap(write, tasks, num_workers=num_workers))
+        counts[split] = {"n_sequence": n_sequence, "n_trial": n_trial}
+    return counts
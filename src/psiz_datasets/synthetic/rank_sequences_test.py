@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test rank_sequences."""
+
+import json
+
+from etils import epath
+import numpy as np
+import pytest
+
+from psiz_datasets.core import RankSequenceSpec
+from psiz_datasets.core import StimulusTable
+from psiz_datasets.core import generate_sequence_examples
+from psiz_datasets.synthetic import synthetic_sequence
+from psiz_datasets.synthetic import write_synthetic_dataset
+from psiz_datasets.utils import parse_rank_sequence
+
+
+@pytest.fixture
+def spec():
+    """Spec with two rank configurations and two splits."""
+    return RankSequenceSpec(
+        data_url="https://example.com/data.zip",
+        rank_configs=((8, 2), (2, 1)),
+        max_timestep=12,
+        metadata_columns=("filepath", "family"),
+        splits={"train": "train_seqs", "test": "test_seqs"},
+        other_kinds=("questionnaire:feedback",),
+    )
+
+
+def test_synthetic_sequence(spec):
+    """Test that synthetic sequences are valid and deterministic."""
+    local_ids = ["000000{0}".format(idx) for idx in range(1, 10)] + ["000000A"]
+
+    data = synthetic_sequence(spec, local_ids, 3, "participant", seed=5)
+
+    assert data == synthetic_sequence(spec, local_ids, 3, "participant", seed=5)
+    assert data != synthetic_sequence(spec, local_ids, 4, "participant", seed=5)
+    sequence = data["data"][0]["sequence"]
+    spec.validate_sequence(sequence)
+    assert sequence[-1]["kind"] == "questionnaire:feedback"
+    trials = parse_rank_sequence(sequence)
+    assert 6 <= len(trials["kind"]) <= spec.max_timestep
+    assert np.all(trials["stimulus_set"][:, 0] > 0)
+    assert np.all(trials["stimulus_set"] <= 10)
+
+
+def test_write_synthetic_dataset(spec, tmp_path):
+    """Test that a synthetic dataset can be formatted."""
+    output_dir = epath.Path(tmp_path)
+
+    counts = write_synthetic_dataset(spec, output_dir, 4, n_stimuli=20, seed=1)
+
+    assert sorted(counts.keys()) == ["test", "train"]
+    table = StimulusTable.from_file(output_dir / "stimuli.txt", spec.metadata_columns)
+    assert len(table) == 21
+    sequence_ids = []
+    for split, seqs_dir in spec.splits.items():
+        sequence_paths = sorted((output_dir / seqs_dir).glob("seq_*.json"))
+        assert len(sequence_paths) == 4
+        n_trial = 0
+        for sequence_path in sequence_paths:
+            data = json.loads(sequence_path.read_text())
+            sequence_ids.append(data["data"][0]["sequence_id"])
+            examples = generate_sequence_examples(
+                sequence_path, spec, with_timestep_axis=True, unified_trial=True
+            )
+            n_trial += int(examples[0][1]["n_timestep"])
+        assert counts[split] == {"n_sequence": 4, "n_trial": n_trial}
+    assert len(set(sequence_ids)) == 8
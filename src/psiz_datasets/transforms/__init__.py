@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Transforms initialization file."""
+
+from psiz_datasets.transforms.bucket_sequence_batch import bucket_sequence_batch
+from psiz_datasets.transforms.expand_sparse_outcome import expand_sparse_outcome
+from psiz_datasets.transforms.join_stimulus_metadata import join_stimulus_metadata
+from psiz_datasets.transforms.pad_sequence_batch import pad_sequence_batch
+from psiz_datasets.transforms.split_trial_kinds import split_trial_kinds
+from psiz_datasets.transforms.unroll_sequences import unroll_sequences
+
+__all__ = [
+    "bucket_sequence_batch",
+    "expand_sparse_outcome",
+    "join_stimulus_metadata",
+    "pad_sequence_batch",
+    "split_trial_kinds",
+    "unroll_sequences",
+]
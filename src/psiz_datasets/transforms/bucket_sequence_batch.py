@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` transforms.
+
+Functions:
+    bucket_sequence_batch: Batch sequences of similar length.
+
+"""
+
+import tensorflow as tf
+
+from psiz_datasets.transforms.pad_sequence_batch import _fill_placeholders
+
+_LENGTH_KEY = "n_timestep"
+
+
+def _trim(element):
+    """Drop padding beyond the stored length of a sequence."""
+    n_timestep = element[_LENGTH_KEY]
+    return {
+        key: value if key == _LENGTH_KEY else value[0:n_timestep]
+        for key, value in element.items()
+    }
+
+
+def bucket_sequence_batch(
+    dataset, bucket_lengths, batch_size, supervised_keys=None, drop_remainder=False
+):
+    """Batch sequences of similar length.
+
+    Intended for datasets prepared using any of the `with_timestep*`
+    configs. Sequences are assigned to the smallest bucket that fits
+    their "n_timestep" feature (stored at build time) and every batch
+    is padded to the length of its bucket. Padded timesteps use the
+    same placeholder values as placeholder trials, i.e., stimulus ID 0,
+    outcome index 0, a sample weight of 0 and the anonymous ID of the
+    sequence. For example:
+
+        builder = tfds.builder("birds16_rank2019/with_timestep_ragged")
+        ds = builder.as_dataset(split="train")
+        ds = bucket_sequence_batch(
+            ds,
+            bucket_lengths=[30, 60, 90, 120],
+            batch_size=32,
+            supervised_keys=builder.info.supervised_keys,
+        )
+
+    Since batches are drawn from each bucket as it fills, the order of
+    sequences differs from the order of `dataset`.
+
+    Args:
+        dataset: A `tf.data.Dataset` of feature dictionaries (i.e., not
+            loaded with `as_supervised=True`) that include
+            "n_timestep".
+        bucket_lengths: A list of integers indicating the length of
+            each bucket. Sequences longer than the largest bucket
+            length raise an error when iterating the dataset, so it
+            should be at least the `max_timestep` of the dataset.
+        batch_size: Integer indicating the number of sequences per
+            batch.
+        supervised_keys (optional): The `supervised_keys` of the
+            dataset's `tfds.core.DatasetInfo`. If provided, batches are
+            returned as `(inputs, targets, sample_weights)` tuples,
+            like `as_supervised=True`.
+        drop_remainder (optional): Boolean indicating if the last
+            batch of each bucket should be dropped if it has fewer than
+            `batch_size` sequences.
+
+    Returns:
+        A batched `tf.data.Dataset`.
+
+    """
+    bucket_lengths = sorted(int(length) for length in bucket_lengths)
+    dataset = dataset.map(_trim)
+    # NOTE: A bucket boundary is the exclusive upper bound of sequence
+    # lengths, and batches are padded to one less than the boundary.
+    dataset = dataset.bucket_by_sequence_length(
+        lambda element: element[_LENGTH_KEY],
+        bucket_boundaries=[length + 1 for length in bucket_lengths],
+        bucket_batch_sizes=[batch_size] * (len(bucket_lengths) + 1),
+        pad_to_bucket_boundary=True,
+        drop_remainder=drop_remainder,
+    )
+    dataset = dataset.map(_fill_placeholders)
+    if supervised_keys is not None:
+        dataset = dataset.map(
+            lambda element: tf.nest.map_structure(
+                lambda key: element[key], supervised_keys
+            )
+        )
+    return dataset
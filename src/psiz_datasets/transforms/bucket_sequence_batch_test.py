@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test bucket_sequence_batch."""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from psiz_datasets.transforms import bucket_sequence_batch
+
+_MAX_TIMESTEP = 6
+
+
+def _padded_sequences(lengths):
+    """Return sequences padded with placeholder trials."""
+    rng = np.random.default_rng(252)
+    n_sequence = len(lengths)
+    is_trial = np.arange(_MAX_TIMESTEP) < np.array(lengths)[:, np.newaxis]
+    stimulus_set = rng.integers(1, 10, [n_sequence, _MAX_TIMESTEP, 3])
+    outcome_idx = rng.integers(0, 2, [n_sequence, _MAX_TIMESTEP]) * is_trial
+    return {
+        "anonymous_id": np.full([n_sequence, _MAX_TIMESTEP], "a"),
+        "n_timestep": np.array(lengths, dtype=np.int32),
+        "given2rank1_stimulus_set": (stimulus_set * is_trial[..., np.newaxis]).astype(
+            np.int32
+        ),
+        "given2rank1_outcome": np.eye(2, dtype=np.float32)[outcome_idx],
+        "given2rank1_sample_weight": is_trial.astype(np.float32),
+    }
+
+
+def _ragged_dataset(sequences):
+    """Return dataset of sequences without padding."""
+    keys = list(sequences.keys())
+
+    def generate():
+        for idx, length in enumerate(sequences["n_timestep"]):
+            yield {
+                k: (
+                    sequences[k][idx]
+                    if k == "n_timestep"
+                    else sequences[k][idx][0:length]
+                )
+                for k in keys
+            }
+
+    return tf.data.Dataset.from_generator(
+        generate,
+        output_signature={
+            k: tf.TensorSpec(
+                shape=(None,) + sequences[k].shape[2:] if k != "n_timestep" else (),
+                dtype=tf.as_dtype(sequences[k].dtype),
+            )
+            for k in keys
+        },
+    )
+
+
+@pytest.mark.parametrize("is_ragged", [False, True])
+def test_bucket_padding(is_ragged):
+    """Test that batches are padded to their bucket with placeholders."""
+    lengths = [2, 5, 3, 1]
+    sequences = _padded_sequences(lengths)
+    if is_ragged:
+        ds = _ragged_dataset(sequences)
+    else:
+        ds = tf.data.Dataset.from_tensor_slices(sequences)
+
+    ds = bucket_sequence_batch(ds, bucket_lengths=[6, 3], batch_size=2)
+
+    batches = list(ds)
+    assert [len(batch["n_timestep"]) for batch in batches] == [2, 1, 1]
+    seen = []
+    for batch in batches:
+        n_timestep = batch["n_timestep"].numpy()
+        bucket_length = 3 if np.max(n_timestep) <= 3 else 6
+        idx = [lengths.index(length) for length in n_timestep]
+        seen.extend(idx)
+        for key in ("stimulus_set", "outcome", "sample_weight"):
+            key = "given2rank1_" + key
+            assert batch[key].shape[1] == bucket_length
+            np.testing.assert_array_equal(
+                batch[key], sequences[key][idx, 0:bucket_length]
+            )
+        np.testing.assert_array_equal(
+            batch["anonymous_id"].numpy().astype(str),
+            sequences["anonymous_id"][idx, 0:bucket_length],
+        )
+    assert sorted(seen) == [0, 1, 2, 3]
+
+
+def test_supervised_keys():
+    """Test returning batches as supervised tuples."""
+    sequences = _padded_sequences([2, 3])
+    ds = tf.data.Dataset.from_tensor_slices(sequences)
+    supervised_keys = (
+        {"given2rank1_stimulus_set": "given2rank1_stimulus_set"},
+        {"given2rank1_outcome": "given2rank1_outcome"},
+        {"given2rank1_sample_weight": "given2rank1_sample_weight"},
+    )
+
+    ds = bucket_sequence_batch(
+        ds, bucket_lengths=[4], batch_size=2, supervised_keys=supervised_keys
+    )
+
+    x, y, w = next(iter(ds))
+    assert x["given2rank1_stimulus_set"].shape == (2, 4, 3)
+    assert y["given2rank1_outcome"].shape == (2, 4, 2)
+    np.testing.assert_array_equal(
+        w["given2rank1_sample_weight"], [[1, 1, 0, 0], [1, 1, 1, 0]]
+    )
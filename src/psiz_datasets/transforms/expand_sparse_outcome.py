@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` transforms.
+
+Functions:
+    expand_sparse_outcome: Expand sparse outcome indices to one-hot.
+
+"""
+
+import re
+
+import tensorflow as tf
+
+from psiz_datasets.utils.rank_outcome import rank_n_outcome
+
+_OUTCOME_PATTERN = re.compile(r"^given(\d+)rank(\d+)_outcome$")
+
+
+def _expand(element, key=None):
+    """Recursively expand sparse rank outcomes of an element."""
+    if isinstance(element, dict):
+        return {k: _expand(v, key=k) for k, v in element.items()}
+    if isinstance(element, (tuple, list)):
+        return type(element)(_expand(v) for v in element)
+    match = _OUTCOME_PATTERN.match(key or "")
+    if match is None or not element.dtype.is_integer:
+        return element
+    n_outcome = rank_n_outcome(int(match.group(1)), int(match.group(2)))
+    return tf.one_hot(element, n_outcome, dtype=tf.float32)
+
+
+def expand_sparse_outcome(*args):
+    """Expand sparse outcome indices to one-hot.
+
+    Intended for use with `tf.data.Dataset.map` on datasets prepared
+    using one of the `*_sparse` configs, so that one-hot outcomes are
+    only materialized when a model requires them. Features named
+    "given{n_reference}rank{n_select}_outcome" that have an integer
+    dtype are expanded; all other features are passed through
+    unchanged. For example:
+
+        ds = tfds.load("birds16_rank2019/with_timestep_sparse", split="train")
+        ds = ds.map(expand_sparse_outcome)
+
+    Works with feature dictionaries as well as `as_supervised=True`
+    tuples. The resulting elements match those of the corresponding
+    dense config.
+
+    Args:
+        *args: The (possibly nested) dataset element.
+
+    Returns:
+        The dataset element with expanded outcomes.
+
+    """
+    element = args[0] if len(args) == 1 else args
+    return _expand(element)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test expand_sparse_outcome."""
+
+import numpy as np
+import tensorflow as tf
+
+from psiz_datasets.transforms import expand_sparse_outcome
+
+
+def test_feature_dict():
+    """Test expansion of a feature dictionary with a timestep axis."""
+    x = {
+        "given8rank2_stimulus_set": np.ones([2, 3, 9], dtype=np.int32),
+        "given8rank2_outcome": np.array([[0, 5, 55], [1, 0, 0]], dtype=np.int32),
+        "given2rank1_outcome": np.array([[0, 1, 1], [1, 0, 0]], dtype=np.int32),
+        "given8rank2_sample_weight": np.ones([2, 3], dtype=np.float32),
+    }
+    ds = tf.data.Dataset.from_tensor_slices(x).map(expand_sparse_outcome)
+
+    element = next(iter(ds))
+    assert element["given8rank2_outcome"].shape == (3, 56)
+    assert element["given8rank2_outcome"].dtype == tf.float32
+    np.testing.assert_array_equal(
+        np.argmax(element["given8rank2_outcome"], axis=-1), [0, 5, 55]
+    )
+    np.testing.assert_array_equal(element["given2rank1_outcome"], np.eye(2)[[0, 1, 1]])
+    np.testing.assert_array_equal(element["given8rank2_stimulus_set"], 1)
+    assert element["given8rank2_stimulus_set"].dtype == tf.int32
+
+
+def test_supervised_tuple():
+    """Test expansion of an `as_supervised` tuple."""
+    x = {"given8rank2_stimulus_set": np.ones([4, 9], dtype=np.int32)}
+    y = {"given8rank2_outcome": np.array([3, 0, 1, 2], dtype=np.int32)}
+    w = {"given8rank2_sample_weight": np.ones([4], dtype=np.float32)}
+    ds = tf.data.Dataset.from_tensor_slices((x, y, w)).map(expand_sparse_outcome)
+
+    x, y, w = next(iter(ds.batch(4)))
+    np.testing.assert_array_equal(
+        y["given8rank2_outcome"], np.eye(56, dtype=np.float32)[[3, 0, 1, 2]]
+    )
+    assert x["given8rank2_stimulus_set"].shape == (4, 9)
+    assert w["given8rank2_sample_weight"].shape == (4,)
+
+
+def test_dense_outcome_unchanged():
+    """Test that dense outcomes are passed through."""
+    outcome = np.eye(56, dtype=np.float32)[[7]]
+    ds = tf.data.Dataset.from_tensor_slices({"given8rank2_outcome": outcome})
+
+    element = next(iter(ds.map(expand_sparse_outcome)))
+    np.testing.assert_array_equal(element["given8rank2_outcome"], outcome[0])
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` transforms.
+
+Functions:
+    join_stimulus_metadata: Return a transform that joins stimulus
+        metadata to stimulus sets.
+
+"""
+
+import re
+
+import tensorflow as tf
+
+from psiz_datasets.core.stimulus_table import StimulusTable
+
+_STIMULUS_SET_PATTERN = re.compile(r"^(?:(given\d+rank\d+)_)?stimulus_set$")
+
+
+def join_stimulus_metadata(stimuli, columns, as_codes=False):
+    """Return a transform that joins stimulus metadata to stimulus sets.
+
+    For every feature named "given{n_reference}rank{n_select}_stimulus_set",
+    the returned function adds a feature
+    "given{n_reference}rank{n_select}_{column}" for each requested
+    column, with the same shape as the stimulus set. The unprefixed
+    "stimulus_set" feature of the "*_unified" configs is joined to
+    features named after the columns (e.g., "taxonomic_family"). Lookups are
+    `tf.gather` ops on constant tensors built from the dictionary
+    encoded columns of a `StimulusTable`, so they run inside the graph
+    and parallelize with `tf.data.Dataset.map`. For example:
+
+        builder = tfds.builder("birds16_rank2019/with_timestep")
+        join = join_stimulus_metadata(
+            builder.info.metadata["stimuli"], ["taxonomic_family"]
+        )
+        ds = builder.as_dataset(split="train").map(
+            join, num_parallel_calls=tf.data.AUTOTUNE
+        )
+
+    The placeholder stimulus (ID 0) maps to category code 0, i.e., the
+    empty string.
+
+    Args:
+        stimuli: A `StimulusTable` or the path of a pipe-separated
+            "stimuli.txt" metadata file.
+        columns: A list of column names to join.
+        as_codes (optional): Boolean indicating if int32 category codes
+            should be returned instead of strings. Codes index into
+            `StimulusTable.categories(column)`.
+
+    Returns:
+        A function intended for use with `tf.data.Dataset.map`. Works
+        with feature dictionaries as well as `as_supervised=True`
+        tuples, in which case metadata is added to the dictionaries
+        that contain stimulus sets.
+
+    Raises:
+        KeyError: If a column is not part of the metadata.
+        ValueError: If the returned function is applied to an element
+            without any stimulus set features.
+
+    """
+    columns = tuple(columns)
+    if not isinstance(stimuli, StimulusTable):
+        stimuli = StimulusTable.from_file(stimuli, columns)
+    for column in columns:
+        if column not in stimuli:
+            raise KeyError(column)
+
+    tables = {
+        column: (
+            tf.constant(stimuli.codes(column), dtype=tf.int32),
+            tf.constant(stimuli.categories(column), dtype=tf.string),
+        )
+        for column in columns
+    }
+
+    def _lookup(stimulus_set, column):
+        codes, categories = tables[column]
+        stimulus_codes = tf.gather(codes, stimulus_set)
+        if as_codes:
+            return stimulus_codes
+        return tf.gather(categories, stimulus_codes)
+
+    def _join(element, matched):
+        if isinstance(element, dict):
+            joined = {}
+            for key, value in element.items():
+                joined[key] = _join(value, matched)
+                match = _STIMULUS_SET_PATTERN.match(key)
+                if match is None:
+                    continue
+                matched.append(key)
+                for column in columns:
+                    if match.group(1) is None:
+                        name = column
+                    else:
+                        name = match.group(1) + "_" + column
+                    joined[name] = _lookup(value, column)
+            return joined
+        if isinstance(element, (tuple, list)):
+            return type(element)(_join(v, matched) for v in element)
+        return element
+
+    def join(*args):
+        element = args[0] if len(args) == 1 else args
+        matched = []
+        joined = _join(element, matched)
+        if not matched:
+            raise ValueError(
+                "Element does not contain a stimulus set feature to join "
+                "metadata to."
+            )
+        return joined
+
+    return join
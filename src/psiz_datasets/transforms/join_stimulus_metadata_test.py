@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test join_stimulus_metadata."""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from psiz_datasets.core import StimulusTable
+from psiz_datasets.transforms import join_stimulus_metadata
+
+
+@pytest.fixture
+def stimuli():
+    """Stimulus table with a gap in the stimulus IDs."""
+    return StimulusTable(
+        columns={
+            "family": (
+                np.array([0, 1, 2, 0, 1], dtype=np.int32),
+                np.array(["", "Corvidae", "Laridae"]),
+            ),
+        }
+    )
+
+
+def test_feature_dict(stimuli):
+    """Test join on a feature dictionary including placeholders."""
+    x = {
+        "given2rank1_stimulus_set": np.array([[[1, 2, 4], [0, 0, 0]]], dtype=np.int32),
+        "given2rank1_outcome": np.zeros([1, 2], dtype=np.int32),
+    }
+    join = join_stimulus_metadata(stimuli, ["family"])
+    ds = tf.data.Dataset.from_tensor_slices(x).map(join)
+
+    element = next(iter(ds))
+    np.testing.assert_array_equal(
+        element["given2rank1_family"].numpy().astype(str),
+        [["Corvidae", "Laridae", "Corvidae"], ["", "", ""]],
+    )
+    np.testing.assert_array_equal(element["given2rank1_outcome"], [0, 0])
+
+
+def test_codes_supervised_tuple(stimuli):
+    """Test join of category codes on an `as_supervised` tuple."""
+    x = {"given2rank1_stimulus_set": np.array([[3, 1, 2]], dtype=np.int32)}
+    y = {"given2rank1_outcome": np.array([1], dtype=np.int32)}
+    join = join_stimulus_metadata(stimuli, ["family"], as_codes=True)
+    ds = tf.data.Dataset.from_tensor_slices((x, y)).map(join)
+
+    x, y = next(iter(ds))
+    assert x["given2rank1_family"].dtype == tf.int32
+    np.testing.assert_array_equal(x["given2rank1_family"], [0, 1, 2])
+    assert list(y.keys()) == ["given2rank1_outcome"]
+
+
+def test_stimuli_file(tmp_path):
+    """Test building lookup tables from a metadata file."""
+    path = tmp_path / "stimuli.txt"
+    path.write_text(
+        "local_id|filepath|diagnosis\n0000001|a.jpg|benign\n000000a|b.jpg|malignant\n"
+    )
+    join = join_stimulus_metadata(str(path), ["diagnosis"])
+
+    element = join({"given8rank2_stimulus_set": tf.constant([10, 1, 0])})
+    np.testing.assert_array_equal(
+        element["given8rank2_diagnosis"].numpy().astype(str),
+        ["malignant", "benign", ""],
+    )
+
+
+def test_unified_trial(stimuli):
+    """Test join on a `with_timestep_unified` element."""
+    x = {
+        "kind": np.array([[1, 2, 0]], dtype=np.int32),
+        "stimulus_set": np.array(
+            [[[1, 2, 4, 3], [2, 1, 3, 0], [0, 0, 0, 0]]], dtype=np.int32
+        ),
+        "outcome": np.zeros([1, 3], dtype=np.int32),
+    }
+    join = join_stimulus_metadata(stimuli, ["family"])
+    ds = tf.data.Dataset.from_tensor_slices(x).map(join)
+
+    element = next(iter(ds))
+    np.testing.assert_array_equal(
+        element["family"].numpy().astype(str),
+        [
+            ["Corvidae", "Laridae", "Corvidae", ""],
+            ["Laridae", "Corvidae", "", ""],
+            ["", "", "", ""],
+        ],
+    )
+    assert sorted(element.keys()) == ["family", "kind", "outcome", "stimulus_set"]
+
+
+def test_no_stimulus_set(stimuli):
+    """Test that elements without stimulus sets are rejected."""
+    join = join_stimulus_metadata(stimuli, ["family"])
+    with pytest.raises(ValueError):
+        join({"given2rank1_outcome": tf.constant([0])})
+
+
+def test_unknown_column(stimuli):
+    """Test that unknown columns are rejected."""
+    with pytest.raises(KeyError):
+        join_stimulus_metadata(stimuli, ["diagnosis"])
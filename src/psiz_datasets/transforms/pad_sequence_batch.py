@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` transforms.
+
+Functions:
+    pad_sequence_batch: Batch variable-length sequences with
+        placeholder trials.
+
+"""
+
+import re
+
+import tensorflow as tf
+
+_OUTCOME_PATTERN = re.compile(r"^given\d+rank\d+_outcome$")
+
+
+def _fill_placeholders(element, key=None):
+    """Recursively fill padded rows with build-time placeholder values.
+
+    Padded one-hot outcomes are marked as outcome index 0, and padded
+    anonymous IDs are set to the anonymous ID of their sequence.
+
+    """
+    if isinstance(element, dict):
+        return {k: _fill_placeholders(v, key=k) for k, v in element.items()}
+    if isinstance(element, (tuple, list)):
+        return type(element)(_fill_placeholders(v) for v in element)
+    if key == "anonymous_id" and element.shape.rank == 2:
+        # Padded rows are empty strings, while every stored row holds
+        # the anonymous ID of the sequence.
+        return tf.where(tf.equal(element, ""), element[:, 0:1], element)
+    if _OUTCOME_PATTERN.match(key or "") is None or not element.dtype.is_floating:
+        return element
+    # Padded rows are all zeros, while every stored row sums to one.
+    is_padding = 1.0 - tf.reduce_sum(element, axis=-1, keepdims=True)
+    first = tf.one_hot(0, tf.shape(element)[-1], dtype=element.dtype)
+    return element + is_padding * first
+
+
+def _padded_shape(spec, n_timestep):
+    """Return the padded shape of a feature with a timestep axis."""
+    if spec.shape.rank == 0:
+        # Sequence-level scalars, e.g., "n_timestep".
+        return spec.shape
+    return tf.TensorShape([n_timestep]).concatenate(spec.shape[1:])
+
+
+def pad_sequence_batch(dataset, batch_size, n_timestep=None, drop_remainder=False):
+    """Batch variable-length sequences with placeholder trials.
+
+    Intended for datasets prepared using one of the
+    `with_timestep_ragged*` configs. Sequences are padded to the
+    longest sequence of each batch (or to `n_timestep`) with the same
+    placeholder values used when padding at build time, i.e., stimulus
+    ID 0, outcome index 0, a sample weight of 0 and the anonymous ID of
+    the sequence. For example:
+
+        ds = tfds.load("birds16_rank2019/with_timestep_ragged", split="train")
+        ds = pad_sequence_batch(ds, batch_size=32)
+
+    Works with feature dictionaries as well as `as_supervised=True`
+    tuples.
+
+    Args:
+        dataset: A `tf.data.Dataset` of sequences. Non-scalar
+            features must have a leading timestep axis.
+        batch_size: Integer indicating the number of sequences per
+            batch.
+        n_timestep (optional): Integer indicating a fixed length to pad
+            every batch to, e.g., the `max_timestep` of the dataset.
+            Must be at least the length of the longest sequence. By
+            default, batches are padded to their longest sequence.
+        drop_remainder (optional): Boolean indicating if the last batch
+            should be dropped if it has fewer than `batch_size`
+            sequences.
+
+    Returns:
+        A batched `tf.data.Dataset`.
+
+    """
+    padded_shapes = None
+    if n_timestep is not None:
+        padded_shapes = tf.nest.map_structure(
+            lambda spec: _padded_shape(spec, n_timestep), dataset.element_spec
+        )
+    dataset = dataset.padded_batch(
+        batch_size, padded_shapes=padded_shapes, drop_remainder=drop_remainder
+    )
+
+    def fill(*args):
+        element = args[0] if len(args) == 1 else args
+        return _fill_placeholders(element)
+
+    return dataset.map(fill)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test pad_sequence_batch."""
+
+from etils import epath
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from psiz_datasets.birds16_rank2019.birds16_rank2019 import _SPEC
+from psiz_datasets.core import generate_sequence_examples
+from psiz_datasets.transforms import pad_sequence_batch
+
+_DUMMY_PATH = (
+    epath.Path(__file__).parent.parent
+    / "birds16_rank2019"
+    / "dummy_data"
+    / "train_seqs"
+)
+
+
+def _sequences(path, **kwargs):
+    """Return the formatted sequences of the dummy data."""
+    sequences = []
+    for sequence_path in sorted(path.glob("seq_*.json")):
+        [(_, sequence)] = generate_sequence_examples(
+            sequence_path, _SPEC, with_timestep_axis=True, **kwargs
+        )
+        sequences.append(sequence)
+    return sequences
+
+
+def _timestep_shape(shape):
+    """Return the shape of a feature with a variable-length timestep axis."""
+    if len(shape) == 0:
+        return shape
+    return (None,) + shape[1:]
+
+
+def _dataset(sequences):
+    """Return dataset of variable-length sequences."""
+    keys = list(sequences[0].keys())
+    return tf.data.Dataset.from_generator(
+        lambda: ({k: s[k] for k in keys} for s in sequences),
+        output_signature={
+            k: tf.TensorSpec(
+                shape=_timestep_shape(np.shape(sequences[0][k])),
+                dtype=(
+                    tf.string
+                    if k == "anonymous_id"
+                    else tf.as_dtype(np.asarray(sequences[0][k]).dtype)
+                ),
+            )
+            for k in keys
+        },
+    )
+
+
+@pytest.mark.parametrize("sparse_outcome", [False, True])
+def test_matches_build_time_padding(sparse_outcome):
+    """Test agreement with sequences padded at build time."""
+    ragged = _sequences(
+        _DUMMY_PATH, sparse_outcome=sparse_outcome, ragged_timestep=True
+    )
+    padded = _sequences(_DUMMY_PATH, sparse_outcome=sparse_outcome)
+    n_timestep = _SPEC.max_timestep
+    assert len(ragged[0]["anonymous_id"]) < n_timestep
+
+    ds = pad_sequence_batch(_dataset(ragged), len(ragged), n_timestep=n_timestep)
+
+    batch = next(iter(ds))
+    np.testing.assert_array_equal(
+        batch["n_timestep"], [len(s["anonymous_id"]) for s in ragged]
+    )
+    for key, value in batch.items():
+        expected = np.stack([s[key] for s in padded])
+        if key == "anonymous_id":
+            value = value.numpy().astype(str)
+            expected = expected.astype(str)
+        np.testing.assert_array_equal(value, expected)
+
+
+def test_pad_to_longest():
+    """Test padding to the longest sequence of each batch."""
+    ragged = _sequences(_DUMMY_PATH, ragged_timestep=True)
+    lengths = [len(s["anonymous_id"]) for s in ragged]
+
+    ds = pad_sequence_batch(_dataset(ragged), 2, drop_remainder=True)
+
+    batch = next(iter(ds))
+    assert batch["given8rank2_stimulus_set"].shape == (2, max(lengths[0:2]), 9)
+    outcome = batch["given8rank2_outcome"].numpy()
+    np.testing.assert_array_equal(np.sum(outcome, axis=-1), 1.0)
+    np.testing.assert_array_equal(
+        batch["given8rank2_sample_weight"][0, lengths[0] :], 0.0
+    )
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` transforms.
+
+Functions:
+    split_trial_kinds: Return a transform that reconstructs per-kind
+        trial features from kind-tagged trials.
+
+"""
+
+import re
+
+import tensorflow as tf
+
+from psiz_datasets.utils.rank_outcome import rank_n_outcome
+
+_PREFIX_PATTERN = re.compile(r"^given(\d+)rank(\d+)$")
+_KIND_KEY = "kind"
+_TRIAL_KEYS = ("stimulus_set", "outcome", "response_time_ms", "sample_weight")
+
+
+def _find_kind(element):
+    """Return the kind ID tensor of a (possibly nested) element."""
+    if isinstance(element, dict):
+        if _KIND_KEY in element:
+            return element[_KIND_KEY]
+        element = list(element.values())
+    if isinstance(element, (tuple, list)):
+        for value in element:
+            kind = _find_kind(value)
+            if kind is not None:
+                return kind
+    return None
+
+
+def split_trial_kinds(trial_kinds, sparse_outcome=True):
+    """Return a transform that reconstructs per-kind trial features.
+
+    Intended for use with `tf.data.Dataset.map` on datasets prepared
+    using one of the `*_unified` configs, for models that expect the
+    per-configuration layout. Each kind-tagged field (e.g.,
+    "stimulus_set") is replaced by one field per rank configuration
+    (e.g., "given8rank2_stimulus_set"), where trials of other kinds are
+    placeholder trials. The result matches the corresponding `*_sparse`
+    config (or the dense config if `sparse_outcome=False`). For
+    example:
+
+        builder = tfds.builder("birds16_rank2019/with_timestep_unified")
+        split = split_trial_kinds(builder.info.metadata["trial_kinds"])
+        ds = builder.as_dataset(split="train").map(split)
+
+    Works with feature dictionaries as well as `as_supervised=True`
+    tuples.
+
+    Args:
+        trial_kinds: A list of feature prefixes (e.g., "given8rank2"),
+            where kind ID `i + 1` corresponds to `trial_kinds[i]`. Kind
+            ID 0 indicates a placeholder trial.
+        sparse_outcome (optional): Boolean indicating if outcomes
+            should be sparse outcome indices. Otherwise, outcomes are
+            one-hot encoded.
+
+    Returns:
+        A function intended for use with `tf.data.Dataset.map`.
+
+    """
+    rank_configs = []
+    for prefix in trial_kinds:
+        match = _PREFIX_PATTERN.match(prefix)
+        if match is None:
+            raise ValueError("Unrecognized trial kind '{0}'.".format(prefix))
+        rank_configs.append((prefix, int(match.group(1)), int(match.group(2))))
+
+    def _split_field(key, value, kind):
+        split = {}
+        for kind_id, (prefix, n_reference, n_select) in enumerate(rank_configs, 1):
+            is_kind = tf.equal(kind, kind_id)
+            if key == "stimulus_set":
+                value_kind = tf.where(
+                    is_kind[..., tf.newaxis], value[..., 0 : (n_reference + 1)], 0
+                )
+            else:
+                value_kind = tf.where(is_kind, value, tf.zeros_like(value))
+            if key == "outcome" and not sparse_outcome:
+                value_kind = tf.one_hot(
+                    value_kind, rank_n_outcome(n_reference, n_select)
+                )
+            split[prefix + "_" + key] = value_kind
+        return split
+
+    def _split(element, kind):
+        if isinstance(element, dict):
+            split = {}
+            for key, value in element.items():
+                if key == _KIND_KEY:
+                    continue
+                if key in _TRIAL_KEYS:
+                    split.update(_split_field(key, value, kind))
+                else:
+                    split[key] = _split(value, kind)
+            return split
+        if isinstance(element, (tuple, list)):
+            return type(element)(_split(v, kind) for v in element)
+        return element
+
+    def split(*args):
+        element = args[0] if len(args) == 1 else args
+        return _split(element, _find_kind(element))
+
+    return split
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test split_trial_kinds."""
+
+from etils import epath
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from psiz_datasets.birds16_rank2019.birds16_rank2019 import _SPEC
+from psiz_datasets.core import generate_sequence_examples
+from psiz_datasets.transforms import split_trial_kinds
+
+_DUMMY_PATH = (
+    epath.Path(__file__).parent.parent
+    / "birds16_rank2019"
+    / "dummy_data"
+    / "train_seqs"
+)
+
+
+def _examples(**kwargs):
+    """Return the stacked examples of the dummy data."""
+    examples = []
+    for sequence_path in sorted(_DUMMY_PATH.glob("seq_*.json")):
+        examples.extend(
+            example
+            for _, example in generate_sequence_examples(sequence_path, _SPEC, **kwargs)
+        )
+    return {
+        key: np.stack([example[key] for example in examples])
+        for key in examples[0].keys()
+    }
+
+
+@pytest.mark.parametrize("with_timestep_axis", [True, False])
+@pytest.mark.parametrize("sparse_outcome", [True, False])
+def test_matches_per_kind_layout(with_timestep_axis, sparse_outcome):
+    """Test agreement with the per-configuration layout."""
+    unified = _examples(with_timestep_axis=with_timestep_axis, unified_trial=True)
+    expected = _examples(
+        with_timestep_axis=with_timestep_axis, sparse_outcome=sparse_outcome
+    )
+    split = split_trial_kinds(_SPEC.prefixes, sparse_outcome=sparse_outcome)
+
+    element = split(unified)
+
+    assert "kind" not in element
+    assert sorted(element.keys()) == sorted(expected.keys())
+    for key, value in expected.items():
+        if key == "anonymous_id":
+            continue
+        np.testing.assert_array_equal(element[key], value, err_msg=key)
+        assert element[key].dtype == tf.as_dtype(value.dtype)
+
+
+def test_supervised_tuple():
+    """Test splitting an `as_supervised` tuple."""
+    x = {
+        "kind": np.array([[2, 1, 0]], dtype=np.int32),
+        "stimulus_set": np.array([[[1, 2, 3], [4, 5, 6], [0, 0, 0]]], dtype=np.int32),
+    }
+    y = {"outcome": np.array([[1, 1, 0]], dtype=np.int32)}
+    w = {"sample_weight": np.array([[0.5, 0.5, 0.0]], dtype=np.float32)}
+    split = split_trial_kinds(["given2rank1", "given1rank1"])
+    ds = tf.data.Dataset.from_tensor_slices((x, y, w)).map(split)
+
+    x, y, w = next(iter(ds))
+    np.testing.assert_array_equal(
+        x["given2rank1_stimulus_set"], [[0, 0, 0], [4, 5, 6], [0, 0, 0]]
+    )
+    np.testing.assert_array_equal(
+        x["given1rank1_stimulus_set"], [[1, 2], [0, 0], [0, 0]]
+    )
+    np.testing.assert_array_equal(y["given2rank1_outcome"], [0, 1, 0])
+    np.testing.assert_array_equal(w["given1rank1_sample_weight"], [0.5, 0.0, 0.0])
+
+
+def test_unrecognized_kind():
+    """Test that malformed trial kinds are rejected."""
+    with pytest.raises(ValueError):
+        split_trial_kinds(["rank:8rank2"])
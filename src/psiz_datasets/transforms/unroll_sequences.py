@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of `tf.data` transforms.
+
+Functions:
+    unroll_sequences: Unroll sequences into single-timestep examples.
+
+"""
+
+import tensorflow as tf
+
+_MASK_KEY = "__is_trial__"
+
+
+def _is_trial(element):
+    """Return a boolean mask of the timesteps that are not placeholders."""
+    if "n_timestep" in element:
+        n_row = tf.shape(element["anonymous_id"])[0]
+        return tf.range(n_row) < tf.cast(element["n_timestep"], tf.int32)
+    # NOTE: Datasets prepared before `n_timestep` was added are masked
+    # using their sample weights.
+    sample_weights = [
+        value
+        for key, value in element.items()
+        if key == "sample_weight" or key.endswith("_sample_weight")
+    ]
+    return tf.reduce_any(tf.stack(sample_weights, axis=0) > 0.0, axis=0)
+
+
+def unroll_sequences(dataset, with_timestep_index=False):
+    """Unroll sequences into single-timestep examples.
+
+    Derives the `without_timestep*` view of a dataset from the
+    corresponding `with_timestep*` config at read time, so that only
+    one config needs to be prepared. For example:
+
+        ds = tfds.load("birds16_rank2019/with_timestep", split="train")
+        ds = unroll_sequences(ds)
+
+    yields the same examples (with the same element spec) as
+    "birds16_rank2019/without_timestep". Likewise, "with_timestep_sparse"
+    and "with_timestep_ragged_sparse" map to "without_timestep_sparse",
+    and "with_timestep_unified" maps to "without_timestep_unified".
+
+    Sequences are unbatched in the graph and the placeholder timesteps
+    that pad sequences to `max_timestep` are dropped, i.e., the
+    timesteps at or beyond the sequence's "n_timestep". For datasets
+    without an "n_timestep" feature, timesteps where every sample
+    weight is zero are dropped instead, which also drops rank trials
+    of sequences with a grade of zero.
+
+    The examples of a sequence are contiguous and in timestep order,
+    and sequences are in the order of `dataset`. In contrast, TFDS
+    shuffles the examples of a prepared `without_timestep*` config
+    across sequences (by example ID), so the order differs. Shuffle the
+    unrolled dataset if examples should not be grouped by sequence.
+    The example with ID "{sequence_id}/{i}" in a prepared
+    `without_timestep*` config corresponds to timestep `i` of the
+    sequence with ID "{sequence_id}".
+
+    Args:
+        dataset: A `tf.data.Dataset` of feature dictionaries (i.e.,
+            loaded with `as_supervised=False`) of a `with_timestep*`
+            config.
+        with_timestep_index (optional): Boolean indicating if the
+            position of each timestep within its sequence is added as
+            the int32 feature "timestep".
+
+    Returns:
+        A `tf.data.Dataset` of single-timestep feature dictionaries.
+
+    Raises:
+        ValueError: If the elements of `dataset` are not feature
+            dictionaries.
+
+    """
+    if not isinstance(dataset.element_spec, dict):
+        raise ValueError(
+            "`unroll_sequences` requires a dataset of feature dictionaries, "
+            "i.e., loaded with `as_supervised=False`."
+        )
+
+    def mask(element):
+        element = dict(element)
+        element[_MASK_KEY] = _is_trial(element)
+        element.pop("n_timestep", None)
+        if with_timestep_index:
+            element["timestep"] = tf.range(tf.shape(element[_MASK_KEY])[0])
+        return element
+
+    def unmask(element):
+        element = dict(element)
+        element.pop(_MASK_KEY)
+        return element
+
+    dataset = dataset.map(mask).unbatch()
+    return dataset.filter(lambda element: element[_MASK_KEY]).map(unmask)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test unroll_sequences."""
+
+from etils import epath
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from psiz_datasets.birds16_rank2019 import Birds16Rank2019
+from psiz_datasets.core import generate_sequence_examples
+from psiz_datasets.transforms import unroll_sequences
+
+_DUMMY_PATH = (
+    epath.Path(__file__).parent.parent
+    / "birds16_rank2019"
+    / "dummy_data"
+    / "train_seqs"
+)
+
+
+def _builder(config, tmp_path):
+    """Return builder of a config."""
+    return Birds16Rank2019(config=config, data_dir=tmp_path)
+
+
+def _examples(builder):
+    """Return the (example_id, example) tuples of the dummy data."""
+    builder_config = builder.builder_config
+    examples = []
+    for sequence_path in sorted(_DUMMY_PATH.glob("seq_*.json")):
+        examples.extend(
+            generate_sequence_examples(
+                sequence_path,
+                builder.SPEC,
+                with_timestep_axis=builder_config.with_timestep_axis,
+                sparse_outcome=builder_config.sparse_outcome,
+                ragged_timestep=builder_config.ragged_timestep,
+                unified_trial=builder_config.unified_trial,
+            )
+        )
+    return examples
+
+
+def _dataset(builder):
+    """Return dataset of the dummy data with the builder's element spec."""
+    examples = [example for _, example in _examples(builder)]
+    tensor_spec = builder.info.features.get_tensor_spec()
+    return tf.data.Dataset.from_generator(
+        lambda: ({key: example[key] for key in tensor_spec} for example in examples),
+        output_signature=tensor_spec,
+    )
+
+
+@pytest.mark.parametrize(
+    "config,unrolled_config",
+    [
+        ("with_timestep", "without_timestep"),
+        ("with_timestep_sparse", "without_timestep_sparse"),
+        ("with_timestep_ragged_sparse", "without_timestep_sparse"),
+        ("with_timestep_unified", "without_timestep_unified"),
+    ],
+)
+def test_unroll_sequences(tmp_path, config, unrolled_config):
+    """Test agreement with the materialized unrolled config."""
+    unrolled_builder = _builder(unrolled_config, tmp_path)
+    expected = _examples(unrolled_builder)
+
+    ds = unroll_sequences(_dataset(_builder(config, tmp_path)))
+
+    assert ds.element_spec == unrolled_builder.info.features.get_tensor_spec()
+    examples = list(ds.as_numpy_iterator())
+    assert len(examples) == len(expected)
+    for example, (_, expected_example) in zip(examples, expected):
+        for key, value in expected_example.items():
+            if isinstance(value, str):
+                value = value.encode()
+            np.testing.assert_array_equal(example[key], value)
+
+
+def test_timestep_index(tmp_path):
+    """Test timestep index matches the example IDs of the unrolled config."""
+    expected_ids = [
+        example_id
+        for example_id, _ in _examples(_builder("without_timestep", tmp_path))
+    ]
+    sequence_ids = [
+        example_id for example_id, _ in _examples(_builder("with_timestep", tmp_path))
+    ]
+
+    ds = unroll_sequences(
+        _dataset(_builder("with_timestep", tmp_path)), with_timestep_index=True
+    )
+
+    timesteps = [example["timestep"] for example in ds.as_numpy_iterator()]
+    example_ids = []
+    idx_sequence = -1
+    for timestep in timesteps:
+        if timestep == 0:
+            idx_sequence += 1
+        example_ids.append("{0}/{1}".format(sequence_ids[idx_sequence], timestep))
+    assert example_ids == expected_ids
+
+
+def test_sample_weight_mask():
+    """Test masking placeholders of datasets without `n_timestep`."""
+    ds = tf.data.Dataset.from_tensor_slices(
+        {
+            "anonymous_id": [["a", "a", "a"], ["b", "b", "b"]],
+            "given2rank1_sample_weight": [[1.0, 0.0, 0.0], [0.0, 0.5, 0.0]],
+            "given8rank2_sample_weight": [[0.0, 1.0, 0.0], [0.0, 0.0, 0.0]],
+        }
+    )
+
+    examples = list(unroll_sequences(ds).as_numpy_iterator())
+
+    assert [example["anonymous_id"] for example in examples] == [b"a", b"a", b"b"]
+
+
+def test_supervised_error():
+    """Test error for datasets of tuples."""
+    ds = tf.data.Dataset.from_tensor_slices(([[1, 2]], [[1, 2]]))
+
+    with pytest.raises(ValueError):
+        unroll_sequences(ds)
@@ -16,13 +16,31 @@
 """Utilities initialization file."""
 
 from psiz_datasets.utils.append_rank_placeholder import append_rank_placeholder
+from psiz_datasets.utils.atomic_open import atomic_open
+from psiz_datasets.utils.format_kind_trials import format_kind_trials
+from psiz_datasets.utils.format_rank_trials import format_rank_trials
+from psiz_datasets.utils.json_decoder import json_decoder
 from psiz_datasets.utils.one_hot import one_hot
+from psiz_datasets.utils.parallel_imap import parallel_imap
 from psiz_datasets.utils.parse_asset_id import parse_asset_id
+from psiz_datasets.utils.parse_rank_sequence import parse_rank_sequence
 from psiz_datasets.utils.parse_rank_timestep import parse_rank_timestep
+from psiz_datasets.utils.rank_outcome import rank_n_outcome
+from psiz_datasets.utils.rank_outcome import rank_outcome_index
+from psiz_datasets.utils.rank_outcome import rank_outcome_table
 
 __all__ = [
     "append_rank_placeholder",
+    "atomic_open",
+    "format_kind_trials",
+    "format_rank_trials",
+    "json_decoder",
     "one_hot",
+    "parallel_imap",
     "parse_asset_id",
+    "parse_rank_sequence",
     "parse_rank_timestep",
+    "rank_n_outcome",
+    "rank_outcome_index",
+    "rank_outcome_table",
 ]
@@ -23,12 +23,12 @@ Functions:
 import numpy as np
 
 from psiz_datasets.utils.one_hot import one_hot
+from psiz_datasets.utils.rank_outcome import rank_n_outcome
 
-_N_OUTCOME_2RANK1 = 2
-_N_OUTCOME_8RANK2 = 56
 
-
-def append_rank_placeholder(formatted_sequence, n_reference=None, n_select=None):
+def append_rank_placeholder(
+    formatted_sequence, n_reference=None, n_select=None, sparse_outcome=False
+):
     """Append placeholder rank trial."""
     prefix = "given{0}rank{1}".format(n_reference, n_select)
     # Handle content.
@@ -39,13 +39,11 @@ def append_rank_placeholder(formatted_sequence, n_reference=None, n_select=None)
     # NOTE: Can not make outcome all zeros because it will result in nan's
     # when computing categorical crossentropy loss.
     outcome_idx = 0
-    if n_reference == 8 and n_select == 2:
-        n_outcome = _N_OUTCOME_8RANK2
-    elif n_reference == 2 and n_select == 1:
-        n_outcome = _N_OUTCOME_2RANK1
+    if sparse_outcome:
+        formatted_sequence[prefix + "_outcome"].append(outcome_idx)
     else:
-        raise NotImplementedError("Unrecognized rank configuration.")
-    formatted_sequence[prefix + "_outcome"].append(one_hot(outcome_idx, n_outcome))
+        n_outcome = rank_n_outcome(n_reference, n_select)
+        formatted_sequence[prefix + "_outcome"].append(one_hot(outcome_idx, n_outcome))
     rt_ms = 0.0
     formatted_sequence[prefix + "_response_time_ms"].append(rt_ms)
     weight = 0.0
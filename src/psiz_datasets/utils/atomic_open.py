@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    atomic_open: Open a file for writing that is replaced atomically.
+
+"""
+
+import contextlib
+import os
+
+from etils import epath
+
+
+@contextlib.contextmanager
+def atomic_open(path):
+    """Open a file for writing that is replaced atomically.
+
+    Content is written to a temporary file that replaces `path` when
+    the context exits without error, so that concurrent readers (and
+    interrupted builds) never observe a partial file.
+
+    Args:
+        path: Path of the file.
+
+    Yields:
+        A binary file object.
+
+    """
+    path = epath.Path(path)
+    tmp_path = path.with_name("{0}.tmp{1}".format(path.name, os.getpid()))
+    try:
+        with tmp_path.open("wb") as f:
+            yield f
+        tmp_path.replace(path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    format_kind_trials: Format parsed rank trials of all configurations
+        as kind-tagged trials.
+
+"""
+
+import numpy as np
+
+
+def format_kind_trials(trials, rank_configs, sample_weight=1.0, n_timestep=None):
+    """Format parsed rank trials of all configurations as kind-tagged trials.
+
+    Unlike `format_rank_trials`, which returns the fields of one rank
+    configuration (and placeholders for trials of other
+    configurations), every trial is stored once along with an integer
+    kind ID. Kind ID 0 is reserved for placeholder trials and kind ID
+    `i + 1` corresponds to `rank_configs[i]`. Stimulus sets are padded
+    to the largest configuration and outcomes are sparse outcome
+    indices. Rows beyond the number of trials are placeholders with
+    the same values used by `format_rank_trials`.
+
+    Args:
+        trials: A dictionary of parsed rank trials as returned by
+            `parse_rank_sequence`.
+        rank_configs: A tuple of `(n_reference, n_select)` tuples.
+        sample_weight: Float indicating the sample weight of
+            non-placeholder trials.
+        n_timestep (optional): Integer indicating the number of rows to
+            allocate. Must be at least the number of trials. By
+            default, one row is allocated per trial.
+
+    Returns:
+        A dictionary of np.NDArray fields (one row per timestep) with
+        the keys "kind", "stimulus_set", "outcome", "response_time_ms"
+        and "sample_weight".
+
+    Raises:
+        ValueError: If a trial is not one of `rank_configs`.
+
+    """
+    kinds = np.array(
+        [
+            "rank:{0}rank{1}".format(n_reference, n_select)
+            for n_reference, n_select in rank_configs
+        ],
+        dtype=np.str_,
+    )
+    max_reference = max(n_reference for n_reference, _ in rank_configs)
+
+    n_trial = len(trials["kind"])
+    if n_timestep is None:
+        n_timestep = n_trial
+    elif n_timestep < n_trial:
+        raise ValueError(
+            "Sequence has {0} trials, which exceeds `n_timestep`={1}.".format(
+                n_trial, n_timestep
+            )
+        )
+    is_kind = np.equal(trials["kind"][:, np.newaxis], kinds[np.newaxis, :])
+    if not np.all(np.any(is_kind, axis=1)):
+        raise ValueError("Encountered a rank trial that is not in `rank_configs`.")
+
+    kind = np.zeros([n_timestep], dtype=np.int32)
+    kind[0:n_trial] = np.argmax(is_kind, axis=1) + 1
+    stimulus_set = np.zeros([n_timestep, max_reference + 1], dtype=np.int32)
+    n_column = min(trials["stimulus_set"].shape[1], max_reference + 1)
+    stimulus_set[0:n_trial, 0:n_column] = trials["stimulus_set"][:, 0:n_column]
+    outcome = np.zeros([n_timestep], dtype=np.int32)
+    outcome[0:n_trial] = trials["outcome_idx"]
+    response_time_ms = np.zeros([n_timestep], dtype=np.float32)
+    response_time_ms[0:n_trial] = trials["response_time_ms"]
+    weight = np.zeros([n_timestep], dtype=np.float32)
+    weight[0:n_trial] = sample_weight
+
+    return {
+        "kind": kind,
+        "stimulus_set": stimulus_set,
+        "outcome": outcome,
+        "response_time_ms": response_time_ms,
+        "sample_weight": weight,
+    }
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    format_rank_trials: Format parsed rank trials of one configuration.
+
+"""
+
+import numpy as np
+
+from psiz_datasets.utils.rank_outcome import rank_n_outcome
+
+
+def format_rank_trials(
+    trials,
+    n_reference=None,
+    n_select=None,
+    sample_weight=1.0,
+    sparse_outcome=False,
+    n_timestep=None,
+):
+    """Format parsed rank trials of one configuration.
+
+    Fields are written into preallocated arrays that are prefilled
+    with the same placeholder values used by `append_rank_placeholder`.
+    Trials of a different configuration, as well as any rows beyond the
+    number of trials, are left as placeholders.
+
+    Args:
+        trials: A dictionary of parsed rank trials as returned by
+            `parse_rank_sequence`.
+        n_reference: Integer indicating the number of references.
+        n_select: Integer indicating the number of selections.
+        sample_weight: Float indicating the sample weight of
+            non-placeholder trials.
+        sparse_outcome: Boolean indicating if outcomes should be
+            returned as sparse outcome indices instead of one-hot
+            encodings.
+        n_timestep (optional): Integer indicating the number of rows to
+            allocate. Must be at least the number of trials. By
+            default, one row is allocated per trial.
+
+    Returns:
+        A dictionary of np.NDArray fields (one row per timestep), keyed
+        using the "given{n_reference}rank{n_select}" prefix.
+
+    """
+    prefix = "given{0}rank{1}".format(n_reference, n_select)
+    n_outcome = rank_n_outcome(n_reference, n_select)
+
+    is_kind = np.equal(trials["kind"], "rank:{0}rank{1}".format(n_reference, n_select))
+    n_trial = len(is_kind)
+    if n_timestep is None:
+        n_timestep = n_trial
+    elif n_timestep < n_trial:
+        raise ValueError(
+            "Sequence has {0} trials, which exceeds `n_timestep`={1}.".format(
+                n_trial, n_timestep
+            )
+        )
+    # Row locations of trials with this configuration.
+    idx_row = np.flatnonzero(is_kind)
+
+    stimulus_set = np.zeros([n_timestep, n_reference + 1], dtype=np.int32)
+    if idx_row.size > 0:
+        stimulus_set[idx_row] = trials["stimulus_set"][idx_row, 0 : (n_reference + 1)]
+    # NOTE: Placeholder outcomes use index 0 (rather than all zeros) to
+    # avoid nan's when computing categorical crossentropy loss.
+    outcome_idx = np.zeros([n_timestep], dtype=np.int32)
+    outcome_idx[idx_row] = trials["outcome_idx"][idx_row]
+    if sparse_outcome:
+        outcome = outcome_idx
+    else:
+        outcome = np.zeros([n_timestep, n_outcome], dtype=np.float32)
+        outcome[np.arange(n_timestep), outcome_idx] = 1.0
+    response_time_ms = np.zeros([n_timestep], dtype=np.float32)
+    response_time_ms[idx_row] = trials["response_time_ms"][idx_row]
+    weight = np.zeros([n_timestep], dtype=np.float32)
+    weight[idx_row] = sample_weight
+
+    return {
+        prefix + "_stimulus_set": stimulus_set,
+        prefix + "_outcome": outcome,
+        prefix + "_response_time_ms": response_time_ms,
+        prefix + "_sample_weight": weight,
+    }
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    json_decoder: Return a JSON decoding function.
+
+"""
+
+import functools
+import importlib
+import json
+import os
+
+# Backends in order of preference.
+_BACKENDS = ("orjson", "msgspec", "json")
+_BACKEND_ENV_VAR = "PSIZ_DATASETS_JSON_BACKEND"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_decoder(backend):
+    """Load decoding function of backend."""
+    if backend == "orjson":
+        return importlib.import_module("orjson").loads
+    if backend == "msgspec":
+        return importlib.import_module("msgspec.json").Decoder().decode
+    if backend == "json":
+        return json.loads
+    raise ValueError(
+        "Unrecognized JSON backend '{0}'. Must be one of {1}.".format(
+            backend, _BACKENDS
+        )
+    )
+
+
+def json_decoder(backend=None):
+    """Return a JSON decoding function.
+
+    The optional `orjson` and `msgspec` packages decode sequence files
+    considerably faster than the standard library. All backends decode
+    straight from bytes (skipping a separate text-decoding step) and
+    return the same plain Python objects.
+
+    Args:
+        backend (optional): String indicating the backend. One of
+            "orjson", "msgspec" or "json". If not provided, the
+            environment variable `PSIZ_DATASETS_JSON_BACKEND` is used
+            if set, otherwise the first installed backend (in the
+            above order) is used, falling back to `json` from the
+            standard library.
+
+    Returns:
+        A function that accepts a `bytes` or `str` JSON document and
+        returns the decoded object.
+
+    """
+    if backend is None:
+        backend = os.environ.get(_BACKEND_ENV_VAR)
+    if backend is not None:
+        return _load_decoder(backend)
+    for backend in _BACKENDS:
+        try:
+            return _load_decoder(backend)
+        except ImportError:
+            continue
+    return json.loads
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test json_decoder."""
+
+import json
+import pkgutil
+import sys
+
+import pytest
+
+from psiz_datasets.utils import json_decoder
+from psiz_datasets.utils.json_decoder import _load_decoder
+
+
+@pytest.fixture
+def sequence_bytes():
+    """Raw bytes of a dummy sequence file."""
+    return pkgutil.get_data(
+        "psiz_datasets", "birds16_rank2019/dummy_data/train_seqs/seq_a.json"
+    )
+
+
+@pytest.mark.parametrize("backend", ["orjson", "msgspec", "json"])
+def test_backend(backend, sequence_bytes):
+    """Test that every installed backend matches the standard library."""
+    if backend != "json":
+        pytest.importorskip(backend)
+    decode = json_decoder(backend)
+
+    assert decode(sequence_bytes) == json.loads(sequence_bytes.decode("utf-8"))
+    assert decode(sequence_bytes.decode("utf-8")) == json.loads(sequence_bytes)
+
+
+def test_env_var(monkeypatch):
+    """Test selecting a backend with an environment variable."""
+    monkeypatch.setenv("PSIZ_DATASETS_JSON_BACKEND", "json")
+
+    assert json_decoder() is json.loads
+
+
+def test_fallback(monkeypatch, sequence_bytes):
+    """Test fallback to the standard library."""
+    monkeypatch.delenv("PSIZ_DATASETS_JSON_BACKEND", raising=False)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    _load_decoder.cache_clear()
+
+    try:
+        assert json_decoder() is json.loads
+    finally:
+        _load_decoder.cache_clear()
+
+
+def test_unrecognized_backend():
+    """Test unrecognized backend."""
+    with pytest.raises(ValueError):
+        json_decoder("yaml")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    parallel_imap: Lazily map a function over items using processes.
+
+"""
+
+import collections
+import concurrent.futures
+import multiprocessing
+
+# Maximum number of pending tasks per worker.
+_PENDING_PER_WORKER = 4
+
+
+def parallel_imap(func, iterable, num_workers=None):
+    """Lazily map a function over items using a pool of processes.
+
+    Results are yielded in the same order as `iterable`, so the output
+    does not depend on the number of workers. Only a bounded number of
+    tasks are submitted ahead of the consumer, which keeps memory usage
+    bounded when results are consumed slowly.
+
+    Worker processes are started with the "spawn" method, since forking
+    a process that has already started TensorFlow threads is unsafe.
+    Consequently, `func` and the items must be picklable.
+
+    Args:
+        func: A function that accepts a single item.
+        iterable: An iterable of items.
+        num_workers (optional): Integer indicating the number of worker
+            processes. If `None` or less than two, items are processed
+            serially in the current process.
+
+    Yields:
+        The result of `func` for each item.
+
+    """
+    if num_workers is None or num_workers < 2:
+        for item in iterable:
+            yield func(item)
+        return
+
+    max_pending = num_workers * _PENDING_PER_WORKER
+    mp_context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=num_workers, mp_context=mp_context
+    ) as executor:
+        pending = collections.deque()
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test parallel_imap."""
+
+import math
+
+import pytest
+
+from psiz_datasets.utils import parallel_imap
+
+
+@pytest.mark.parametrize("num_workers", [None, 1, 3])
+def test_order(num_workers):
+    """Test results are yielded in input order."""
+    items = list(range(40))
+
+    results = list(parallel_imap(math.factorial, iter(items), num_workers))
+
+    assert results == [math.factorial(item) for item in items]
+
+
+def test_error():
+    """Test exceptions raised by workers are propagated."""
+    with pytest.raises(ValueError):
+        list(parallel_imap(math.factorial, [3, -1, 4], num_workers=2))
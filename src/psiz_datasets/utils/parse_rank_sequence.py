@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    parse_rank_sequence: Parse all rank trials of a sequence.
+
+"""
+
+import numpy as np
+
+from psiz_datasets.utils.rank_outcome import rank_outcome_index
+
+_BASE = 36
+# Number of leading asset ID characters that encode the domain and
+# subdomain (see `parse_asset_id`).
+_ASSET_PREFIX_LENGTH = 5
+
+_ROLE_QUERY = 0
+_ROLE_REFERENCE = 1
+_ROLE_SELECTION = 2
+
+
+def _base36_digit_table():
+    """Return lookup table mapping ASCII codes to base-36 digits.
+
+    Null bytes (numpy's fixed-width string padding) map to -1 and all
+    other non-digit characters map to -2.
+
+    """
+    table = np.full([256], -2, dtype=np.int64)
+    table[0] = -1
+    for digit, char in enumerate("0123456789abcdefghijklmnopqrstuvwxyz"):
+        table[ord(char)] = digit
+        table[ord(char.upper())] = digit
+    return table
+
+
+_DIGIT_TABLE = _base36_digit_table()
+
+
+def _decode_local_ids(asset_ids):
+    """Decode the base-36 local ID of many asset IDs at once.
+
+    Args:
+        asset_ids: A list of asset ID strings.
+
+    Returns:
+        A 1D np.NDArray of integer local IDs.
+
+    """
+    codes = np.array(asset_ids, dtype=np.bytes_)
+    width = max(codes.dtype.itemsize, _ASSET_PREFIX_LENGTH)
+    codes = codes.astype("S{0}".format(width))
+    codes = codes.view(np.uint8).reshape([len(asset_ids), width])
+    digits = _DIGIT_TABLE[codes[:, _ASSET_PREFIX_LENGTH:]]
+    if np.any(digits == -2):
+        raise ValueError("Encountered asset ID with a non base-36 local ID.")
+
+    # Horner's method, column by column. Shorter IDs are null-padded on
+    # the right, so padded columns leave the accumulated value untouched.
+    local_ids = np.zeros([len(asset_ids)], dtype=np.int64)
+    for column in digits.T:
+        is_digit = column >= 0
+        local_ids = np.where(is_digit, local_ids * _BASE + column, local_ids)
+    return local_ids
+
+
+def _sparse_outcomes(n_reference, n_select, selection_indices):
+    """Return sparse outcome indices for a batch of rank trials.
+
+    Args:
+        n_reference: 1D array indicating the number of references of
+            each trial.
+        n_select: 1D array indicating the number of selections of each
+            trial.
+        selection_indices: 2D array of selection indices, i.e., the
+            position of each selection among the references.
+
+    Returns:
+        A 1D np.NDArray of sparse outcome indices.
+
+    """
+    outcome_idx = np.zeros([len(n_reference)], dtype=np.int32)
+    configurations = np.unique(np.stack([n_reference, n_select], axis=1), axis=0)
+    for n_reference_config, n_select_config in configurations:
+        is_config = np.logical_and(
+            np.equal(n_reference, n_reference_config),
+            np.equal(n_select, n_select_config),
+        )
+        outcome_idx[is_config] = rank_outcome_index(
+            n_reference_config, selection_indices[is_config, 0:n_select_config]
+        )
+    return outcome_idx
+
+
+def parse_rank_sequence(sequence):
+    """Parse all rank trials of a sequence.
+
+    This is a batched counterpart of `parse_rank_timestep`. Interaction
+    records are collected in a single pass, after which asset IDs,
+    stimulus order and outcome indices are resolved with array
+    operations over the whole sequence.
+
+    Args:
+        sequence: A list of timestep dictionaries. Timesteps that are
+            not rank trials (i.e., `kind` does not start with "rank:")
+            are skipped.
+
+    Returns:
+        A dictionary of arrays with one row per rank trial:
+            `kind`: A 1D array of timestep kinds (e.g., "rank:8rank2").
+            `stimulus_set`: A 2D int32 array with shape
+                [n_trial, max_reference + 1]. The query is stored first,
+                followed by the references. Trials with fewer than
+                `max_reference` references are zero-padded.
+            `outcome_idx`: A 1D int32 array of sparse categorical
+                outcomes.
+            `response_time_ms`: A 1D float32 array of total response
+                times.
+            `n_reference`: A 1D int32 array indicating the number of
+                references of each trial.
+            `n_select`: A 1D int32 array indicating the number of
+                selections of each trial.
+
+    """
+    kind = []
+    response_time_ms = []
+    trial_idx = []
+    role = []
+    slot = []
+    detail = []
+    for timestep in sequence:
+        if not timestep["kind"].startswith("rank:"):
+            continue
+        idx_trial = len(kind)
+        kind.append(timestep["kind"])
+        response_time_ms.append(timestep["response_time_ms"])
+        for interaction in timestep["interactions"]:
+            interaction_kind = interaction["kind"]
+            if interaction_kind == "content:query":
+                role.append(_ROLE_QUERY)
+                slot.append(0)
+            elif "content:reference" in interaction_kind:
+                role.append(_ROLE_REFERENCE)
+                slot.append(int(interaction_kind.split("_")[1]))
+            elif "behavior:rank" in interaction_kind:
+                role.append(_ROLE_SELECTION)
+                slot.append(int(interaction_kind.split("_")[1]))
+            else:
+                continue
+            trial_idx.append(idx_trial)
+            detail.append(interaction["detail"])
+
+    n_trial = len(kind)
+    trial_idx = np.array(trial_idx, dtype=np.int64)
+    role = np.array(role, dtype=np.int64)
+    slot = np.array(slot, dtype=np.int64)
+    local_ids = _decode_local_ids(detail)
+
+    is_query = np.equal(role, _ROLE_QUERY)
+    is_reference = np.equal(role, _ROLE_REFERENCE)
+    is_selection = np.equal(role, _ROLE_SELECTION)
+    n_reference = np.bincount(trial_idx[is_reference], minlength=n_trial)
+    n_select = np.bincount(trial_idx[is_selection], minlength=n_trial)
+    max_reference = int(np.max(n_reference, initial=0))
+    max_select = int(np.max(n_select, initial=0))
+
+    # Place stimuli using the slot encoded in the interaction kind so
+    # that references and selections are in the correct order.
+    stimulus_set = np.zeros([n_trial, max_reference + 1], dtype=np.int32)
+    stimulus_set[trial_idx[is_query], 0] = local_ids[is_query]
+    stimulus_set[trial_idx[is_reference], 1 + slot[is_reference]] = local_ids[
+        is_reference
+    ]
+    selections = np.full([n_trial, max_select], -1, dtype=np.int64)
+    selections[trial_idx[is_selection], slot[is_selection]] = local_ids[is_selection]
+
+    # Determine index locations of selections among the references.
+    is_match = np.equal(selections[:, :, np.newaxis], stimulus_set[:, np.newaxis, 1:])
+    is_missing = np.logical_and(
+        np.greater_equal(selections, 0), np.logical_not(np.any(is_match, axis=2))
+    )
+    if np.any(is_missing):
+        raise ValueError("Encountered a rank selection that is not a reference.")
+    selection_indices = np.zeros([n_trial, max_select], dtype=np.int64)
+    if max_reference > 0:
+        selection_indices = np.argmax(is_match, axis=2)
+
+    return {
+        "kind": np.array(kind, dtype=np.str_),
+        "stimulus_set": stimulus_set,
+        "outcome_idx": _sparse_outcomes(n_reference, n_select, selection_indices),
+        "response_time_ms": np.array(response_time_ms, dtype=np.float32),
+        "n_reference": n_reference.astype(np.int32),
+        "n_select": n_select.astype(np.int32),
+    }
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test parse_rank_sequence."""
+
+import json
+import pkgutil
+
+import numpy as np
+import pytest
+
+from psiz_datasets.utils import parse_rank_sequence
+from psiz_datasets.utils import parse_rank_timestep
+
+
+def _rank_timestep(kind, query, references, selections, response_time_ms):
+    """Return rank timestep in the raw JSON format."""
+    interactions = [{"kind": "content:query", "detail": query}]
+    for idx, reference in enumerate(references):
+        interactions.append(
+            {"kind": "content:reference_{0}".format(idx), "detail": reference}
+        )
+    for idx, selection in enumerate(selections):
+        interactions.append(
+            {"kind": "behavior:rank_{0}".format(idx), "detail": selection}
+        )
+    interactions.append({"kind": "behavior:submit_response", "detail": ""})
+    return {
+        "kind": kind,
+        "response_time_ms": response_time_ms,
+        "interactions": interactions,
+    }
+
+
+@pytest.fixture
+def mixed_sequence():
+    """Sequence mixing 8rank2, 2rank1 and non-rank timesteps."""
+    references_8 = ["PZ001000{0:04d}".format(idx) for idx in range(2, 10)]
+    return [
+        _rank_timestep(
+            "rank:8rank2",
+            "PZ001000000Z",
+            references_8,
+            [references_8[5], references_8[2]],
+            2001,
+        ),
+        {"kind": "questionnaire:feedback", "interactions": []},
+        _rank_timestep(
+            "rank:2rank1",
+            "PZ00100000aB",
+            ["PZ001000001C", "PZ0010000017"],
+            ["PZ0010000017"],
+            1003,
+        ),
+        _rank_timestep(
+            "rank:8rank2",
+            "PZ0010000001",
+            references_8[::-1],
+            [references_8[0], references_8[7]],
+            4005,
+        ),
+    ]
+
+
+def test_mixed_sequence(mixed_sequence):
+    """Test agreement with per-trial parsing for mixed trial kinds."""
+    trials = parse_rank_sequence(mixed_sequence)
+
+    rank_timesteps = [t for t in mixed_sequence if t["kind"].startswith("rank:")]
+    np.testing.assert_array_equal(
+        trials["kind"], ["rank:8rank2", "rank:2rank1", "rank:8rank2"]
+    )
+    np.testing.assert_array_equal(trials["n_reference"], [8, 2, 8])
+    np.testing.assert_array_equal(trials["n_select"], [2, 1, 2])
+    assert trials["stimulus_set"].shape == (3, 9)
+    assert trials["stimulus_set"].dtype == np.int32
+    for idx, timestep in enumerate(rank_timesteps):
+        stimulus_set, outcome_idx, rt_ms = parse_rank_timestep(timestep)
+        n_stimuli = len(stimulus_set)
+        np.testing.assert_array_equal(
+            trials["stimulus_set"][idx, 0:n_stimuli], stimulus_set
+        )
+        np.testing.assert_array_equal(trials["stimulus_set"][idx, n_stimuli:], 0)
+        assert trials["outcome_idx"][idx] == outcome_idx
+        assert trials["response_time_ms"][idx] == rt_ms["total"]
+
+
+def test_empty_sequence():
+    """Test sequence without any rank trials."""
+    trials = parse_rank_sequence([{"kind": "questionnaire:feedback"}])
+
+    assert trials["kind"].shape == (0,)
+    assert trials["stimulus_set"].shape == (0, 1)
+    assert trials["outcome_idx"].shape == (0,)
+
+
+def test_invalid_selection(mixed_sequence):
+    """Test selection that does not match any reference."""
+    mixed_sequence[0]["interactions"][9]["detail"] = "PZ0010000ZZZ"
+    with pytest.raises(ValueError):
+        parse_rank_sequence(mixed_sequence)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "birds16_rank2019/dummy_data/train_seqs/seq_a.json",
+        "ilsvrc2012_val_hsj/dummy_data/test_seqs/seq_c.json",
+        "skin_lesions2018_rank2018/dummy_data/train_seqs/seq_dummy_c.json",
+    ],
+)
+def test_dummy_data(path):
+    """Test agreement with per-trial parsing for dummy data."""
+    data = json.loads(pkgutil.get_data("psiz_datasets", path))
+    sequence = data["data"][0]["sequence"]
+
+    trials = parse_rank_sequence(sequence)
+
+    assert len(trials["kind"]) == len(sequence)
+    for idx, timestep in enumerate(sequence):
+        stimulus_set, outcome_idx, rt_ms = parse_rank_timestep(timestep)
+        np.testing.assert_array_equal(trials["stimulus_set"][idx], stimulus_set)
+        assert trials["outcome_idx"][idx] == outcome_idx
+        assert trials["response_time_ms"][idx] == rt_ms["total"]
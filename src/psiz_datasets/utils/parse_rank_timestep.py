@@ -21,9 +21,9 @@ Functions:
 """
 
 import numpy as np
-from psiz.data import Rank
 
 from psiz_datasets.utils.parse_asset_id import parse_asset_id
+from psiz_datasets.utils.rank_outcome import rank_outcome_index
 
 
 def parse_rank_timestep(timestep):
@@ -85,7 +85,7 @@ def parse_rank_timestep(timestep):
     # Finalize pieces.
     # pylint: disable-next=possibly-used-before-assignment
     stimulus_set = np.hstack([np.array([query]), references]).astype(np.int32)
-    outcome_idx = Rank.as_sparse_outcome(n_reference, selection_indices)
+    outcome_idx = rank_outcome_index(n_reference, selection_indices)
     rt_ms = {}
     rt_ms["total"] = timestep["response_time_ms"]
 
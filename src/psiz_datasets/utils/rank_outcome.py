@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Module of utility functions.
+
+Functions:
+    rank_outcome_table: Return lookup table of sparse rank outcomes.
+    rank_outcome_index: Convert selection indices to outcome indices.
+    rank_n_outcome: Return the number of possible rank outcomes.
+
+"""
+
+import functools
+import itertools
+import math
+
+import numpy as np
+
+
+def rank_n_outcome(n_reference, n_select):
+    """Return the number of possible rank outcomes.
+
+    Args:
+        n_reference: Integer indicating the number of references.
+        n_select: Integer indicating the number of ranked selections.
+
+    Returns:
+        An integer.
+
+    """
+    return math.perm(int(n_reference), int(n_select))
+
+
+@functools.lru_cache(maxsize=None)
+def rank_outcome_table(n_reference, n_select):
+    """Return lookup table of sparse rank outcomes.
+
+    Outcomes are enumerated in the same order as
+    `psiz.data.Rank.possible_outcomes`, i.e., ordered selections in
+    lexicographic order. The table is computed once per rank
+    configuration and cached.
+
+    Args:
+        n_reference: Integer indicating the number of references.
+        n_select: Integer indicating the number of ranked selections.
+
+    Returns:
+        A read-only int32 np.NDArray with shape
+        `[n_reference] * n_select`. The entry at position
+        `(s_0, ..., s_{n_select - 1})` is the sparse outcome index of
+        the ordered selections `s`, or -1 if the selections are not a
+        valid outcome (i.e., a reference is selected more than once).
+
+    """
+    n_reference = int(n_reference)
+    n_select = int(n_select)
+    table = np.full([n_reference] * n_select, -1, dtype=np.int32)
+    selections = itertools.permutations(range(n_reference), n_select)
+    for outcome_idx, selection in enumerate(selections):
+        table[selection] = outcome_idx
+    table.flags.writeable = False
+    return table
+
+
+def rank_outcome_index(n_reference, selection_indices):
+    """Convert selection indices to outcome indices.
+
+    Vectorized counterpart of `psiz.data.Rank.as_sparse_outcome`.
+
+    Args:
+        n_reference: Integer indicating the number of references.
+        selection_indices: Array-like of integers with shape
+            [..., n_select] indicating the reference indices that were
+            selected. The order of the last axis is assumed to
+            correspond to the order that the selections were made.
+
+    Returns:
+        An int32 np.NDArray with shape [...] of sparse outcome indices.
+
+    Raises:
+        ValueError: If any selections are not a valid outcome.
+
+    """
+    selection_indices = np.asarray(selection_indices)
+    n_select = selection_indices.shape[-1]
+    if np.any(selection_indices < 0) or np.any(selection_indices >= n_reference):
+        raise ValueError("Selection indices must be in [0, n_reference).")
+    table = rank_outcome_table(n_reference, n_select)
+    outcome_idx = table[tuple(np.moveaxis(selection_indices, -1, 0))]
+    if np.any(outcome_idx < 0):
+        raise ValueError("Selection indices must not contain repeated selections.")
+    return outcome_idx
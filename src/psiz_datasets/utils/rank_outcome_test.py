@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 The PsiZ Datasets Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test rank outcome lookup."""
+
+import numpy as np
+import pytest
+from psiz.data import Rank
+
+from psiz_datasets.utils import rank_n_outcome
+from psiz_datasets.utils import rank_outcome_index
+from psiz_datasets.utils import rank_outcome_table
+
+_RANK_CONFIGS = [(2, 1), (8, 2), (3, 3), (4, 2), (5, 3), (6, 1)]
+
+
+@pytest.mark.parametrize("n_reference,n_select", _RANK_CONFIGS)
+def test_matches_psiz(n_reference, n_select):
+    """Test bit-identical agreement with psiz for every outcome."""
+    outcomes = Rank.possible_outcomes(n_reference, n_select)[:, 0:n_select]
+
+    assert rank_n_outcome(n_reference, n_select) == outcomes.shape[0]
+    expected = np.array(
+        [Rank.as_sparse_outcome(n_reference, selection) for selection in outcomes]
+    )
+    np.testing.assert_array_equal(expected, np.arange(outcomes.shape[0]))
+
+    # Single-trial lookup.
+    for selection, outcome_idx in zip(outcomes, expected):
+        assert rank_outcome_index(n_reference, selection) == outcome_idx
+
+    # Batch lookup in shuffled order.
+    rng = np.random.default_rng(252)
+    order = rng.permutation(outcomes.shape[0])
+    np.testing.assert_array_equal(
+        rank_outcome_index(n_reference, outcomes[order]), expected[order]
+    )
+
+
+def test_table():
+    """Test table is cached and read-only."""
+    table = rank_outcome_table(8, 2)
+
+    assert table.shape == (8, 8)
+    assert table.dtype == np.int32
+    assert rank_outcome_table(8, 2) is table
+    assert not table.flags.writeable
+    np.testing.assert_array_equal(np.diagonal(table), -1)
+    np.testing.assert_array_equal(np.sort(table[table >= 0]), np.arange(56))
+
+
+def test_invalid_selection():
+    """Test repeated and out-of-range selections."""
+    with pytest.raises(ValueError):
+        rank_outcome_index(8, [[0, 1], [3, 3]])
+    with pytest.raises(ValueError):
+        rank_outcome_index(8, [[0, 8]])